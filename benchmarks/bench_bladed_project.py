@@ -0,0 +1,77 @@
+"""
+Benchmark of the Bladed project ($PJ) reader.
+
+Generates a synthetic Bladed project with many binary output groups (2D and 3D) and compares
+the legacy reader (groups read one after another and concatenated with np.column_stack) with
+`BladedFile`, which reads all sensor files first and fills preallocated tables in threads.
+
+Usage:
+    python bench_bladed_project.py [nMajor] [nGroups] [workers]
+"""
+import os
+import sys
+import time
+import glob
+import shutil
+import tempfile
+import numpy as np
+from weio.bladed_out_file import BladedFile, read_bladed_output
+
+
+def writeSyntheticProject(folder, nMajor, nGroups, nSensors=10, nSections=20):
+    basename = os.path.join(folder, 'bench')
+    open(basename+'.$PJ', 'w').write('PROJ\n')
+    for i in range(nGroups):
+        threeD = i%4==0
+        chans = ' '.join(["'Sensor {:d}-{:d}'".format(i,j) for j in range(nSensors)])
+        with open(basename+'.%{:02d}'.format(i), 'w') as f:
+            f.write('FORMAT    R*4\n')
+            if threeD:
+                f.write('NDIMENS  3\nDIMENS  {:d}  {:d}  {:d}\n'.format(nSensors, nSections, nMajor))
+            else:
+                f.write('NDIMENS  2\nDIMENS  {:d}  {:d}\n'.format(nSensors, nMajor))
+            f.write("GENLAB   'Group {:d}'\n".format(i))
+            f.write('VARIAB  {}\n'.format(chans))
+            f.write('VARUNIT {}\n'.format(' '.join(['F']*nSensors)))
+            if threeD:
+                f.write('AXISLAB  \'Station\'\nAXIVAL  {}\n'.format(' '.join(['{:.3f}'.format(r) for r in np.linspace(0,80,nSections)])))
+            f.write('AXISLAB  \'Time\'\nMIN   0.0\nSTEP  0.05\n')
+        n = nMajor*nSensors*(nSections if threeD else 1)
+        np.random.normal(size=n).astype(np.float32).tofile(basename+'.${:02d}'.format(i))
+    return basename+'.$PJ'
+
+
+def legacy(filename):
+    files = sorted(glob.glob(os.path.splitext(filename)[0]+'.%[0-9][0-9]*'))
+    data = None
+    for f in files:
+        d, info = read_bladed_output(f, readTimeFilesOnly=True)
+        data = d if data is None else np.column_stack((data, d))
+    return data
+
+
+def timeit(fun, nRep=3):
+    T = []
+    for i in range(nRep):
+        t0 = time.time()
+        fun()
+        T.append(time.time()-t0)
+    return np.min(T)
+
+
+if __name__ == '__main__':
+    nMajor  = int(sys.argv[1]) if len(sys.argv)>1 else 20000
+    nGroups = int(sys.argv[2]) if len(sys.argv)>2 else 70
+    workers = int(sys.argv[3]) if len(sys.argv)>3 else None
+    folder = tempfile.mkdtemp()
+    filename = writeSyntheticProject(folder, nMajor, nGroups)
+    size = sum([os.path.getsize(f) for f in glob.glob(os.path.join(folder,'*.$[0-9]*'))])
+    print('Project size: {:.1f} MB, {:d} groups'.format(size/1e6, nGroups))
+    ref = legacy(filename)
+    F = BladedFile(filename, workers=workers)
+    np.testing.assert_array_equal(F.dataSets['Misc']['data'][:,1:], ref)
+    tRef = timeit(lambda: legacy(filename))
+    print('{:30s}: {:7.3f}s'.format('legacy column_stack', tRef))
+    t = timeit(lambda: BladedFile(filename, workers=workers))
+    print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format('BladedFile', t, tRef/t))
+    shutil.rmtree(folder)
@@ -0,0 +1,69 @@
+"""
+Benchmark of the file format detection on the example files of the test suite.
+
+Compares the detection by trial reading of all the formats matching the extension (legacy),
+with the detection of `weio.detectFormat` which first checks the file signatures (`sniff`).
+The number of file reads attempted by each method is reported.
+
+Usage:
+    python bench_detect_format.py
+"""
+import os
+import glob
+import time
+import warnings
+import numpy as np
+import weio
+from weio.file_formats import isRightFormat
+
+
+def countReads(formats):
+    """ Wrap the constructors of the formats to count the number of reads attempted """
+    counter = {'n':0}
+    for ff in formats:
+        def constructor(*args, _cls=ff.constructor, **kwargs):
+            counter['n'] += 1
+            return _cls(*args, **kwargs)
+        constructor.sniff = getattr(ff.constructor, 'sniff', lambda header: None)
+        ff.constructor = constructor
+    return counter
+
+def legacyDetect(filename, formats):
+    ext = os.path.splitext(filename.lower())[1]
+    for ff in formats:
+        if ff.matchExtension(ext):
+            valid, F = isRightFormat(ff, filename)
+            if valid:
+                return ff, F
+    raise weio.FormatNotDetectedError(filename)
+
+def timeit(fun, nRep=3):
+    T = []
+    for i in range(nRep):
+        t0 = time.time()
+        fun()
+        T.append(time.time()-t0)
+    return np.min(T)
+
+
+if __name__ == '__main__':
+    warnings.filterwarnings('ignore')
+    exampleDir = os.path.join(os.path.dirname(weio.__file__), 'tests', 'example_files')
+    filenames = sorted(glob.glob(os.path.join(exampleDir, '*.*')))
+    formats = weio.fileFormats()
+    counter = countReads(formats)
+
+    def run(detect):
+        for f in filenames:
+            try:
+                detect(f)
+            except Exception:
+                pass
+
+    nReads = {}
+    for name, detect in [('legacy', lambda f: legacyDetect(f, formats)), ('sniff', weio.detectFormat)]:
+        counter['n'] = 0
+        run(detect)
+        nReads[name] = counter['n']
+        t = timeit(lambda: run(detect))
+        print('{:10s}: {:7.3f}s  - {:4d} reads for {} files'.format(name, t, nReads[name], len(filenames)))
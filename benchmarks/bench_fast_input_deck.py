@@ -0,0 +1,70 @@
+"""
+Benchmark of the reading of a sweep of OpenFAST input decks.
+
+Generates `nDecks` copies of the example AeroDyn driver deck, each referencing `nPolars` airfoil
+files (copies of the example polar). Compares the legacy reading (serial, no cache) with the
+concurrent reading using the cache shared by the decks, where identical files are parsed once,
+and with the lazy reading when only the main file is accessed.
+
+Usage:
+    python bench_fast_input_deck.py [nDecks] [nPolars]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import numpy as np
+from weio.fast_input_file import FASTInputFile
+from weio.fast_input_deck import FASTInputDeck, clearCache, cacheStats
+
+MyDir = os.path.join(os.path.dirname(__file__), '..', 'weio', 'tests', 'example_files', 'input_decks')
+
+
+def createSweep(folder, nDecks, nPolars):
+    filenames = []
+    for iDeck in range(nDecks):
+        deckDir = os.path.join(folder, 'Case{:03d}'.format(iDeck))
+        shutil.copytree(MyDir, deckDir)
+        AD = FASTInputFile(os.path.join(deckDir, 'Elliptic_AD15_40.dat'))
+        afNames = []
+        for iPolar in range(nPolars):
+            afName = 'Polar_{:03d}.dat'.format(iPolar)
+            shutil.copy(os.path.join(deckDir, 'Polar2PiAlpha_AD15.dat'), os.path.join(deckDir, afName))
+            afNames.append('"{}"'.format(afName))
+        AD['AFNames']    = afNames
+        AD['NumAFfiles'] = nPolars
+        AD.write()
+        filenames.append(os.path.join(deckDir, 'Main_EllipticalWingInf_OLAF.dvr'))
+    return filenames
+
+
+def timeit(fun, nRep=3):
+    T = []
+    for i in range(nRep):
+        clearCache()
+        t0 = time.time()
+        fun()
+        T.append(time.time()-t0)
+    return np.min(T)
+
+
+if __name__ == '__main__':
+    nDecks  = int(sys.argv[1]) if len(sys.argv)>1 else 20
+    nPolars = int(sys.argv[2]) if len(sys.argv)>2 else 50
+    folder = tempfile.mkdtemp(prefix='_weio_bench_deck')
+    try:
+        filenames = createSweep(folder, nDecks, nPolars)
+        print('{} decks, {} polars each, {} cpus'.format(nDecks, nPolars, os.cpu_count()))
+        tRef = timeit(lambda: [FASTInputDeck(f, cache=False, backend='serial') for f in filenames])
+        print('{:30s}: {:7.3f}s'.format('serial, no cache', tRef))
+        for backend in ['serial', 'thread']:
+            t = timeit(lambda: [FASTInputDeck(f, cache=False, backend=backend) for f in filenames])
+            print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format(backend+', no cache', t, tRef/t))
+            t = timeit(lambda: [FASTInputDeck(f, cache=True, backend=backend) for f in filenames])
+            print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format(backend+', cache', t, tRef/t))
+        t = timeit(lambda: [FASTInputDeck(f, lazy=True).fst['DT'] for f in filenames])
+        print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format('lazy, main file only', t, tRef/t))
+        print('Cache: {}'.format(cacheStats()))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,75 @@
+"""
+Benchmark of the parsing of numerical tables in OpenFAST input files.
+
+Compares the line by line parsing of tables (legacy) with the block parsing of
+`parseFASTNumBlock`, on the example decks, and on decks where the tables were enlarged.
+
+Usage:
+    python bench_fast_input_read.py [nRows]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import weio.fast_input_file as fi
+from weio.fast_input_file import FASTInputFile
+
+MyDir = os.path.join(os.path.dirname(__file__), '..', 'weio', 'tests', 'example_files')
+
+EXAMPLES = ['FASTIn_AD15_arfl.dat', 'FASTIn_AD15_arf_multitabs.dat', 'FASTIn_ED_bld.dat', 'FASTIn_HD.dat', 'FASTIn_SD.dat', 'FASTIn_SbD.dat', 'FASTIn_MD.dat', 'FASTIn_BD.dat']
+
+# file, table, dimension variable
+ENLARGED = [
+    ('FASTIn_AD15_arfl.dat', 'AFCoeff', 'NumAlf'),
+    ('FASTIn_ED_bld.dat'   , 'BldProp', 'NBlInpSt'),
+    ('FASTIn_HD.dat'       , 'Joints' , 'NJoints'),
+    ('FASTIn_HD.dat'       , 'Members', 'NMembers'),
+]
+
+
+def legacyBlock(lines, nCols, tableType='num'):
+    return None # forces the line by line parsing
+
+
+def timeit(fun, nRep=3):
+    T = []
+    for i in range(nRep):
+        t0 = time.time()
+        fun()
+        T.append(time.time()-t0)
+    return np.min(T)
+
+
+def compare(filename, nRep):
+    block = fi.parseFASTNumBlock
+    fi.parseFASTNumBlock = legacyBlock
+    tRef = timeit(lambda: [FASTInputFile(filename) for _ in range(nRep)])
+    ref = FASTInputFile(filename)
+    fi.parseFASTNumBlock = block
+    t = timeit(lambda: [FASTInputFile(filename) for _ in range(nRep)])
+    F = FASTInputFile(filename)
+    for d0, d1 in zip(ref.fixedfile.data, F.fixedfile.data):
+        if isinstance(d0['value'], np.ndarray):
+            np.testing.assert_array_equal(d0['value'], d1['value'])
+    return tRef, t
+
+
+if __name__ == '__main__':
+    nRows = int(sys.argv[1]) if len(sys.argv)>1 else 5000
+    print('--- Example decks (x50)')
+    for filename in EXAMPLES:
+        tRef, t = compare(os.path.join(MyDir, filename), 50)
+        print('{:30s}: legacy: {:7.3f}s, block: {:7.3f}s  (speedup: {:5.2f})'.format(filename, tRef, t, tRef/t))
+
+    print('--- Enlarged tables ({} rows)'.format(nRows))
+    tempFilename = os.path.join(tempfile.gettempdir(), '_weio_bench_fast_input.dat')
+    for filename, table, dimVar in ENLARGED:
+        F = FASTInputFile(os.path.join(MyDir, filename))
+        Tab = F[table]
+        F[table]  = np.tile(Tab, (int(np.ceil(nRows/Tab.shape[0])), 1))[:nRows]
+        F[dimVar] = nRows
+        F.write(tempFilename)
+        tRef, t = compare(tempFilename, 1)
+        print('{:30s}: legacy: {:7.3f}s, block: {:7.3f}s  (speedup: {:5.2f})'.format(filename+' '+table, tRef, t, tRef/t))
+    os.remove(tempFilename)
@@ -0,0 +1,48 @@
+"""
+Benchmark of the generation of OpenFAST input file variants (e.g. for DLC sweeps).
+
+Reads the example input files once, then generates variants where a few scalars are modified,
+comparing the full formatting (`toString()`) with the patch mode (`toString(patch=True)`).
+
+Usage:
+    python bench_fast_input_write.py [nVariants]
+"""
+import os
+import sys
+import time
+import numpy as np
+from weio.fast_input_file import FASTInputFile
+
+MyDir = os.path.join(os.path.dirname(__file__), '..', 'weio', 'tests', 'example_files')
+
+CASES = [
+    ('FASTIn_ED.dat'    , ['RotSpeed', 'BlPitch(1)', 'BlPitch(2)', 'BlPitch(3)']),
+    ('FASTIn_HD.dat'    , ['WaveHs', 'WaveTp', 'WaveDir']),
+    ('FASTIn_ED_bld.dat', ['BldFlDmp(1)', 'BldFlDmp(2)']),
+    ('FASTIn_AD15_arf_multitabs.dat', ['Re_1']),
+]
+
+
+def variants(F, keys, nVariants, patch):
+    for i in range(nVariants):
+        for k in keys:
+            F[k] = float(i)
+        F.toString(patch=patch)
+
+
+def timeit(fun, nRep=3):
+    T = []
+    for i in range(nRep):
+        t0 = time.time()
+        fun()
+        T.append(time.time()-t0)
+    return np.min(T)
+
+
+if __name__ == '__main__':
+    nVariants = int(sys.argv[1]) if len(sys.argv)>1 else 500
+    for filename, keys in CASES:
+        F = FASTInputFile(os.path.join(MyDir, filename))
+        tRef = timeit(lambda: variants(F, keys, nVariants, patch=False))
+        t    = timeit(lambda: variants(F, keys, nVariants, patch=True))
+        print('{:30s}: {:4d} variants, full: {:7.3f}s, patch: {:7.3f}s  (speedup: {:5.2f})'.format(filename, nVariants, tRef, t, tRef/t))
@@ -0,0 +1,67 @@
+"""
+Benchmark of the OpenFAST ascii output readers.
+
+Generates a synthetic OpenFAST ascii output file, formatted as OpenFAST does (F10.4 for the time,
+ES10.3E2 for the channels, tab separated), and compares the legacy reader (np.loadtxt on the file
+handle) with the methods of `load_ascii_output`, for all channels or a subset.
+
+Usage:
+    python bench_fast_output.py [nT] [nChannels]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import weio
+from weio.fast_output_file import FASTOutputFile, _read_ascii_header
+
+
+def writeSyntheticOut(filename, nT, nChannels):
+    data = np.random.normal(size=(nT, nChannels))*10.0**np.random.randint(-3, 6, size=(nT, nChannels))
+    data[:,0] = np.arange(nT)*0.0125
+    with open(filename, 'w') as f:
+        f.write('\nPredictions were generated on 01-Jan-2021 at 00:00:00 using OpenFAST\n\n')
+        f.write('Description from the FAST input file: benchmark\n\n')
+        f.write('\t'.join(['Time']+['Chan{:d}'.format(i) for i in range(1,nChannels)])+'\n')
+        f.write('\t'.join(['(s)'] +['(-)']*(nChannels-1))+'\n')
+        np.savetxt(f, data, fmt=['%10.4f']+['%10.3E']*(nChannels-1), delimiter='\t')
+        f.write('\nThis output file was closed on 01-Jan-2021 at 00:00:00.\n')
+
+
+def legacy(filename):
+    with open(filename) as f:
+        info = _read_ascii_header(f, filename)
+        return np.loadtxt(f, comments=('This'))
+
+
+def timeit(fun, nRep=3):
+    T = []
+    for i in range(nRep):
+        t0 = time.time()
+        fun()
+        T.append(time.time()-t0)
+    return np.min(T)
+
+
+if __name__ == '__main__':
+    nT        = int(sys.argv[1]) if len(sys.argv)>1 else 100000
+    nChannels = int(sys.argv[2]) if len(sys.argv)>2 else 100
+    filename = os.path.join(tempfile.gettempdir(), '_weio_bench.out')
+    writeSyntheticOut(filename, nT, nChannels)
+    print('File size: {:.1f} MB, numpy {}'.format(os.path.getsize(filename)/1e6, np.__version__))
+    ref = legacy(filename)
+    tRef = timeit(lambda: legacy(filename))
+    print('{:30s}: {:7.3f}s'.format('legacy np.loadtxt', tRef))
+    for method in ['numpy', 'fixed']:
+        F = FASTOutputFile(filename, method=method)
+        np.testing.assert_array_equal(F.data, ref)
+        t = timeit(lambda: FASTOutputFile(filename, method=method))
+        print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format('method='+method, t, tRef/t))
+    channels = ['Chan1', 'Chan{:d}'.format(nChannels//2)]
+    for method in ['numpy', 'fixed']:
+        F = FASTOutputFile(filename, method=method, channels=channels)
+        np.testing.assert_array_equal(F.data, ref[:,[0,1,nChannels//2]])
+        t = timeit(lambda: FASTOutputFile(filename, method=method, channels=channels))
+        print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format('method='+method+', 3 channels', t, tRef/t))
+    os.remove(filename)
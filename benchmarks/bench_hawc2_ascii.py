@@ -0,0 +1,47 @@
+"""
+Benchmark of the HAWC2/BHawC ascii result readers.
+
+Generates a synthetic HAWC2 ascii result file (fixed-width columns) and compares the legacy 
+reader (np.loadtxt with usecols) with the methods of `ReadAsciiTable`.
+
+Usage:
+    python bench_hawc2_ascii.py [nScans] [nChannels] [workers]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+from weio.wetb.hawc2.Hawc2io import ReadAsciiTable
+
+
+def writeSyntheticDat(filename, nScans, nChannels):
+    data = np.random.normal(size=(nScans, nChannels))*1e3
+    data[:,0] = np.arange(nScans)*0.02
+    np.savetxt(filename, data, fmt='%13.5E', delimiter='')
+
+def timeit(fun, nRep=3):
+    T = []
+    for i in range(nRep):
+        t0 = time.time()
+        fun()
+        T.append(time.time()-t0)
+    return np.min(T)
+
+
+if __name__ == '__main__':
+    nScans    = int(sys.argv[1]) if len(sys.argv)>1 else 50000
+    nChannels = int(sys.argv[2]) if len(sys.argv)>2 else 300
+    workers   = int(sys.argv[3]) if len(sys.argv)>3 else 4
+    filename = os.path.join(tempfile.gettempdir(), '_weio_bench_hawc2.dat')
+    writeSyntheticDat(filename, nScans, nChannels)
+    print('File size: {:.1f} MB, numpy {}, {} cpus'.format(os.path.getsize(filename)/1e6, np.__version__, os.cpu_count()))
+    for label, usecols in [('all channels', list(range(nChannels))), ('10 channels', list(range(0, nChannels, nChannels//10)))]:
+        ref = np.loadtxt(filename, usecols=usecols)
+        tRef = timeit(lambda: np.loadtxt(filename, usecols=usecols))
+        print('{:14s} {:26s}: {:7.3f}s'.format(label, 'legacy np.loadtxt', tRef))
+        for method, nWorkers in [('numpy',1), ('fixed',1), ('auto',1), ('numpy',workers), ('fixed',workers)]:
+            np.testing.assert_equal(ReadAsciiTable(filename, usecols, method=method, workers=nWorkers), ref)
+            t = timeit(lambda: ReadAsciiTable(filename, usecols, method=method, workers=nWorkers))
+            print('{:14s} {:26s}: {:7.3f}s  (speedup: {:5.2f})'.format(label, 'method={}, workers={}'.format(method, nWorkers), t, tRef/t))
+    os.remove(filename)
@@ -0,0 +1,108 @@
+"""
+Benchmark of the TurbSim binary (.bts) reader and writer.
+
+Generates a synthetic TurbSim box and compares the legacy reader (loop on time steps) with
+`TurbSimFile.read` in memory and memory-mapped, and the legacy writer (full int16 copy of the 
+field written time step by time step) with `TurbSimFile.write`.
+
+Usage:
+    python bench_turbsim.py [nt] [ny] [nz]
+"""
+import os
+import sys
+import time
+import struct
+import tempfile
+import numpy as np
+from weio.turbsim_file import TurbSimFile
+
+
+def writeSyntheticBox(filename, nt, ny, nz, nTwr=5):
+    ts = TurbSimFile()
+    ts['u']    = np.random.normal(size=(3, nt, ny, nz)).astype(np.float32) + np.array([10,0,0])[:,None,None,None]
+    ts['uTwr'] = np.random.normal(size=(3, nt, nTwr)).astype(np.float32)
+    ts['t'] = np.arange(nt)*0.05
+    ts['y'] = np.arange(ny)*2.0 - (ny-1)
+    ts['z'] = np.arange(nz)*2.0 + 10
+    ts['zRef'] = ts['z'][int(nz/2)]
+    ts['uRef'] = 10.0
+    ts.write(filename)
+
+
+def legacy(filename):
+    scl = np.zeros(3, np.float32); off = np.zeros(3, np.float32)
+    with open(filename, mode='rb') as f:            
+        ID, nz, ny, nTwr, nt                      = struct.unpack('<h4l', f.read(2+4*4))
+        dz, dy, dt, uHub, zHub, zBottom           = struct.unpack('<6f' , f.read(6*4)  )
+        scl[0],off[0],scl[1],off[1],scl[2],off[2] = struct.unpack('<6f' , f.read(6*4))
+        nChar, = struct.unpack('<l',  f.read(4))
+        info = (f.read(nChar)).decode()
+        u    = np.zeros((3,nt,ny,nz))
+        uTwr = np.zeros((3,nt,nTwr))
+        for it in range(nt):
+            Buffer = np.frombuffer(f.read(2*3*ny*nz), dtype=np.int16).astype(np.float32).reshape([3, ny, nz], order='F')
+            u[:,it,:,:]=Buffer
+            Buffer = np.frombuffer(f.read(2*3*nTwr), dtype=np.int16).astype(np.float32).reshape([3, nTwr], order='F')
+            uTwr[:,it,:]=Buffer
+        u -= off[:, None, None, None]
+        u /= scl[:, None, None, None]
+        uTwr -= off[:, None, None]
+        uTwr /= scl[:, None, None]
+    return u, uTwr
+
+
+def legacyWrite(filename, ts, tsTwr):
+    intmin = -32768
+    intrng = 65535
+    off    = np.empty((3), dtype    = np.float32)
+    scl    = np.empty((3), dtype    = np.float32)
+    out    = np.empty(ts.shape, dtype=np.int16)
+    outTwr = np.empty(tsTwr.shape, dtype=np.int16)
+    for k in range(3):
+        all_min, all_max = min(ts[k].min(), tsTwr[k].min()), max(ts[k].max(), tsTwr[k].max())
+        scl[k] = intrng / (all_max-all_min)
+        off[k]    = intmin - scl[k] * all_min
+        out[k]    = (ts[k]    * scl[k] + off[k]).astype(np.int16)
+        outTwr[k] = (tsTwr[k] * scl[k] + off[k]).astype(np.int16)
+    with open(filename, mode='wb') as f:            
+        for it in np.arange(ts.shape[1]):
+            f.write(out[:,it,:,:].tobytes(order='F'))
+            f.write(outTwr[:,it,:].tobytes(order='F'))
+
+
+def timeit(fun, nRep=3):
+    T = []
+    for i in range(nRep):
+        t0 = time.time()
+        fun()
+        T.append(time.time()-t0)
+    return np.min(T)
+
+
+if __name__ == '__main__':
+    nt = int(sys.argv[1]) if len(sys.argv)>1 else 4000
+    ny = int(sys.argv[2]) if len(sys.argv)>2 else 32
+    nz = int(sys.argv[3]) if len(sys.argv)>3 else 32
+    filename = os.path.join(tempfile.gettempdir(), '_weio_bench.bts')
+    writeSyntheticBox(filename, nt, ny, nz)
+    print('File size: {:.1f} MB'.format(os.path.getsize(filename)/1e6))
+    u, uTwr = legacy(filename)
+    np.testing.assert_array_equal(TurbSimFile(filename)['u'], u)
+    tRef = timeit(lambda: legacy(filename))
+    print('{:30s}: {:7.3f}s'.format('legacy loop', tRef))
+    cases = [('read', {}), ('read, float32', {'dtype':np.float32}), ('mmap + valuesAt', {'mmap':True})]
+    for label, kwargs in cases:
+        def fun():
+            ts = TurbSimFile(filename, **kwargs)
+            ts.valuesAt(y=0, z=20)
+        t = timeit(fun)
+        print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format(label, t, tRef/t))
+    # --- Writing
+    ts = TurbSimFile(filename)
+    filename2 = os.path.join(tempfile.gettempdir(), '_weio_bench2.bts')
+    tRef = timeit(lambda: legacyWrite(filename2, ts['u'], ts['uTwr']))
+    print('{:30s}: {:7.3f}s'.format('legacy write', tRef))
+    t = timeit(lambda: ts.write(filename2))
+    print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format('write', t, tRef/t))
+    os.remove(filename)
+    os.remove(filename2)
@@ -0,0 +1,55 @@
+"""
+Benchmark of the TurbSim spectral engine.
+
+Computes the coherence between the middle of a synthetic TurbSim box and all the points of the
+grid, with scipy.signal.coherence called point by point (legacy), and with `TurbSimFile.crossSpectra`
+(batched FFT along time, by chunks of points).
+
+Usage:
+    python bench_turbsim_spectra.py [nt] [ny] [nz]
+"""
+import sys
+import time
+import numpy as np
+import scipy.signal as sig
+from weio.turbsim_file import TurbSimFile
+
+
+def legacy(ts):
+    iy0, iz0 = ts.iMid
+    fs = 1/(ts['t'][1]-ts['t'][0])
+    _, ny, nz = ts['u'].shape[1:]
+    coh = []
+    for c in range(3):
+        for iy in range(ny):
+            for iz in range(nz):
+                f, C = sig.coherence(ts['u'][c,:,iy0,iz0], ts['u'][c,:,iy,iz], fs=fs)
+                coh.append(C)
+    return np.array(coh).reshape(3, ny*nz, -1)
+
+
+def timeit(fun, nRep=3):
+    T = []
+    for i in range(nRep):
+        t0 = time.time()
+        fun()
+        T.append(time.time()-t0)
+    return np.min(T)
+
+
+if __name__ == '__main__':
+    nt = int(sys.argv[1]) if len(sys.argv)>1 else 4000
+    ny = int(sys.argv[2]) if len(sys.argv)>2 else 24
+    nz = int(sys.argv[3]) if len(sys.argv)>3 else 24
+    ts = TurbSimFile()
+    ts['u'] = np.random.normal(size=(3, nt, ny, nz))
+    ts['t'] = np.arange(nt)*0.05
+    ts['y'] = np.arange(ny)*2.0 - (ny-1)
+    ts['z'] = np.arange(nz)*2.0 + 10
+    np.testing.assert_allclose(ts.crossSpectra()['coh'], legacy(ts), atol=1e-10)
+    tRef = timeit(lambda: legacy(ts), nRep=1)
+    print('{:30s}: {:7.3f}s'.format('legacy scipy coherence', tRef))
+    t = timeit(lambda: ts.crossSpectra())
+    print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format('crossSpectra', t, tRef/t))
+    t = timeit(lambda: ts.crossSpectra(chunkSize=2**22))
+    print('{:30s}: {:7.3f}s  (speedup: {:5.2f})'.format('crossSpectra, small chunks', t, tRef/t))
@@ -1,5 +1,6 @@
-from .file  import File, WrongFormatError, BrokenFormatError, FileNotFoundError, EmptyFileError
+from .file  import File, WrongFormatError, BrokenFormatError, FileNotFoundError, EmptyFileError, readSignature
 from .file_formats  import FileFormat, isRightFormat
+from .cache import enabled as cacheEnabled, load as cacheLoad, store as cacheStore, dataFrame as cacheDataFrame
 import sys
 import os
 import numpy as np
@@ -201,52 +202,168 @@ def defaultUserDataDir():
 
 
 
-def detectFormat(filename, **kwargs):
+_EXT_INDEX={} # extension -> list of candidate formats, for the library formats
+
+def extensionCandidates(ext, formats=None):
+    """ Returns the list of formats (sorted by priority) matching the lower case extension `ext` """
+    if formats is None:
+        formats = fileFormats()
+    cache = formats is _FORMATS
+    if cache and ext in _EXT_INDEX:
+        return _EXT_INDEX[ext]
+    candidates = [f for f in formats if f.matchExtension(ext)]
+    if cache:
+        _EXT_INDEX[ext] = candidates
+    return candidates
+
+def detectFormat(filename, formats=None, **kwargs):
     """ Detect the file formats by looping through the known list. 
         The method may simply try to open the file, if that's the case
-        the read file is returned. """
-    import os
-    import re
-    global _FORMATS
-    if _FORMATS is None:
-        formats=fileFormats()
-    else:
-        formats=_FORMATS
+        the read file is returned. 
+        The candidate formats are the ones matching the file extension. Their signature is first 
+        checked on the first bytes of the file (see `File.sniff`): formats that recognize the 
+        signature are tried first, formats that reject it are not tried.
+        `formats`: list of FileFormat to consider, default: all the formats of `fileFormats()`
+    """
+    if formats is None:
+        formats = fileFormats() if _FORMATS is None else _FORMATS
     ext = os.path.splitext(filename.lower())[1]
-    detected = False
-    i = 0 
-    while not detected and i<len(formats):
-        myformat = formats[i]
-        if ext in myformat.extensions:
-            extMatch = True
-        else:
-            # Try patterns if present
-            extPatterns = [ef.replace('.','\.').replace('$','\$').replace('*','[.]*') for ef in myformat.extensions if '*' in ef]
-            if len(extPatterns)>0:
-                extPatMatch = [re.match(pat, ext) is not None for pat in extPatterns]
-                extMatch = any(extPatMatch)
-            else:
-                extMatch = False
-        if extMatch: # we have a match on the extension
-            valid, F = isRightFormat(myformat, filename, **kwargs)
-            if valid:
-                #print('File detected as :',myformat)
-                detected=True
-                return myformat,F
+    candidates = extensionCandidates(ext, formats)
+    header = readSignature(filename)
+    if header: # NOTE: missing and empty files are left to the readers, which raise the appropriate errors
+        sure   = []
+        unsure = []
+        for myformat in candidates:
+            sniffed = myformat.sniff(header)
+            if sniffed is None:
+                unsure.append(myformat)
+            elif sniffed:
+                sure.append(myformat)
+        candidates = sure + unsure
 
-        i += 1
+    for myformat in candidates:
+        valid, F = isRightFormat(myformat, filename, **kwargs)
+        if valid:
+            #print('File detected as :',myformat)
+            return myformat,F
 
-    if not detected:
-        raise FormatNotDetectedError('The file format could not be detected for the file: '+filename)
+    raise FormatNotDetectedError('The file format could not be detected for the file: '+filename)
 
-def read(filename, fileformat=None, **kwargs):
+def read(filename, fileformat=None, cache=True, **kwargs):
+    """ 
+    Read a file, detecting its format if `fileformat` is not provided.
+    INPUTS:
+     - cache: if False, the cache is bypassed. The cache is used only if enabled, see `weio.cache.configure`.
+              NOTE: the disk cache directory is trusted, it should only be writable by trusted users 
+              (entries are pickled files, only the classes of weio, numpy and pandas are loaded).
+     - **kwargs: arguments passed to the reader
+    """
+    useCache = cache and cacheEnabled()
+    if useCache:
+        key = (filename, fileformat, kwargs) # before the format is detected
+        F = cacheLoad(*key)
+        if F is not None:
+            return F
     F = None
     # Detecting format if necessary
     if fileformat is None:
         fileformat,F = detectFormat(filename, **kwargs)
     # Reading the file with the appropriate class if necessary
     if not isinstance(F, fileformat.constructor):
-        F=fileformat.constructor(filename=filename)
+        F=fileformat.constructor(filename=filename, **kwargs)
+    if useCache:
+        cacheStore(F, *key)
+    return F
+
+def _readWorker(args):
+    """ Read one file for `read_many`. Exceptions are returned instead of being raised. """
+    filename, fileformat, toDataFrame, kwargs = args
+    try:
+        if toDataFrame:
+            return cacheDataFrame(filename, fileformat, **kwargs)
+        return read(filename, fileformat, **kwargs)
+    except Exception as e:
+        return e
+
+def read_many(filenames, workers=None, backend='process', toDataFrame=False, fileformat=None, raiseErrors=False, chunksize=1, **kwargs):
+    """ 
+    Read many files in parallel, using a pool of processes or threads.
+    Format detection and reading are done in the workers. Results are returned in the order of `filenames`.
+
+    INPUTS:
+     - filenames: list of files to read
+     - workers: number of workers, default: number of cpus
+     - backend: 'process' (recommended for most formats), 'thread' or 'serial'
+     - toDataFrame: if True, the dataframe(s) of each file are returned instead of the file objects.
+                    The conversion is done in the workers, see `weio.cache.dataFrame`.
+     - fileformat: FileFormat to use for all files, default: detected for each file
+     - raiseErrors: if False, the exception encountered for a given file is returned in place of the result.
+                    If True, the first exception is raised.
+     - chunksize: number of files sent at once to each process
+     - **kwargs: arguments passed to `read` (e.g. `channels` for FAST output files)
+
+    OUTPUTS:
+     - list of file objects (or dataframes, or exceptions)
+
+    NOTE: with backend='process', on platforms that spawn processes (Windows, macOS), 
+          the calling script needs to be protected with `if __name__ == '__main__':`
+
+    Example:
+        results = weio.read_many(glob.glob('DLC*.outb'), workers=32, toDataFrame=True)
+        dfs = [r for r in results if not isinstance(r, Exception)]
+    """
+    if backend not in ['process', 'thread', 'serial']:
+        raise ValueError('Unknown backend `{}`, use `process`, `thread` or `serial`'.format(backend))
+    args = [(f, fileformat, toDataFrame, kwargs) for f in filenames]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if backend=='serial' or workers==1:
+        results = map(_readWorker, args)
+    elif backend=='thread':
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_readWorker, args))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_readWorker, args, chunksize=chunksize))
+    results = list(results)
+    if raiseErrors:
+        for r in results:
+            if isinstance(r, Exception):
+                raise r
+    return results
+
+
+def headerFileFormats():
+    """ return the list of fileformats that support reading only the header (`header_only` argument) """
+    import inspect
+    def supportsHeaderOnly(cls):
+        for method in ['read', '_read']:
+            try:
+                if 'header_only' in inspect.signature(getattr(cls, method)).parameters:
+                    return True
+            except (AttributeError, TypeError, ValueError):
+                pass
+        return False
+    return [f for f in fileFormats() if supportsHeaderOnly(f.constructor)]
+
+def read_header(filename, fileformat=None, **kwargs):
+    """ 
+    Read only the header of a file: channel names, units, number of time steps, time step, description..
+    The data is not read. The returned object depends on the file format:
+      - FASTOutputFile, HAWC2DatFile: `info` dictionary (attribute_names, attribute_units, nT, dt, ...)
+      - FLEXOutFile: `sensors` dictionary, and attributes nt, dt, tmin
+      - BladedFile: `dataSets` dictionaries (sensors, units, nMajor, dt)
+      - TurbSimFile: keys y, z, t, dt, ...
+    See `headerFileFormats()` for the list of supported formats.
+    """
+    F = None
+    kwargs['header_only'] = True
+    if fileformat is None:
+        fileformat, F = detectFormat(filename, formats=headerFileFormats(), **kwargs)
+    if not isinstance(F, fileformat.constructor):
+        F=fileformat.constructor(filename=filename, **kwargs)
     return F
 
 
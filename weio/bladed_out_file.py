@@ -128,64 +128,80 @@ def read_bladed_sensor_file(sensorfile):
             
     return dat
             
+def OrgNames(**info):
+    """ Channel names and units of the flattened 2D table (see OrgData)"""
+    if info['NDIMENS'] == 3:
+        # Section labels are formatted once, the columns are ordered by section then channel
+        secLabels = []
+        for sec in info['SectionList']:
+            try:
+                secLabels.append(str(np.around(float(sec),2)) + 'm-')
+            except ValueError:
+                secLabels.append(str(sec) + '-')
+        SName = [sec + chan for sec in secLabels for chan in info['ChannelName']]
+        SUnit = list(info['ChannelUnit']) * len(secLabels)
+        return SName, SUnit
+    else:
+        return info['ChannelName'], info['ChannelUnit']
+
+def OrgIndex(**info):
+    """ (section, channel [unit]) tuples of the columns of the flattened 2D table (see OrgData), 
+    used for MultiIndex columns. The section is '' for 2D outputs."""
+    chans = [chan+' ['+unit+']' for chan,unit in zip(info['ChannelName'], info['ChannelUnit'])]
+    if info['NDIMENS'] == 3:
+        return [(sec, chan) for sec in np.asarray(info['SectionList']).tolist() for chan in chans]
+    else:
+        return [('', chan) for chan in chans]
+
 def OrgData(data, **info):
-    """ Flatten 3D field into 2D table"""
+    """ Flatten 3D field into 2D table
+    The (nMajor, nSections, nSensors) array is reshaped to (nMajor, nSections*nSensors), 
+    columns ordered by section then channel. No copy is done if the array is C-contiguous.
+    """
     # since some of the matrices are 3 dimensional, we want to make all 
     # to 2d matrix, so I am organizing them here:
     if info['NDIMENS'] == 3:
-        SName = []
-        SUnit = []
-        dataOut = np.zeros( (info['nMajor'],len(info['SectionList'])*len(info['ChannelName'])) ) 
-        
-        col_vec = -1
-        for isec,sec in enumerate(info['SectionList']):
-            for ichan,(chan,unit) in enumerate(zip(info['ChannelName'], info['ChannelUnit'])):
-                try:
-                    SName.append(str(np.around(float(sec),2)) + 'm-' + chan)
-                except ValueError:
-                    SName.append(str(sec) + '-' + chan)
-                SUnit.append(unit)
-                col_vec +=1
-                dataOut[:,col_vec] = data[:,isec,ichan]
-
-        data = dataOut
-        info['ChannelName'] = SName
-        info['ChannelUnit'] = SUnit
+        data = np.reshape(data, (info['nMajor'], len(info['SectionList'])*len(info['ChannelName'])))
+        info['ChannelName'], info['ChannelUnit'] = OrgNames(**info)
     else:
         pass # Nothing to do for 2D
 
     return data, info
 
 
-
-def read_bladed_output(sensorFilename, readTimeFilesOnly=False):
+def read_bladed_data(dataFilename, sensorInfo, binary=None, memmap=False):
     """
-    read a bladed sensor file and data file, reorganize a 3D file into 2D table
+    Read a bladed data file ($II) given the informations of its sensor file (%II).
+    Returns an array of shape (nMajor, nSensors) or (nMajor, nSections, nSensors)
+     - binary: True/False if known, otherwise detected from the file content
+     - memmap: if True, binary files are memory-mapped (read-only) instead of loaded
     """
-    # --- Read sensor file and extract relevant informations
-    sensorInfo = read_bladed_sensor_file(sensorFilename)
     nSensors   = sensorInfo['nSensors']
     nMajor     = sensorInfo['nMajor']
     nSections  = sensorInfo['nSections']
-    hasTime = 'MIN' and 'STEP' in sensorInfo.keys()
-    # --- Return if caller only wants time series
-    if readTimeFilesOnly and not hasTime:
-        return [], {}
-    
-    # --- Read data file
-    dataFilename = sensorFilename.replace('%','$')
-
-    if isBinary(dataFilename):            # it is binary            
+    if binary is None:
+        binary = isBinary(dataFilename)
+
+    if binary:            # it is binary            
+        if sensorInfo['NDIMENS'] == 3:
+            shape = (nMajor, nSections, nSensors)
+        elif sensorInfo['NDIMENS'] == 2:
+            shape = (nMajor, nSensors)
+        else:
+            shape = None
+        if memmap and shape is not None:
+            dtype = np.dtype(sensorInfo['Precision'])
+            if os.path.getsize(dataFilename) != int(np.prod(shape))*dtype.itemsize:
+                print('>>> Failed to reshape binary file {}'.format(dataFilename))
+                raise ValueError('Size of binary file {} does not match dimensions {}'.format(dataFilename, shape))
+            return np.memmap(dataFilename, dtype=dtype, mode='r', shape=shape, order='C')
 
         with open(os.path.join(dataFilename), 'rb') as fid_2:
             data = np.fromfile(fid_2, sensorInfo['Precision'])
 
         try:
-            if sensorInfo['NDIMENS'] == 3:
-                data = np.reshape(data,(nMajor, nSections, nSensors), order='C')
-
-            elif sensorInfo['NDIMENS'] == 2:
-                data = np.reshape(data,(nMajor,nSensors), order='C')
+            if shape is not None:
+                data = np.reshape(data, shape, order='C')
         except:
             print('>>> Failed to reshape binary file {}'.format(dataFilename))
             raise
@@ -216,9 +232,159 @@ def read_bladed_output(sensorFilename, readTimeFilesOnly=False):
                 data = np.empty((nMajor, nSections, nSensors)) * np.nan
                 print('>>> Failed to read 3d ascii file: {}'.format(dataFilename))
 
+    return data
+
+
+def read_bladed_output(sensorFilename, readTimeFilesOnly=False):
+    """
+    read a bladed sensor file and data file, reorganize a 3D file into 2D table
+    """
+    # --- Read sensor file and extract relevant informations
+    sensorInfo = read_bladed_sensor_file(sensorFilename)
+    hasTime = 'MIN' and 'STEP' in sensorInfo.keys()
+    # --- Return if caller only wants time series
+    if readTimeFilesOnly and not hasTime:
+        return [], {}
+    
+    # --- Read data file
+    dataFilename = sensorFilename.replace('%','$')
+    data = read_bladed_data(dataFilename, sensorInfo)
+
     return OrgData(data, **sensorInfo)
 
 
+def read_bladed_headers(files, readTimeFilesOnly=False, header_only=False):
+    """
+    Read the sensor files (%II) of a bladed project and organize them into datasets of same length.
+    No data is read. Each dataset contains the list of sensor "groups" (one per sensor file) and 
+    the column where each group starts in the 2D table of the dataset (the first column is the time, when available).
+    """
+    dataSets={}
+    for filename in files:
+        dataFilename = filename.replace('%','$')
+        try:
+            info = read_bladed_sensor_file(filename)
+            if readTimeFilesOnly and 'STEP' not in info.keys():
+                print('>>> Skipping file since no time present {}'.format(filename))
+                continue
+            # Data type, ascii files are read as double
+            binary = None
+            if not header_only:
+                binary = isBinary(dataFilename)
+            dtype = np.dtype(info['Precision']) if binary else np.dtype(np.float64)
+        except FileNotFoundError as e:
+            print('>>> Missing datafile: {}'.format(e.filename))
+            if len(files)==1:
+                raise e
+            continue
+        except ValueError as e:
+            print('>>> ValueError while reading: {}'.format(filename))
+            if len(files)==1:
+                raise e
+            continue
+        names, units = OrgNames(**info)
+        names, units = list(names), list(units)
+
+        # we use number of data as key, but we'll use "name" later
+        key = info['nMajor']
+        if key in dataSets.keys():
+            # dataset with this length are already present, we append the sensors
+            dset = dataSets[key]
+            dset['name']  = 'Misc_'+str(key)
+        else:
+            # We add a new dataset for this length
+            dset = dataSets[key] = {'sensors':[], 'units':[], 'name':info['category'], 'nMajor':info['nMajor'], 
+                    'dt':info.get('STEP', None), 't0':None, 'groups':[]}
+            # We force a time vector when possible
+            if 'STEP' in info.keys():
+                dset['t0'] = info.get('MIN', 0)
+                dset['sensors'].append('Time')
+                dset['units'].append('s')
+        shape = (info['nMajor'], info['nSections'], info['nSensors']) if info['NDIMENS']==3 else (info['nMajor'], len(names))
+        dset['groups'].append({'name':info['category'], 'sensorFile':filename, 'dataFile':dataFilename, 'binary':binary, 'dtype':dtype,
+            'iCol':len(dset['sensors']), 'nCols':len(names), 'shape':shape, 'info':info})
+        dset['sensors'] += names
+        dset['units']   += units
+    for dset in dataSets.values():
+        dset['shape'] = (dset['nMajor'], len(dset['sensors']))
+    return dataSets
+
+
+def read_bladed_group(data, group):
+    """ 
+    Read the data file of one sensor group into the preallocated 2D table of its dataset
+    """
+    info = group['info']
+    d = read_bladed_data(group['dataFile'], info, binary=group['binary'], memmap=True)
+    iCol = group['iCol']
+    data[:, iCol:iCol+group['nCols']] = np.reshape(d, (info['nMajor'], group['nCols']))
+    del d # Release the memory map
+
+
+def read_bladed_datasets(dataSets, workers=None):
+    """
+    Read the data of all the datasets returned by `read_bladed_headers`.
+    The 2D table of each dataset is preallocated and filled by the different groups in parallel threads.
+    Groups that fail to be read are removed from the dataset (unless it's the only group).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    tasks=[]
+    for dset in dataSets.values():
+        dtypes = [g['dtype'] for g in dset['groups']]
+        if dset['t0'] is not None:
+            dtypes.append(np.float64)
+        data = np.empty((dset['nMajor'], len(dset['sensors'])), dtype=np.result_type(*dtypes))
+        if dset['t0'] is not None:
+            data[:,0] = np.arange(dset['nMajor'])*dset['dt'] + dset['t0']
+        dset['data'] = data
+        tasks += [(dset, g) for g in dset['groups']]
+
+    def readTask(task):
+        dset, group = task
+        try:
+            read_bladed_group(dset['data'], group)
+        except (ValueError, FileNotFoundError) as e:
+            return e
+    if workers==1 or len(tasks)<=1:
+        errors = [readTask(task) for task in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            errors = list(executor.map(readTask, tasks))
+
+    # --- Remove the groups that failed
+    for (dset, group), e in zip(tasks, errors):
+        if e is None:
+            continue
+        if len(tasks)==1:
+            raise e
+        print('>>> Error while reading: {}'.format(group['dataFile']))
+        iCols = np.arange(group['iCol'], group['iCol']+group['nCols'])
+        dset['data']    = np.delete(dset['data'], iCols, axis=1)
+        dset['sensors'] = [s for i,s in enumerate(dset['sensors']) if i not in iCols]
+        dset['units']   = [u for i,u in enumerate(dset['units'])   if i not in iCols]
+        dset['groups'].remove(group)
+        dset['shape'] = dset['data'].shape
+        for g in dset['groups']:
+            if g['iCol']>group['iCol']:
+                g['iCol'] -= group['nCols']
+    return dataSets
+
+
+class BladedDataSet(dict):
+    """ 
+    Dataset of a bladed project opened lazily: the sensors, units and shapes are known from the
+    sensor files, the 2D table (key 'data') is read on first access.
+    """
+    workers = None
+
+    def __missing__(self, key):
+        if key=='data':
+            read_bladed_datasets({self['nMajor']: self}, workers=self.workers)
+            return dict.__getitem__(self, 'data')
+        raise KeyError(key)
+
+
+
 class BladedFile(File):
     r"""
     Read a Bladed out put file (current version is only binary files)
@@ -226,6 +392,7 @@ class BladedFile(File):
     Main methods:
         read: it finds all % and $ files based on selected .$PJ file and calls "DataValue" to read data from all those files
         toDataFrame: create Pandas dataframe output
+        groupData, groupToDataFrame: data of one sensor group (%II file), see `lazy`
         
     Main data stored:
          self.dataSets: dictionary of datasets, for each "length" of data
@@ -235,6 +402,10 @@ class BladedFile(File):
         f = BladedFile(filename)
         print(f.dataSets.keys())
         df = f.toDataFrame()
+
+        f = BladedFile(r'Bladed_out.$PJ', lazy=True) # only sensor files are read
+        print(f.groups.keys())
+        M = f.groupData('Blade 1 Loads: Root axes', flatten=False) # nMajor x nSections x nSensors
         
     """ 
     @staticmethod
@@ -263,11 +434,17 @@ class BladedFile(File):
         # Calling children function
         self._read(**kwargs)
     
-    def _read(self):
+    def _read(self, header_only=False, workers=None, lazy=False):
         """ 
         Read a bladed output file, data are in *.$II and sensors in *%II. 
          - If the file is a *$PJ file, all output files are read
          - Otherwise only the current file is read 
+        If `header_only` is True, only the sensor files (%II) are read, the datasets contain
+        the sensors, units, number of time steps (`nMajor`) and time step (`dt`) but no `data`.
+        The sensor files are all read first, the data files are then read in `workers` threads 
+        (default: ThreadPoolExecutor default) into the preallocated table of each dataset.
+        If `lazy` is True, only the sensor files are read, the data of a dataset is read when 
+        its key 'data' is accessed, and the data of a sensor group when using `groupData`.
         """
 
         basename, ext = os.path.splitext(self.filename)
@@ -281,9 +458,6 @@ class BladedFile(File):
         # Look for files matching pattern
         files = glob.glob(searchPattern)
 
-        # We'll store the data in "dataSets",dictionaries
-        dataSets={}
-
         if len(files)==0:
             e= FileNotFoundError(searchPattern)
             e.filename=(searchPattern)
@@ -293,58 +467,14 @@ class BladedFile(File):
 
         files.sort()
 
-        for i,filename in enumerate(files):
-
-            dataFilename = filename.replace('%','$')
-            try:
-                # Call "Read_bladed_file" function to Read and store data:
-                data, info = read_bladed_output(filename, readTimeFilesOnly=readTimeFilesOnly)    
-            except FileNotFoundError as e:
-                print('>>> Missing datafile: {}'.format(e.filename))
-                if len(files)==1:
-                    raise e
-                continue
-            except ValueError as e:
-                print('>>> ValueError while reading: {}'.format(dataFilename))
-                if len(files)==1:
-                    raise e
-                continue
-            except:
-                raise 
-                print('>>> Misc error while reading: {}'.format(dataFilename))
-                if len(files)==1:
-                    raise 
-                continue
-            if len(data)==0:
-                print('>>> Skipping file since no time present {}'.format(filename))
-                continue
-            
-            # we use number of data as key, but we'll use "name" later
-            key = info['nMajor']
-            
-            if key in dataSets.keys():
-                # dataset with this length are already present, we concatenate
-                dset = dataSets[key]
-                dset['data'] =  np.column_stack((dset['data'], data))
-                dset['sensors'] += info['ChannelName']
-                dset['units']   += info['ChannelUnit']
-                dset['name']  = 'Misc_'+str(key)
-
-            else:
-                # We add a new dataset for this length
-                dataSets[key] = {}
-                dset = dataSets[key]
-                # We force a time vector when possible
-                if 'MIN' and 'STEP' in info.keys():
-                    time = np.arange(info['nMajor'])*info['STEP'] + info['MIN']
-                    data = np.column_stack((time, data))
-                    info['ChannelName'].insert(0, 'Time')
-                    info['ChannelUnit'].insert(0, 's')
-
-                dset['data']    = data
-                dset['sensors'] = info['ChannelName']
-                dset['units']   = info['ChannelUnit']
-                dset['name']    = info['category']
+        # We'll store the data in "dataSets",dictionaries
+        dataSets = read_bladed_headers(files, readTimeFilesOnly=readTimeFilesOnly, header_only=header_only)
+        if lazy and not header_only:
+            dataSets = {k: BladedDataSet(v) for k,v in dataSets.items()}
+            for dset in dataSets.values():
+                dset.workers = workers
+        elif not header_only:
+            read_bladed_datasets(dataSets, workers=workers)
 
         # Check if we have "many" misc, if only one, replace by "Misc"
         keyMisc = [k for k,v in dataSets.items() if v['name'].startswith('Misc_')]
@@ -356,15 +486,97 @@ class BladedFile(File):
             # Instead of using nMajor as key, we use the "name"
             self.dataSets= {v['name']: v for (k, v) in dataSets.items()}
 
-                
-    def toDataFrame(self):        
+
+    @property
+    def groups(self):
+        """ 
+        Sensor groups (one per sensor file %II) of all the datasets, with the group names as keys.
+        Each group contains the sensor file informations ('info') and the `shape` of its data.
+        """
+        groups = {}
+        for dset in self.dataSets.values():
+            for g in dset['groups']:
+                name = g['name']
+                if name in groups.keys():
+                    name = name + ' (' + os.path.splitext(g['sensorFile'])[1] + ')'
+                groups[name] = g
+        return groups
+
+    def _group(self, name):
+        """ return the dataset and group info for a group name or a file number (e.g. 25 for %25)"""
+        for dset in self.dataSets.values():
+            for g in dset['groups']:
+                num = os.path.splitext(g['sensorFile'])[1][2:]
+                if name==g['name'] or str(name).lstrip('%').zfill(2)==num:
+                    return dset, g
+        raise KeyError('Sensor group not found: {}. Available groups: {}'.format(name, list(self.groups.keys())))
+
+    def groupData(self, name, flatten=True):
+        """ 
+        Return the data of one sensor group, reading only the data file of this group if the
+        dataset was not read yet (see `lazy`). 
+         - name: group name (see `groups`) or file number (e.g. 25 or '%25')
+         - flatten: if True, return a 2D table (nMajor x nCols) with the columns of `groupChannels`. 
+                    If False, 3D groups are returned with shape (nMajor, nSections, nSensors).
+        The arrays returned are views (no copy) of the dataset table or of the memory-mapped file (read-only).
+        """
+        dset, g = self._group(name)
+        if 'data' in dset.keys():
+            data = dset['data'][:, g['iCol']:g['iCol']+g['nCols']]
+        else:
+            if 'data' not in g.keys():
+                g['data'] = read_bladed_data(g['dataFile'], g['info'], binary=g['binary'], memmap=True)
+            data = g['data']
+        if flatten:
+            return np.reshape(data, (g['shape'][0], g['nCols']))
+        else:
+            return np.reshape(data, g['shape'])
+
+    def groupChannels(self, name):
+        """ Return the channel names and units of a sensor group (flattened, see `groupData`)"""
+        dset, g = self._group(name)
+        iCol = g['iCol']
+        return dset['sensors'][iCol:iCol+g['nCols']], dset['units'][iCol:iCol+g['nCols']]
+
+    def groupToDataFrame(self, name, multiIndex=False):
+        """ Return a dataframe for one sensor group, with the time as first column when available
+        If `multiIndex` is True, the columns are a MultiIndex (section, channel) (see `toDataFrame`).
+        """
+        dset, g = self._group(name)
+        if multiIndex:
+            columns = pd.MultiIndex.from_tuples(OrgIndex(**g['info']), names=['section', 'channel'])
+        else:
+            sensors, units = self.groupChannels(name)
+            columns = [s+' ['+u+']' for s,u in zip(sensors, units)]
+        df = pd.DataFrame(data=self.groupData(name), columns=columns)
+        if dset['t0'] is not None:
+            df.insert(0, ('', 'Time [s]') if multiIndex else 'Time [s]', np.arange(dset['nMajor'])*dset['dt'] + dset['t0'])
+        df = df.loc[:,~df.columns.duplicated()]
+        if not multiIndex:
+            df.columns.name = g['name']
+        return df
+
+    def toDataFrame(self, multiIndex=False):
+        """ 
+        Return a dataframe per dataset (or a single dataframe if there is only one dataset).
+        By default, the sections of 3D outputs are part of the column names (e.g. '26.41m-DPMOM1 [Nm/m]').
+        If `multiIndex` is True, the columns are a MultiIndex (section, channel), e.g. (26.41, 'DPMOM1 [Nm/m]'),
+        the section is '' for 2D outputs and for the time.
+        """
         dfs={}
         for k,dset in self.dataSets.items():
-            BL_ChannelUnit = [ name+' ['+unit+']' for name,unit in zip(dset['sensors'],dset['units'])]
-            df = pd.DataFrame(data=dset['data'], columns=BL_ChannelUnit)
+            if multiIndex:
+                tuples = [('', 'Time [s]')] if dset['t0'] is not None else []
+                for g in dset['groups']:
+                    tuples += OrgIndex(**g['info'])
+                columns = pd.MultiIndex.from_tuples(tuples, names=['section', 'channel'])
+            else:
+                columns = [ name+' ['+unit+']' for name,unit in zip(dset['sensors'],dset['units'])]
+            df = pd.DataFrame(data=dset['data'], columns=columns)
             # remove duplicate columns
             df = df.loc[:,~df.columns.duplicated()]
-            df.columns.name = k # hack for pyDatView when one dataframe is returned
+            if not multiIndex:
+                df.columns.name = k # hack for pyDatView when one dataframe is returned
             dfs[k] = df
         if len(dfs)==1:
             return dfs[next(iter(dfs))]
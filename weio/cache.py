@@ -0,0 +1,428 @@
+"""
+Caching of the files read with `weio.read`.
+
+Memory cache (opt-in)
+---------------------
+The file objects recently returned by `weio.read` are kept in memory, together with their
+dataframes (see `dataFrame`), up to a memory budget (`max_bytes`). The size of an entry is
+the size of the arrays and dataframes it contains. The least recently used entries are
+evicted first. The cache keeps its own copy of the objects, and `weio.read` returns a new
+copy each time, which may be modified. The dataframes returned by `dataFrame` are shallow
+copies of the cached ones: columns may be added or removed, values should not be modified.
+
+Disk cache (opt-in)
+-------------------
+The file objects returned by `weio.read` are stored in a cache directory. Their large arrays
+are stored as numpy .npy files, which are memory-mapped when the same file is read again,
+so that reopening a large output file is almost instantaneous.
+An entry is identified by the absolute path, modification time and size of the file, the
+arguments passed to `read`, and the version of the readers (the weio source files).
+The size of the cache directory is bounded: the least recently used entries are evicted first.
+
+Examples
+--------
+
+    import weio
+    weio.cache.configure(max_bytes=2e9)  # memory cache of 2GB
+    F = weio.read('Main.outb')               # read from file
+    F = weio.read('Main.outb')               # copy of the object of the memory cache
+    df = weio.cache.dataFrame('Main.outb')   # converted once
+    weio.cache.configure(max_bytes=0)        # turn off the memory cache
+
+    weio.cache.configure(disk=True)   # default directory, see `defaultDirectory`
+    weio.cache.configure(disk=True, directory='/scratch/weio_cache', disk_max_bytes=50e9)
+    F = weio.read('Main.outb')               # read from file, stored in the cache
+    F = weio.read('Main.outb')               # loaded from the cache
+    F = weio.read('Main.outb', cache=False)  # cache bypassed
+    weio.cache.configure(disk=False)         # turn off the cache
+    weio.cache.clear()                       # delete all entries
+
+NOTE: arrays loaded from the cache are memory-mapped in copy-on-write mode: they may be
+      modified in memory, the changes are not written to the cache.
+
+NOTE: the file objects are stored with pickle. When loading, only the classes of weio and
+      the numpy and pandas objects needed to rebuild arrays and dataframes are allowed
+      (see `_Unpickler.find_class`), an entry referring to anything else is discarded.
+      The cache directory should nevertheless only be writable by trusted users.
+"""
+import os
+import copy
+import json
+import glob
+import shutil
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+
+CACHE_FORMAT = 1          # To be incremented when the storage layout changes
+MIN_ARRAY_BYTES = 2**16   # Arrays smaller than this are stored within the pickle file
+
+_OPTIONS = {
+    'max_bytes'     : 0,       # Memory budget of the memory cache, 0: disabled
+    'disk'          : False,   # Disk cache enabled
+    'directory'     : None,    # Disk cache directory, default: `defaultDirectory()`
+    'disk_max_bytes': 10*2**30,# Maximum size of the disk cache directory
+    }
+_STATS = {'memory_hits':0, 'memory_misses':0, 'disk_hits':0, 'disk_misses':0}
+_MEMORY = OrderedDict() # key -> entry (dict with keys 'file', 'dfs', 'nbytes'), least recently used first
+_MEMORY_LOCK = threading.RLock()
+_LIBRARY_VERSION = None
+
+
+# --------------------------------------------------------------------------------}
+# --- Configuration
+# --------------------------------------------------------------------------------{
+def configure(max_bytes=None, disk=None, directory=None, disk_max_bytes=None):
+    """
+    Configure the cache used by `weio.read`. Arguments left to None are not changed.
+    INPUTS:
+     - max_bytes: memory budget of the memory cache, in bytes. 0 disables the memory cache.
+     - disk: if True, the disk cache is enabled, if False, it is disabled
+     - directory: directory where the disk cache is stored
+     - disk_max_bytes: maximum size of the disk cache, in bytes
+    Returns the current options (dictionary)
+    """
+    if max_bytes is not None:
+        _OPTIONS['max_bytes'] = int(max_bytes)
+        memoryEvict()
+    if disk is not None:
+        _OPTIONS['disk'] = bool(disk)
+    if directory is not None:
+        _OPTIONS['directory'] = os.path.abspath(directory)
+    if disk_max_bytes is not None:
+        _OPTIONS['disk_max_bytes'] = int(disk_max_bytes)
+    return dict(_OPTIONS)
+
+def defaultDirectory():
+    from . import defaultUserDataDir
+    return os.path.join(defaultUserDataDir(), 'weio', 'cache')
+
+def directory():
+    """ Returns the disk cache directory """
+    if _OPTIONS['directory'] is None:
+        return defaultDirectory()
+    return _OPTIONS['directory']
+
+def enabled():
+    return _OPTIONS['disk'] or _OPTIONS['max_bytes']>0
+
+def stats():
+    """ Returns the number of cache hits and misses, and the number and size of the entries """
+    s = dict(_STATS)
+    with _MEMORY_LOCK:
+        s['memory_entries'] = len(_MEMORY)
+        s['memory_bytes']   = int(np.sum([e['nbytes'] for e in _MEMORY.values()]))
+    entries = _diskEntries()
+    s['disk_entries'] = len(entries)
+    s['disk_bytes']   = int(np.sum([e[2] for e in entries]))
+    return s
+
+def clear(memory=True, disk=True):
+    """ Delete all the entries of the memory and/or disk cache """
+    if memory:
+        with _MEMORY_LOCK:
+            _MEMORY.clear()
+    if disk:
+        for entry, _, _ in _diskEntries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+# --------------------------------------------------------------------------------}
+# --- Interface with `weio.read`
+# --------------------------------------------------------------------------------{
+def load(filename, fileformat=None, kwargs=None):
+    """ Returns the object stored in the memory or disk cache for a given file, or None if not present """
+    try:
+        key = fileKey(filename, fileformat, kwargs)
+    except OSError:
+        return None # File not found, left to the reader
+    F = None
+    if _OPTIONS['max_bytes']>0:
+        F = memoryLoad(key)
+    if F is None and _OPTIONS['disk']:
+        F = diskLoad(key)
+        if F is not None and _OPTIONS['max_bytes']>0:
+            memoryStore(F, key)
+    return F
+
+def store(F, filename, fileformat=None, kwargs=None):
+    """ Store an object in the enabled caches """
+    key = fileKey(filename, fileformat, kwargs)
+    if _OPTIONS['disk']:
+        diskStore(F, key, filename)
+    if _OPTIONS['max_bytes']>0:
+        memoryStore(F, key)
+
+def dataFrame(filename, fileformat=None, cache=True, **kwargs):
+    """ 
+    Dataframe(s) of a file (see `toDataFrame` of the file objects). With the memory cache enabled,
+    the file is read and converted once, the dataframes are stored in the memory cache and shallow 
+    copies are returned, so that columns may be added or removed.
+    INPUTS: see `weio.read`
+    """
+    from . import read
+    if not cache or _OPTIONS['max_bytes']<=0:
+        return read(filename, fileformat, cache=cache, **kwargs).toDataFrame()
+    key = fileKey(filename, fileformat, kwargs)
+    with _MEMORY_LOCK:
+        entry = _MEMORY.get(key, None)
+    if entry is None:
+        F = read(filename, fileformat, **kwargs)
+        with _MEMORY_LOCK:
+            entry = _MEMORY.get(key, None)
+        if entry is None:
+            return F.toDataFrame() # Object too large for the memory cache
+    if entry['dfs'] is None:
+        dfs = entry['file'].toDataFrame()
+        with _MEMORY_LOCK:
+            entry['dfs'] = dfs
+            entry['nbytes'] += nbytes(dfs)
+            memoryEvict()
+    dfs = entry['dfs']
+    if isinstance(dfs, dict):
+        return dict([(k, df.copy(deep=False) if hasattr(df, 'copy') else df) for k,df in dfs.items()])
+    elif hasattr(dfs, 'copy'):
+        return dfs.copy(deep=False)
+    return dfs
+
+
+# --------------------------------------------------------------------------------}
+# --- Keys
+# --------------------------------------------------------------------------------{
+def libraryVersion():
+    """
+    Version of the readers: hash of the names, sizes and modification times of the weio source files.
+    Computed once per session.
+    """
+    global _LIBRARY_VERSION
+    if _LIBRARY_VERSION is None:
+        libDir = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha1(str(CACHE_FORMAT).encode('utf-8'))
+        for root, dirs, files in sorted(os.walk(libDir)):
+            dirs[:] = sorted([d for d in dirs if d not in ['tests','__pycache__']])
+            for f in sorted(files):
+                if f.endswith('.py'):
+                    st = os.stat(os.path.join(root, f))
+                    h.update('{}:{}:{}'.format(os.path.relpath(os.path.join(root,f), libDir), st.st_size, st.st_mtime).encode('utf-8'))
+        _LIBRARY_VERSION = h.hexdigest()
+    return _LIBRARY_VERSION
+
+def nbytes(obj, _seen=None):
+    """ Size in bytes of the arrays and dataframes contained in an object (recursively) """
+    import pandas as pd
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    elif isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=False).sum())
+    elif isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=False))
+    elif isinstance(obj, (str, bytes)):
+        return len(obj)
+    n = 0
+    if isinstance(obj, dict):
+        n += np.sum([nbytes(v, _seen) for v in obj.values()])
+    elif isinstance(obj, (list, tuple)):
+        n += np.sum([nbytes(v, _seen) for v in obj])
+    if type(obj).__module__.startswith('weio') and hasattr(obj, '__dict__'):
+        # File objects and helper classes of the library
+        n += nbytes(obj.__dict__, _seen)
+    return int(n)
+
+def fileKey(filename, fileformat=None, kwargs=None):
+    """ Key of a file in the cache: absolute path, modification time, size and reading arguments """
+    filename = os.path.abspath(filename)
+    st = os.stat(filename)
+    kwargs = {} if kwargs is None else kwargs
+    fmt = None if fileformat is None else fileformat.name
+    s = repr((filename, st.st_mtime, st.st_size, fmt, sorted([(k, repr(v)) for k,v in kwargs.items()])))
+    return hashlib.sha1(s.encode('utf-8')).hexdigest()
+
+
+# --------------------------------------------------------------------------------}
+# --- Memory cache
+# --------------------------------------------------------------------------------{
+def memoryLoad(key):
+    """ Returns a copy of the object stored in the memory cache for a given key, or None """
+    with _MEMORY_LOCK:
+        entry = _MEMORY.get(key, None)
+        if entry is None:
+            _STATS['memory_misses'] += 1
+            return None
+        _MEMORY.move_to_end(key)
+        _STATS['memory_hits'] += 1
+    return copy.deepcopy(entry['file'])
+
+def memoryStore(F, key):
+    """ Store a copy of an object in the memory cache, and evict the least recently used entries if needed.  """
+    n = nbytes(F)
+    if n>_OPTIONS['max_bytes']:
+        return False
+    try:
+        F = copy.deepcopy(F)
+    except Exception:
+        return False # Object that cannot be copied
+    with _MEMORY_LOCK:
+        _MEMORY[key] = {'file':F, 'dfs':None, 'nbytes':n}
+        _MEMORY.move_to_end(key)
+        memoryEvict()
+    return True
+
+def memoryEvict(max_bytes=None):
+    """ Remove the least recently used entries of the memory cache until its size is below `max_bytes` """
+    if max_bytes is None:
+        max_bytes = _OPTIONS['max_bytes']
+    with _MEMORY_LOCK:
+        total = np.sum([e['nbytes'] for e in _MEMORY.values()])
+        while len(_MEMORY)>0 and total>max_bytes:
+            key, entry = _MEMORY.popitem(last=False)
+            total -= entry['nbytes']
+
+
+# --------------------------------------------------------------------------------}
+# --- Disk cache
+# --------------------------------------------------------------------------------{
+class _Pickler(pickle.Pickler):
+    """ Pickler storing the large arrays as separate .npy files """
+    def __init__(self, f, folder):
+        pickle.Pickler.__init__(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.folder = folder
+        self.arrays = {} # id -> (name, array), the array reference keeps the id valid
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, np.ndarray) or obj.dtype.hasobject or obj.nbytes<MIN_ARRAY_BYTES:
+            return None
+        if id(obj) not in self.arrays:
+            name = 'arr_{:d}.npy'.format(len(self.arrays))
+            np.save(os.path.join(self.folder, name), np.asarray(obj), allow_pickle=False)
+            self.arrays[id(obj)] = (name, obj)
+        return self.arrays[id(obj)][0]
+
+# Functions and classes that may be loaded from the disk cache, in addition to the classes of weio,
+# numpy scalars and dtypes, and pandas containers (see `_Unpickler.find_class`)
+_SAFE_GLOBALS = set([
+    ('builtins', 'set'), ('builtins', 'frozenset'), ('builtins', 'slice'), ('builtins', 'complex'),
+    ('builtins', 'range'), ('builtins', 'bytearray'), ('collections', 'OrderedDict'),
+    ('datetime', 'datetime'), ('datetime', 'date'), ('datetime', 'time'), ('datetime', 'timedelta'), ('datetime', 'timezone'),
+    ('numpy', 'ndarray'),
+    ('numpy.core.multiarray', '_reconstruct'), ('numpy.core.multiarray', 'scalar'), ('numpy.core.numeric', '_frombuffer'),
+    ('numpy._core.multiarray', '_reconstruct'), ('numpy._core.multiarray', 'scalar'), ('numpy._core.numeric', '_frombuffer'),
+    ('pandas._libs.internals', '_unpickle_block'), ('pandas.core.indexes.base', '_new_Index'),
+    ('pandas.core.indexes.period', '_new_PeriodIndex'), ('pandas.core.indexes.datetimes', '_new_DatetimeIndex'),
+    ('pandas._libs.tslibs.timestamps', '_unpickle_timestamp'),
+    ])
+
+def _safeClass(module, obj):
+    """ True for the classes that may be loaded from the disk cache besides `_SAFE_GLOBALS` """
+    if not isinstance(obj, type):
+        return False
+    package = module.split('.')[0]
+    if package=='weio':
+        return True
+    elif package=='numpy':
+        return issubclass(obj, (np.generic, np.dtype))
+    elif package=='pandas':
+        return module.startswith('pandas.core.') or module.startswith('pandas._libs.')
+    return False
+
+class _Unpickler(pickle.Unpickler):
+    """ Unpickler memory-mapping the arrays stored as .npy files, only safe globals are loaded """
+    def __init__(self, f, folder):
+        pickle.Unpickler.__init__(self, f)
+        self.folder = folder
+
+    def persistent_load(self, pid):
+        return np.load(os.path.join(self.folder, pid), mmap_mode='c', allow_pickle=False)
+
+    def find_class(self, module, name):
+        if (module, name) in _SAFE_GLOBALS:
+            return pickle.Unpickler.find_class(self, module, name)
+        if module.split('.')[0] in ['weio', 'numpy', 'pandas']:
+            obj = pickle.Unpickler.find_class(self, module, name)
+            if _safeClass(module, obj):
+                return obj
+        raise pickle.UnpicklingError('Global `{}.{}` is not allowed in the weio cache'.format(module, name))
+
+def _diskEntries():
+    """ Returns the list of entries of the disk cache: (folder, last access time, size in bytes)"""
+    entries = []
+    for entry in glob.glob(os.path.join(directory(), '*', 'meta.json')):
+        folder = os.path.dirname(entry)
+        if os.path.basename(folder).startswith('_tmp'):
+            continue # entry being written
+        try:
+            lastAccess = os.path.getmtime(entry)
+            size = np.sum([os.path.getsize(f) for f in glob.glob(os.path.join(folder,'*'))])
+        except OSError:
+            continue # entry removed in the meantime
+        entries.append((folder, lastAccess, size))
+    return entries
+
+def diskLoad(key):
+    """ Returns the object stored in the disk cache for a given key, or None if not present """
+    folder = os.path.join(directory(), key)
+    metaFile = os.path.join(folder, 'meta.json')
+    F = None
+    if os.path.exists(metaFile):
+        try:
+            with open(metaFile, 'r') as f:
+                meta = json.load(f)
+            if meta['version']==libraryVersion():
+                with open(os.path.join(folder, 'object.pkl'), 'rb') as f:
+                    F = _Unpickler(f, folder).load()
+                os.utime(metaFile, None) # Used for the least recently used eviction
+            else:
+                shutil.rmtree(folder, ignore_errors=True)
+        except Exception:
+            F = None
+    if F is None:
+        _STATS['disk_misses'] += 1
+    else:
+        _STATS['disk_hits'] += 1
+    return F
+
+def diskStore(F, key, filename):
+    """
+    Store an object in the disk cache, and evict the least recently used entries if needed.
+    Returns True if the object was stored. Objects that cannot be pickled are not stored.
+    """
+    cacheDir = directory()
+    folder = os.path.join(cacheDir, key)
+    if os.path.exists(folder):
+        return True
+    if not os.path.exists(cacheDir):
+        os.makedirs(cacheDir)
+    # Written in a temporary folder first, then renamed, so that entries are always complete
+    tmpFolder = tempfile.mkdtemp(dir=cacheDir, prefix='_tmp')
+    try:
+        with open(os.path.join(tmpFolder, 'object.pkl'), 'wb') as f:
+            _Pickler(f, tmpFolder).dump(F)
+        meta = {'filename':os.path.abspath(filename), 'version':libraryVersion(), 'class':type(F).__name__}
+        with open(os.path.join(tmpFolder, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        os.rename(tmpFolder, folder)
+    except Exception:
+        # Object not picklable, disk full, or entry written concurrently by another process
+        shutil.rmtree(tmpFolder, ignore_errors=True)
+        return False
+    evict()
+    return True
+
+def evict(max_bytes=None):
+    """ Delete the least recently used entries of the disk cache until its size is below `max_bytes` """
+    if max_bytes is None:
+        max_bytes = _OPTIONS['disk_max_bytes']
+    entries = sorted(_diskEntries(), key=lambda e: e[1])
+    total = np.sum([e[2] for e in entries])
+    for folder, _, size in entries:
+        if total<=max_bytes:
+            break
+        shutil.rmtree(folder, ignore_errors=True)
+        total -= size
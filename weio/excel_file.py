@@ -21,6 +21,11 @@ class ExcelFile(File):
     def formatName():
         return 'Excel file'
 
+    @staticmethod
+    def sniff(header):
+        # xlsx: zip archive, xls: OLE2 compound document
+        return header[:4]==b'PK\x03\x04' or header[:8]==b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
     def _read(self):
         self.data=dict()
         # Reading all sheets
@@ -11,17 +11,299 @@ import os
 import numpy as np
 import re
 import pandas as pd
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
 
 from .fast_input_file import FASTInputFile
 
-__all__  = ['FASTInputDeck']
+__all__  = ['FASTInputDeck', 'LazyInputFile']
+
+# --------------------------------------------------------------------------------}
+# --- Cache of input files, shared by all the decks
+# --------------------------------------------------------------------------------{
+_CACHE_OPTIONS = {'max_bytes': 256*2**20} # Memory budget, 0: disabled
+_CACHE_STATS   = {'hits':0, 'misses':0}
+_CACHE_PATHS   = OrderedDict() # (resolved path, mtime, size) -> content hash, least recently used first
+_CACHE_PATHS_MAX = 4096        # Maximum number of paths whose hash is kept
+_CACHE         = OrderedDict() # content hash -> pickled file object, least recently used first
+_CACHE_LOCK    = threading.RLock()
+
+def configureCache(max_bytes=None):
+    """ 
+    Configure the cache of input files shared by all the decks of the session.
+    The files are identified by their content, so that copies of a file (e.g. the polars of
+    the different decks of a sweep) are parsed only once. Each deck receives its own copy
+    of the file objects, which can be modified independently.
+    INPUTS:
+     - max_bytes: memory budget of the cache, in bytes. 0 disables the cache.
+    Returns the current options (dictionary)
+    """
+    if max_bytes is not None:
+        _CACHE_OPTIONS['max_bytes'] = int(max_bytes)
+        _cacheEvict()
+    return dict(_CACHE_OPTIONS)
+
+def clearCache():
+    """ Delete all the entries of the cache of input files """
+    with _CACHE_LOCK:
+        _CACHE_PATHS.clear()
+        _CACHE.clear()
+
+def cacheStats():
+    """ Returns the number of hits and misses, and the number and size of the entries of the cache """
+    with _CACHE_LOCK:
+        s = dict(_CACHE_STATS)
+        s['entries'] = len(_CACHE)
+        s['bytes']   = sum([len(b) for b in _CACHE.values()])
+    return s
+
+def _cacheKey(fullpath):
+    """ Content hash of a file. The hash is computed once for a given path, modification time and size. """
+    realpath = os.path.realpath(fullpath)
+    st = os.stat(realpath)
+    pathKey = (realpath, st.st_mtime_ns, st.st_size)
+    with _CACHE_LOCK:
+        key = _CACHE_PATHS.get(pathKey, None)
+        if key is not None:
+            _CACHE_PATHS.move_to_end(pathKey)
+    if key is None:
+        with open(realpath, 'rb') as f:
+            key = hashlib.sha1(f.read()).hexdigest()
+        with _CACHE_LOCK:
+            _CACHE_PATHS[pathKey] = key
+            while len(_CACHE_PATHS)>_CACHE_PATHS_MAX:
+                _CACHE_PATHS.popitem(last=False)
+    return key
+
+def _cacheLoad(fullpath):
+    """ Returns a copy of the file object stored in the cache, or None """
+    if _CACHE_OPTIONS['max_bytes']<=0:
+        return None
+    try:
+        key = _cacheKey(fullpath)
+    except OSError:
+        return None # File not found, left to the reader
+    with _CACHE_LOCK:
+        b = _CACHE.get(key, None)
+        if b is None:
+            _CACHE_STATS['misses'] += 1
+            return None
+        _CACHE.move_to_end(key)
+        _CACHE_STATS['hits'] += 1
+    F = pickle.loads(b)
+    _setFilename(F, fullpath)
+    return F
+
+def _cacheStore(F, fullpath):
+    """ Store a file object in the cache """
+    if _CACHE_OPTIONS['max_bytes']<=0:
+        return
+    try:
+        key = _cacheKey(fullpath)
+        b = pickle.dumps(F, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return # File removed in the meantime, or object not picklable
+    if len(b)>_CACHE_OPTIONS['max_bytes']:
+        return
+    with _CACHE_LOCK:
+        _CACHE[key] = b
+        _CACHE.move_to_end(key)
+        _cacheEvict()
+
+def _cacheEvict():
+    """ Remove the least recently used entries until the cache is within its memory budget """
+    with _CACHE_LOCK:
+        total = sum([len(b) for b in _CACHE.values()])
+        while len(_CACHE)>0 and total>_CACHE_OPTIONS['max_bytes']:
+            key, b = _CACHE.popitem(last=False)
+            total -= len(b)
+        if len(_CACHE)==0:
+            _CACHE_PATHS.clear()
+
+def _setFilename(F, fullpath):
+    F.basefile.filename = fullpath
+    if F._fixedfile is not None:
+        F._fixedfile.filename = fullpath
+
+def _readWorker(fullpath):
+    """ Read one input file. Exceptions are returned instead of being raised. """
+    try:
+        F = FASTInputFile(fullpath)
+        F.fixedfile # Detecting the file type before the object is stored
+        return F
+    except Exception as e:
+        return e
+
+def readInputFiles(fullpaths, workers=None, backend='thread', cache=True):
+    """ 
+    Read OpenFAST input files, using a pool of threads or processes.
+    The files present in the cache are not read again, and each file is read only once.
+
+    INPUTS:
+     - fullpaths: list of files to read
+     - workers: number of workers, default: number of cpus
+     - backend: 'thread', 'process' or 'serial'
+     - cache: if True, the cache of input files is used (see `configureCache`)
+    OUTPUTS:
+     - dictionary: path -> file object, or exception raised while reading the file
+    """
+    if backend not in ['thread', 'process', 'serial']:
+        raise ValueError('Unknown backend `{}`, use `thread`, `process` or `serial`'.format(backend))
+    results = {}
+    toRead  = []
+    for fullpath in fullpaths:
+        if fullpath in results or fullpath in toRead:
+            continue
+        F = _cacheLoad(fullpath) if cache else None
+        if F is None:
+            toRead.append(fullpath)
+        else:
+            results[fullpath] = F
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if backend=='serial' or workers==1 or len(toRead)<=1:
+        Fs = [_readWorker(f) for f in toRead]
+    elif backend=='thread':
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            Fs = list(pool.map(_readWorker, toRead))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            Fs = list(pool.map(_readWorker, toRead))
+    for fullpath, F in zip(toRead, Fs):
+        if cache and not isinstance(F, Exception):
+            _cacheStore(F, fullpath)
+        results[fullpath] = F
+    return results
+
+# --------------------------------------------------------------------------------}
+# --- Lazy loading 
+# --------------------------------------------------------------------------------{
+class LazyInputFile(object):
+    """ 
+    Proxy of an input file of a deck, the file is parsed on first access (item, attribute or method).
+    The path of the file is available without parsing the file (`filename`).
+    """
+    def __init__(self, filename, cache=True):
+        self._filename = filename
+        self._cache    = cache
+        self._file     = None
+        self._lazyAttributes = {} # name -> function returning the attribute value, evaluated on access
+
+    @property
+    def filename(self):
+        if self._file is None:
+            return self._filename
+        return self._file.filename
+
+    @property
+    def loaded(self):
+        return self._file is not None
+
+    def load(self):
+        """ Parse the file if not already done, and return the file object """
+        if self._file is None:
+            F = readInputFiles([self._filename], cache=self._cache)[self._filename]
+            if isinstance(F, Exception):
+                raise F
+            self._file = F
+        return self._file
+
+    def setLazyAttribute(self, name, fun):
+        """ Define an attribute of the proxy, evaluated on first access, without parsing the file """
+        self._lazyAttributes[name] = fun
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ['_filename', '_cache', '_file', '_lazyAttributes']:
+            raise AttributeError(name) # e.g. while unpickling
+        if name in self._lazyAttributes:
+            value = self._lazyAttributes.pop(name)()
+            setattr(self, name, value)
+            return value
+        return getattr(self.load(), name)
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __setitem__(self, key, item):
+        self.load()[key] = item
+
+    def __delitem__(self, key):
+        del self.load()[key]
+
+    def __contains__(self, key):
+        return key in self.load()
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __repr__(self):
+        if self._file is None:
+            return '<weio.LazyInputFile object> (not loaded): {}'.format(self._filename)
+        return self._file.__repr__()
+
+
+class _Deferred(object):
+    """ Entry of `fst_vt` that is evaluated on first access """
+    def __init__(self, fun):
+        self.fun = fun
+
+class _LazyDict(dict):
+    """ Dictionary where the values of type `_Deferred` are evaluated on first access 
+    (`[]`, `get`, `items` and `values`). Other methods (e.g. `copy`, `pop`) return the raw entries. """
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if isinstance(value, _Deferred):
+            value = value.fun()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        return [(key, self[key]) for key in list(self.keys())]
+
+    def values(self):
+        return [self[key] for key in list(self.keys())]
+
+def _EDtwrRelpath(EDFile, ED):
+    """ Path of the ElastoDyn tower file relative to the main file, 'none' if not available """
+    try:
+        return os.path.join(os.path.dirname(EDFile.replace('"','')), ED['TwrFile'].replace('"',''))
+    except:
+        return 'none'
+
+def _EDbldRelpath(EDFile, ED):
+    """ Path of the ElastoDyn blade file relative to the main file, 'none' if not available """
+    try:
+        if 'BldFile(1)' in ED.keys():
+            return os.path.join(os.path.dirname(EDFile.replace('"','')), ED['BldFile(1)'].replace('"',''))
+        else:
+            return os.path.join(os.path.dirname(EDFile.replace('"','')), ED['BldFile1'].replace('"',''))
+    except:
+        return 'none'
+
+def _BDbldRelpath(BDFile, BD):
+    """ Path of the BeamDyn blade file relative to the main file, 'none' if not available """
+    try:
+        return os.path.join(os.path.dirname(BDFile.replace('"','')), BD['BldFile'].replace('"',''))
+    except:
+        return 'none'
+
+
 # --------------------------------------------------------------------------------}
 # --- Full FAST input deck
 # --------------------------------------------------------------------------------{
 class FASTInputDeck(dict):
     """Container for input files that make up a FAST input deck"""
 
-    def __init__(self, fullFstPath='', readlist=['all'], verbose=False):
+    def __init__(self, fullFstPath='', readlist=['all'], verbose=False, workers=None, backend='thread', cache=True, lazy=False):
         """Read FAST master file and read inputs for FAST modules
 
         INPUTS:
@@ -31,6 +313,17 @@ class FASTInputDeck(dict):
                 where: 
                  AF: airfoil polars
                  AC: airfoil coordinates (if present)
+          - workers: number of workers used to read the module files and polars concurrently,
+                     default: number of cpus
+          - backend: 'thread', 'process' or 'serial', see `readInputFiles`
+          - cache: if True, the files are read using the cache shared by all the decks,
+                   so that identical polars and blade files are parsed once per session.
+                   See `configureCache`.
+          - lazy: if True, only the main file is read. The module files (e.g. fst_vt['HydroDyn']) 
+                  are `LazyInputFile` proxies, parsed on first access. The entries that depend on
+                  the content of another file (e.g. fst_vt['af_data'], fst_vt['ElastoDynTower'])
+                  are evaluated on first access, which parses that other file.
+                  The paths of the files are available without parsing (e.g. `HD_path`).
 
         """
         # Sanity
@@ -40,6 +333,11 @@ class FASTInputDeck(dict):
         self.filename = fullFstPath
         self.verbose  = verbose
         self.readlist = readlist
+        self.workers  = workers
+        self.backend  = backend
+        self.cache    = cache
+        self.lazy     = lazy
+        self._loaded  = {} # Files read in advance: path -> file object or exception
         if not type(self.readlist) is list:
             self.readlist=[readlist]
         if 'all' in self.readlist:
@@ -53,7 +351,7 @@ class FASTInputDeck(dict):
         self.FAST_ver       = 'OPENFAST'
         self.path2dll       = None   # Path to dll file
 
-        self.fst_vt={}
+        self.fst_vt=_LazyDict()
         self.fst_vt['description']       = ''            
         self.fst_vt['Fst']               = None
         self.fst_vt['ElastoDyn']         = None
@@ -106,33 +404,21 @@ class FASTInputDeck(dict):
 
         self.fst_vt[key] = self._read(filename,'AD')
 
-        if self.fst_vt[key] is not None:
+        AD = self.fst_vt[key]
+        if AD is not None:
+            directory = self.FAST_directory
+            # Reading the blade and polars concurrently
+            if not self.lazy:
+                self._prefetch([(self._ADBladeRelpath(AD, baseDir), 'ADbld')] + [(af, 'AF') for af in self._afRelpaths(AD, baseDir)])
             # Blades
-            bld_file = os.path.join(baseDir, self.fst_vt[key]['ADBlFile(1)'])
-            self.fst_vt['AeroDynBlade'] = self._read(bld_file,'ADbld')
+            self._setEntry('AeroDynBlade', lambda: self._read(self._ADBladeRelpath(AD, baseDir),'ADbld', directory))
             #self.fst_vt['AeroDynBlade'] = []
             #for i in range(3):
             #    bld_file = os.path.join(os.path.dirname(self.fst_vt['Fst']['AeroFile']), self.fst_vt[key]['ADBlFile({})'.format(i+1)])
             #    self.fst_vt['AeroDynBlade'].append(self._read(bld_file,'ADbld'))
             # Polars
-            self.fst_vt['af_data']=[] # TODO add to "AeroDyn"
-            for afi, af_filename in enumerate(self.fst_vt['AeroDyn15']['AFNames']):
-                af_filename = os.path.join(baseDir,af_filename).replace('"','')
-                try: 
-                    polar = self._read(af_filename, 'AF')
-                except:
-                    polar=None
-                    print('[FAIL] reading polar {}'.format(af_filename))
-                self.fst_vt['af_data'].append(polar)
-                if polar is not None:
-                    coordFile = polar['NumCoords']
-                    if isinstance(coordFile,str):
-                        coordFile = coordFile.replace('"','')
-                        baseDirCoord=os.path.dirname(af_filename)
-                        if coordFile[0]=='@':
-                            ac_filename = os.path.join(baseDirCoord,coordFile[1:])
-                            coords = self._read(ac_filename, 'AC')
-                            self.fst_vt['ac_data'].append(coords)
+            self._setEntry('af_data', lambda: self._readPolars(AD, baseDir, directory)) # TODO add to "AeroDyn"
+            self._setEntry('ac_data', lambda: self._readCoords(AD, baseDir, directory))
 
         # --- Backward compatibility
         self.AD  = self.fst_vt[key]
@@ -141,6 +427,45 @@ class FASTInputDeck(dict):
         if readlist is not None:
             self.readlist=readlist_bkp
 
+    def _ADBladeRelpath(self, AD, baseDir):
+        return os.path.join(baseDir, AD['ADBlFile(1)'])
+
+    def _afRelpaths(self, AD, baseDir):
+        return [os.path.join(baseDir,af_filename).replace('"','') for af_filename in AD['AFNames']]
+
+    def _readPolars(self, AD, baseDir, directory=None):
+        af_data = []
+        for afi, af_filename in enumerate(self._afRelpaths(AD, baseDir)):
+            try: 
+                polar = self._read(af_filename, 'AF', directory)
+            except:
+                polar=None
+                print('[FAIL] reading polar {}'.format(af_filename))
+            af_data.append(polar)
+        return af_data
+
+    def _readCoords(self, AD, baseDir, directory=None):
+        ac_data = []
+        for af_filename, polar in zip(self._afRelpaths(AD, baseDir), self.fst_vt['af_data']):
+            if polar is not None:
+                coordFile = polar['NumCoords']
+                if isinstance(coordFile,str):
+                    coordFile = coordFile.replace('"','')
+                    baseDirCoord=os.path.dirname(af_filename)
+                    if coordFile[0]=='@':
+                        ac_filename = os.path.join(baseDirCoord,coordFile[1:])
+                        coords = self._read(ac_filename, 'AC', directory)
+                        ac_data.append(coords)
+        return ac_data
+
+    def _setEntry(self, key, fun):
+        """ Set an entry of fst_vt, evaluated now, or on first access in lazy mode.
+        `fun` should not depend on the filename of the deck, which may change before the entry is accessed. """
+        if self.lazy:
+            self.fst_vt[key] = _Deferred(fun)
+        else:
+            self.fst_vt[key] = fun()
+
     @property
     def FAST_InputFile(self):
         return os.path.basename(self.filename)   # FAST input file (ext=.fst)
@@ -151,11 +476,24 @@ class FASTInputDeck(dict):
 
     @property
     def inputFiles(self):
+        """ Paths of the input files of the deck. 
+        NOTE: in lazy mode, the paths of the tower and blade files require to parse ElastoDyn and BeamDyn """
         files=[]
         files+=[self.ED_path, self.ED_twr_path, self.ED_bld_path]
         files+=[self.BD_path, self.BD_bld_path]
+        files+=[self.IW_path, self.AD_path, self.SrvD_path, self.HD_path, self.SD_path, self.MD_path]
         return [f for f in files if f not in self.unusedNames]
 
+    def _moduleRelpath(self, fileKey, compKey):
+        """ Relative path of a module file referenced by the main file, 'none' if the module is not used """
+        try:
+            fst = self.fst_vt['Fst']
+            if compKey not in fst or fst[compKey]>0: # NOTE: no flag in driver files
+                return fst[fileKey].replace('"','')
+        except:
+            pass
+        return 'none'
+
 
     @property
     def ED_relpath(self):
@@ -166,20 +504,11 @@ class FASTInputDeck(dict):
 
     @property
     def ED_twr_relpath(self):
-        try:
-            return os.path.join(os.path.dirname(self.fst_vt['Fst']['EDFile']).replace('"',''), self.fst_vt['ElastoDyn']['TwrFile'].replace('"',''))
-        except:
-            return 'none'
+        return _EDtwrRelpath(self.ED_relpath, self.fst_vt['ElastoDyn'])
 
     @property
     def ED_bld_relpath(self):
-        try:
-            if 'BldFile(1)' in self.fst_vt['ElastoDyn'].keys():
-                return os.path.join(os.path.dirname(self.fst_vt['Fst']['EDFile'].replace('"','')), self.fst_vt['ElastoDyn']['BldFile(1)'].replace('"',''))
-            else:
-                return os.path.join(os.path.dirname(self.fst_vt['Fst']['EDFile'].replace('"','')), self.fst_vt['ElastoDyn']['BldFile1'].replace('"',''))
-        except:
-            return 'none'
+        return _EDbldRelpath(self.ED_relpath, self.fst_vt['ElastoDyn'])
 
     @property
     def BD_relpath(self):
@@ -190,14 +519,23 @@ class FASTInputDeck(dict):
 
     @property
     def BD_bld_relpath(self):
-        try:
-            return os.path.join(os.path.dirname(self.fst_vt['Fst']['BDBldFile(1)'].replace('"','')), self.fst_vt['BeamDyn']['BldFile'].replace('"',''))
-        except:
-            return 'none'
+        return _BDbldRelpath(self.BD_relpath, self.fst_vt['BeamDyn'])
 
     @property
     def ED_path(self): return self._fullpath(self.ED_relpath)
     @property
+    def IW_path(self): return self._fullpath(self._moduleRelpath('InflowFile', 'CompInflow'))
+    @property
+    def AD_path(self): return self._fullpath(self._moduleRelpath('AeroFile', 'CompAero'))
+    @property
+    def SrvD_path(self): return self._fullpath(self._moduleRelpath('ServoFile', 'CompServo'))
+    @property
+    def HD_path(self): return self._fullpath(self._moduleRelpath('HydroFile', 'CompHydro'))
+    @property
+    def SD_path(self): return self._fullpath(self._moduleRelpath('SubFile', 'CompSub'))
+    @property
+    def MD_path(self): return self._fullpath(self._moduleRelpath('MooringFile', 'CompMooring'))
+    @property
     def BD_path(self): return self._fullpath(self.BD_relpath)
     @property
     def BD_bld_path(self): return self._fullpath(self.BD_bld_relpath)
@@ -246,14 +584,18 @@ class FASTInputDeck(dict):
 
         elif self.version=='OF2':
             # ---- Regular OpenFAST file
+            directory = self.FAST_directory
+            # Reading the module files concurrently
+            self._prefetch(self._moduleFiles())
             # ElastoDyn
             if 'EDFile' in self.fst_vt['Fst'].keys():
                 self.fst_vt['ElastoDyn'] = self._read(self.fst_vt['Fst']['EDFile'],'ED')
-                if self.fst_vt['ElastoDyn'] is not None:
-                    twr_file = self.ED_twr_relpath
-                    bld_file = self.ED_bld_relpath
-                    self.fst_vt['ElastoDynTower'] = self._read(twr_file,'EDtwr')
-                    self.fst_vt['ElastoDynBlade'] = self._read(bld_file,'EDbld')
+                ED, EDFile = self.fst_vt['ElastoDyn'], self.ED_relpath
+                if ED is not None:
+                    if not self.lazy:
+                        self._prefetch([(self.ED_twr_relpath,'EDtwr'), (self.ED_bld_relpath,'EDbld')])
+                    self._setEntry('ElastoDynTower', lambda: self._read(_EDtwrRelpath(EDFile, ED),'EDtwr', directory))
+                    self._setEntry('ElastoDynBlade', lambda: self._read(_EDbldRelpath(EDFile, ED),'EDbld', directory))
 
             # InflowWind
             if self.fst_vt['Fst']['CompInflow']>0:
@@ -286,29 +628,80 @@ class FASTInputDeck(dict):
             # BeamDyn
             if self.fst_vt['Fst']['CompElast'] == 2:
                 self.fst_vt['BeamDyn'] = self._read(self.fst_vt['Fst']['BDBldFile(1)'],'BD')
-                if self.fst_vt['BeamDyn'] is not None:
+                BD, BDFile = self.fst_vt['BeamDyn'], self.BD_relpath
+                if BD is not None:
                     # Blades
-                    bld_file = os.path.join(os.path.dirname(self.fst_vt['Fst']['BDBldFile(1)']), self.fst_vt['BeamDyn']['BldFile'])
-                    self.fst_vt['BeamDynBlade']= self._read(bld_file,'BDbld')
+                    self._setEntry('BeamDynBlade', lambda: self._read(_BDbldRelpath(BDFile, BD),'BDbld', directory))
 
         # --- Backward compatibility
         self.fst = self.fst_vt['Fst']
         self.ED  = self.fst_vt['ElastoDyn']
         if not hasattr(self,'AD'):
             self.AD = None
-        if self.AD is not None:
+        if self.AD is not None and self.lazy:
+            self.AD.setLazyAttribute('Bld1', lambda: self.fst_vt['AeroDynBlade'])
+            self.AD.setLazyAttribute('AF'  , lambda: self.fst_vt['af_data'])
+        elif self.AD is not None:
             self.AD.Bld1 = self.fst_vt['AeroDynBlade']
             self.AD.AF  = self.fst_vt['af_data']
         self.IW  = self.fst_vt['InflowWind']
         self.BD  = self.fst_vt['BeamDyn']
-        self.BDbld  = self.fst_vt['BeamDynBlade']
+        self._loaded = {}
+
+    @property
+    def BDbld(self):
+        return self.fst_vt['BeamDynBlade']
 
     @ property
     def unusedNames(self):
         return ['unused','nan','na','none']
 
-    def _read(self, relfilepath, shortkey):
-        """ read any openfast input """
+    def _moduleFiles(self):
+        """ List of (relative path, shortkey) of the module files referenced by the main file """
+        fst = self.fst_vt['Fst']
+        files = []
+        if 'EDFile' in fst.keys():
+            files.append((fst['EDFile'], 'ED'))
+        if fst['CompInflow']>0:
+            files.append((fst['InflowFile'], 'IW'))
+        if fst['CompAero']>0:
+            files.append((fst['AeroFile'], 'AD'))
+        if fst['CompServo']>0:
+            files.append((fst['ServoFile'], 'SrvD'))
+        if fst['CompHydro']==1:
+            files.append((fst['HydroFile'], 'HD'))
+        if fst['CompSub']==1:
+            files.append((fst['SubFile'], 'HD'))
+        if fst['CompMooring'] in [1,2]:
+            files.append((fst['MooringFile'], 'MD'))
+        if fst['CompElast']==2:
+            files.append((fst['BDBldFile(1)'], 'BD'))
+        return files
+
+    def _fileToRead(self, relfilepath, shortkey):
+        """ Returns the full path of a file if it is to be read, otherwise None """
+        relfilepath =relfilepath.replace('"','')
+        basename = os.path.basename(relfilepath)
+        if shortkey not in self.readlist:
+            return None
+        if basename.lower() in self.unusedNames:
+            return None
+        return os.path.join(self.FAST_directory, relfilepath)
+
+    def _prefetch(self, files):
+        """ Read a list of files concurrently, before they are accessed by `_read` 
+        files: list of (relative path, shortkey)
+        """
+        if self.lazy:
+            return
+        fullpaths = [self._fileToRead(relfilepath, shortkey) for relfilepath, shortkey in files]
+        fullpaths = [f for f in fullpaths if f is not None and f not in self._loaded]
+        if len(fullpaths)<=1:
+            return # Nothing to gain
+        self._loaded.update(readInputFiles(fullpaths, workers=self.workers, backend=self.backend, cache=self.cache))
+
+    def _read(self, relfilepath, shortkey, directory=None):
+        """ read any openfast input, `relfilepath` is relative to `directory`, default: directory of the deck """
         relfilepath =relfilepath.replace('"','')
         basename = os.path.basename(relfilepath)
 
@@ -325,9 +718,21 @@ class FASTInputDeck(dict):
             return None
 
         # Attempt reading
-        fullpath =os.path.join(self.FAST_directory, relfilepath)
+        if directory is None:
+            directory = self.FAST_directory
+        fullpath =os.path.join(directory, relfilepath)
+        if self.lazy and shortkey!='Fst':
+            if not os.path.isfile(fullpath):
+                print('[WARN] File not found '+fullpath)
+                return None
+            self.inputfiles[shortkey] = fullpath
+            return LazyInputFile(fullpath, cache=self.cache)
         try:
-            data = FASTInputFile(fullpath)
+            data = self._loaded.pop(fullpath, None)
+            if data is None:
+                data = readInputFiles([fullpath], cache=self.cache)[fullpath]
+            if isinstance(data, Exception):
+                raise data
             if self.verbose:
                 print('>>> Read: ',fullpath)
             self.inputfiles[shortkey] = fullpath
@@ -340,6 +745,10 @@ class FASTInputDeck(dict):
 
     def write(self, filename=None, prefix='', suffix='', directory=None):
         """ Write a standardized input file deck"""
+        # Lazy mode: parse all the files while their paths are still those of the deck read
+        for v in self.fst_vt.values():
+            if isinstance(v, LazyInputFile):
+                v.load()
         if filename is None:
             filename=self.filename # Overwritting
         self.filename=filename
@@ -432,7 +841,7 @@ class FASTInputDeck(dict):
         s+='filename   : '+self.filename+'\n'
         s+='version    : '+self.version+'\n'
         s+='AD version : '+self.ADversion+'\n'
-        s+='fst_vt     : dict{'+','.join([k for k,v in self.fst_vt.items() if v is not None])+'}\n'
+        s+='fst_vt     : dict{'+','.join([k for k,v in dict.items(self.fst_vt) if v is not None])+'}\n'
         s+='inputFiles : {}\n'.format(self.inputFiles)
         s+='\n'
         return s
@@ -17,6 +17,8 @@ except:
         pass
     File = dict
 import os
+import io
+import contextlib
 import numpy as np
 import re
 import pandas as pd
@@ -60,6 +62,12 @@ class FASTInputFile(File):
     def formatName():
         return 'FAST input file'
 
+    @staticmethod
+    def sniff(header):
+        if b'\x00' in header:
+            return False # binary file
+        return None
+
     def __init__(self, filename=None, **kwargs):
         self._fixedfile = None
         self.basefile = FASTInputFileBase(filename, **kwargs) # Generic fileformat
@@ -84,33 +92,39 @@ class FASTInputFile(File):
         # --- Creating a dedicated Child
         KEYS = list(self.basefile.keys())
         if 'NumBlNds' in KEYS:
-            return ADBladeFile.from_fast_input_file(self.basefile)
+            fixedfile = ADBladeFile.from_fast_input_file(self.basefile)
         elif 'NBlInpSt' in KEYS:
-            return EDBladeFile.from_fast_input_file(self.basefile)
+            fixedfile = EDBladeFile.from_fast_input_file(self.basefile)
         elif 'MassMatrix' in KEYS and self.module =='ExtPtfm':
-            return ExtPtfmFile.from_fast_input_file(self.basefile)
+            fixedfile = ExtPtfmFile.from_fast_input_file(self.basefile)
         elif 'NumCoords' in KEYS and 'InterpOrd' in KEYS:
-            return ADPolarFile.from_fast_input_file(self.basefile)
+            fixedfile = ADPolarFile.from_fast_input_file(self.basefile)
         else:
             # TODO: HD, SD, SvD, ED, AD, EDbld, BD,
             #print('>>>>>>>>>>>> NO FILEFORMAT', KEYS)
             return self.basefile
+        # The child shares the data of the base file, and hence its template
+        fixedfile._template = self.basefile._template
+        return fixedfile
 
     def read(self, filename=None):
         return self.fixedfile.read(filename)
 
-    def write(self, filename=None):
-        return self.fixedfile.write(filename)
+    def write(self, filename=None, patch=False):
+        return self.fixedfile.write(filename, patch=patch)
 
     def toDataFrame(self):
         return self.fixedfile.toDataFrame()
 
-    def toString(self):
-        return self.fixedfile.toString()
+    def toString(self, patch=False):
+        return self.fixedfile.toString(patch=patch)
 
     def keys(self):
         return self.fixedfile.keys()
 
+    def renameKey(self, label, newLabel):
+        return self.fixedfile.renameKey(label, newLabel)
+
     def toGraph(self):
         return self.fixedfile.toGraph()
 
@@ -138,6 +152,12 @@ class FASTInputFile(File):
     def __getitem__(self,key):
         return self.fixedfile.__getitem__(key)
 
+    def __delitem__(self,key):
+        return self.fixedfile.__delitem__(key)
+
+    def __contains__(self,key):
+        return self.fixedfile.__contains__(key)
+
     def __repr__(self):
         return self.fixedfile.__repr__()
         #s ='Fast input file: {}\n'.format(self.filename)
@@ -168,6 +188,9 @@ class FASTInputFileBase(File):
         f['AirDens'] = 1.225
         f.write('AeroDyn_Changed.dat')
 
+        # Only re-format the modified entries, other lines are copied from the original file
+        f.write('AeroDyn_Changed.dat', patch=True)
+
     """
 
     def __init__(self, filename=None, **kwargs):
@@ -186,12 +209,42 @@ class FASTInputFileBase(File):
             self.data     = data
         self.hasNodal = hasNodal
         self.module   = module
+        self._template = None
         self.filename = filename
 
     def keys(self):
-        self.labels = [ d['label'] for i,d in enumerate(self.data) if (not d['isComment']) and (i not in self._IComment)]
+        IComment = set(self._IComment)
+        self.labels = [ d['label'] for i,d in enumerate(self.data) if (not d['isComment']) and (i not in IComment)]
         return self.labels
 
+    def _labelIndex(self, rebuild=False):
+        """ 
+        Return the case-insensitive dictionary label -> indices in `data`.
+        The dictionary is maintained incrementally: entries appended to `data` are indexed on the fly, 
+        the dictionary is rebuilt if `data` was replaced, if entries were inserted or deleted, or if 
+        labels were changed by the methods of this class (`_indexDirty`).
+        Labels changed directly in `data` are detected when the former label is looked up (see `getIDs`),
+        use `renameKey` to rename entries.
+        """
+        data = self.data
+        n = getattr(self, '_indexLen', 0)
+        if rebuild or getattr(self, '_indexDirty', False) or getattr(self, '_indexData', None) is not data or n>len(data) or (n>0 and data[n-1] is not self._indexLast):
+            self._index      = {}
+            self._indexData  = data
+            self._indexDirty = False
+            n = 0
+        if n<len(data):
+            index = self._index
+            for i in range(n, len(data)):
+                key = data[i]['label'].lower()
+                if key in index:
+                    index[key].append(i)
+                else:
+                    index[key] = [i]
+            self._indexLen  = len(data)
+            self._indexLast = data[-1]
+        return self._index
+
     def getID(self,label):
         i=self.getIDSafe(label)
         if i<0:
@@ -200,24 +253,33 @@ class FASTInputFileBase(File):
             return i
 
     def getIDs(self,label):
-        I=[]
-        # brute force search
-        for i in range(len(self.data)):
-            d = self.data[i]
-            if d['label'].lower()==label.lower():
-                I.append(i)
-        if len(I)<0:
-            raise KeyError('Variable `'+ label+'` not found in FAST file:'+self.filename)
-        else:
-            return I
+        """ return the indices of all the entries with a given label (case insensitive)"""
+        key = label.lower()
+        I = self._labelIndex().get(key, [])
+        # Entries may have been renamed, or replaced, directly in `data`
+        for i in I:
+            if self.data[i]['label'].lower()!=key:
+                I = self._labelIndex(rebuild=True).get(key, [])
+                break
+        return list(I)
+
+    def renameKey(self, label, newLabel):
+        """ rename the entries with a given label (case insensitive), keeping the label index up to date """
+        I = self.getIDs(label)
+        if len(I)==0:
+            raise KeyError('Variable `'+ label+'` not found in FAST file:'+str(self.filename))
+        for i in I:
+            self.data[i]['label'] = newLabel
+        index = self._labelIndex()
+        del index[label.lower()]
+        index[newLabel.lower()] = sorted(index.get(newLabel.lower(), []) + I)
 
     def getIDSafe(self,label):
-        # brute force search
-        for i in range(len(self.data)):
-            d = self.data[i]
-            if d['label'].lower()==label.lower():
-                return i
-        return -1
+        """ return the index of the first entry with a given label (case insensitive), or -1"""
+        I = self.getIDs(label)
+        if len(I)==0:
+            return -1
+        return I[0]
 
     # Making object an iterator
     def __iter__(self):
@@ -242,6 +304,17 @@ class FASTInputFileBase(File):
         i = self.getID(key)
         return self.data[i]['value']
 
+    def __delitem__(self,key):
+        I = self.getIDs(key)
+        if len(I)==0:
+            raise KeyError('Variable `'+ key+'` not found in FAST file:'+str(self.filename))
+        for i in I[-1::-1]:
+            del self.data[i]
+        self._indexDirty = True
+
+    def __contains__(self,key):
+        return len(self.getIDs(key))>0
+
     def __repr__(self):
         s ='Fast input file base: {}\n'.format(self.filename)
         return s+'\n'.join(['{:15s}: {}'.format(d['label'],d['value']) for i,d in enumerate(self.data)])
@@ -306,7 +379,10 @@ class FASTInputFileBase(File):
         else:  
             raise Exception('No filename provided')
 
-    def _read(self):
+    def _read(self, lines=None):
+        """ 
+        lines: lines of the file, if None, they are read from self.filename
+        """
 
         # --- Tables that can be detected based on the "Value" (first entry on line)
         # TODO members for  BeamDyn with mutliple key point                                                                                                                                                                                                                                                                                                        ####### TODO PropSetID is Duplicate SubDyn and used in HydroDyn
@@ -359,9 +435,11 @@ class FASTInputFileBase(File):
         self.data   = []
         self.hasNodal=False
         self.module = None
+        self._template = None
         #with open(self.filename, 'r', errors="surrogateescape") as f:
-        with open(self.filename, 'r', errors="surrogateescape") as f:
-            lines=f.read().splitlines()
+        if lines is None:
+            with open(self.filename, 'r', errors="surrogateescape") as f:
+                lines=f.read().splitlines()
         # IF NEEDED> DO THE FOLLOWING FORMATTING:
             #lines = [str(l).encode('utf-8').decode('ascii','ignore') for l in f.read().splitlines()]
 
@@ -383,7 +461,10 @@ class FASTInputFileBase(File):
         iTab = 0
 
         labOffset=''
+        iStarts = [] # (index in data, index in lines) at the start of each iteration, used for the template
+        iEnd    = None # index of the last line read +1, if known
         while i<len(lines):
+            iStarts.append((len(self.data), i))
             line = lines[i]
 
             # --- Read special sections
@@ -415,6 +496,7 @@ class FASTInputFileBase(File):
                 if i+2<len(lines) and (lines[i+2].lower().find('bldnd_bladesout')>0 or lines[i+2].lower().find('bldnd_bloutnd')>0):
                     self.hasNodal=True
                 else:
+                    iStarts.append((len(self.data), i))
                     self.data.append(parseFASTInputLine('END of input file (the word "END" must appear in the first 3 columns of this last OutList line)',i+1))
                     self.data.append(parseFASTInputLine('---------------------------------------------------------------------------------------',i+2))
                     break
@@ -430,6 +512,7 @@ class FASTInputFileBase(File):
                     d['value']=o
                     self.data.append(d)
                 # --- Here we cheat and force an exit of the input file
+                iStarts.append((len(self.data), i))
                 self.data.append(parseFASTInputLine('END of input file (the word "END" must appear in the first 3 columns of this last OutList line)',i+1))
                 self.data.append(parseFASTInputLine('---------------------------------------------------------------------------------------',i+2))
                 break
@@ -451,7 +534,8 @@ class FASTInputFileBase(File):
             elif line.upper().find('DISTRIBUTED PROPERTIES')>0:
                 self.data.append(parseFASTInputLine(line,i));
                 i+=1;
-                self.readBeamDynProps(lines,i)
+                iEnd = self.readBeamDynProps(lines,i)
+                self._setTemplate(lines, iStarts, iEnd)
                 return
 
             # --- Parsing of standard lines: value(s) key comment
@@ -504,6 +588,7 @@ class FASTInputFileBase(File):
                         d['value'], d['tabColumnNames'],_  = parseFASTNumTable(self.filename,lines[i:i+nTabLines+1],nTabLines,i,1)
                         d['tabUnits'] = ['(-)','(-)']
                         self.data.append(d)
+                        iEnd = min(i+nTabLines+1, len(lines))
                         break
 
             elif labelRaw=='re':
@@ -648,10 +733,52 @@ class FASTInputFileBase(File):
 # #             print(e)
 #             raise Exception('Fast File {}: '.format(self.filename)+'\n'+e.args[0])
         self._lines = lines 
-
-            
-    def toString(self):
-        s=''
+        if i>=len(lines):
+            iEnd = len(lines)
+        self._setTemplate(lines, iStarts, iEnd)
+
+    def _setTemplate(self, lines, iStarts, iEnd=None):
+        """ 
+        Store the original lines and the range of lines spanned by each group of entries of `data`,
+        so that unmodified entries can be written back verbatim (see `toString`).
+        Nothing is copied while reading: the original entries are only parsed again from the 
+        lines when the file is first written in patch mode (see `_templateReference`).
+
+        iStarts: list of (index in data, index in lines) at the start of each group of entries
+        iEnd: index of the last line read +1, None if unknown (entries of the last group are then always formatted)
+        """
+        iStarts = iStarts + [(len(self.data), iEnd)]
+        groups = {}
+        for (k0, i0), (k1, i1) in zip(iStarts[:-1], iStarts[1:]):
+            if i1 is not None and k1>k0:
+                groups[k0] = (k1, i0, i1)
+        # NOTE: `entries` are the entries of `data` as read, used to check that they were not replaced 
+        self._template = {'lines':lines, 'groups':groups, 'entries':list(self.data), 'reference':None}
+
+    def _templateReference(self):
+        """ 
+        Return the entries of `data` as originally read, and the original text of each group of entries.
+        The entries are obtained by parsing the original lines again, once. 
+        """
+        template = self._template
+        if template['reference'] is None:
+            ref = FASTInputFileBase()
+            ref.filename = self.filename
+            with contextlib.redirect_stdout(io.StringIO()): # Warnings were already printed while reading
+                ref._read(lines=template['lines'])
+            lines = template['lines']
+            texts = dict([(k0, '\n'.join(lines[i0:i1])) for k0, (k1, i0, i1) in template['groups'].items()])
+            template['reference'] = (ref.data, texts)
+        return template['reference']
+
+    def toString(self, patch=False):
+        """ 
+        Return the content of the file as a string.
+
+        patch: if True, the entries that were not modified since the file was read are written
+               using the lines of the original file, only the modified entries are formatted.
+               Entries that were added, or files not read from disk, are formatted as usual.
+        """
         # Special file formats, TODO subclass
         def toStringVLD(val,lab,descr):
             val='{}'.format(val)
@@ -665,57 +792,55 @@ class FASTInputFileBase(File):
         def beamdyn_section_mat_tostring(x,K,M):
             def mat_tostring(M,fmt='24.16e'):
                 return '\n'.join(['   '+' '.join(['{:24.16E}'.format(m) for m in M[i,:]]) for i in range(np.size(M,1))])
-            s=''
-            s+='{:.6f}\n'.format(x)
-            s+=mat_tostring(K)
-            #s+=np.array2string(K)
-            s+='\n'
-            s+='\n'
-            s+=mat_tostring(M)
-            #s+=np.array2string(M)
-            s+='\n'
-            s+='\n'
-            return s
-
-        for i in range(len(self.data)):
-            d=self.data[i]
+            s=[]
+            s.append('{:.6f}\n'.format(x))
+            s.append(mat_tostring(K))
+            #s.append(np.array2string(K))
+            s.append('\n\n')
+            s.append(mat_tostring(M))
+            #s.append(np.array2string(M))
+            s.append('\n\n')
+            return ''.join(s)
+
+        def entryToString(d):
+            s=[]
             if d['isComment']:
-                s+='{}'.format(d['value'])
+                s.append('{}'.format(d['value']))
             elif d['tabType']==TABTYPE_NOT_A_TAB:
                 if isinstance(d['value'], list):
                     sList=', '.join([str(x) for x in d['value']])
-                    s+='{} {} {}'.format(sList,d['label'],d['descr'])
+                    s.append('{} {} {}'.format(sList,d['label'],d['descr']))
                 else:
-                    s+=toStringVLD(d['value'],d['label'],d['descr']).strip()
+                    s.append(toStringVLD(d['value'],d['label'],d['descr']).strip())
             elif d['tabType']==TABTYPE_NUM_WITH_HEADER:
                 if d['tabColumnNames'] is not None:
-                    s+='{}'.format(' '.join(['{:15s}'.format(s) for s in d['tabColumnNames']]))
-                #s+=d['descr'] # Not ready for that
+                    s.append('{}'.format(' '.join(['{:15s}'.format(s) for s in d['tabColumnNames']])))
+                #s.append(d['descr']) # Not ready for that
                     if d['tabUnits'] is not None:
-                        s+='\n'
-                        s+='{}'.format(' '.join(['{:15s}'.format(s) for s in d['tabUnits']]))
+                        s.append('\n')
+                        s.append('{}'.format(' '.join(['{:15s}'.format(s) for s in d['tabUnits']])))
                     newline='\n'
                 else:
                     newline=''
                 if np.size(d['value'],0) > 0 :
-                    s+=newline
-                    s+='\n'.join('\t'.join( ('{:15.0f}'.format(x) if int(x)==x else '{:15.8e}'.format(x) )  for x in y) for y in d['value'])
+                    s.append(newline)
+                    s.append('\n'.join('\t'.join( ('{:15.0f}'.format(x) if int(x)==x else '{:15.8e}'.format(x) )  for x in y) for y in d['value']))
             elif d['tabType']==TABTYPE_MIX_WITH_HEADER:
-                s+='{}'.format(' '.join(['{:15s}'.format(s) for s in d['tabColumnNames']]))
+                s.append('{}'.format(' '.join(['{:15s}'.format(s) for s in d['tabColumnNames']])))
                 if d['tabUnits'] is not None:
-                    s+='\n'
-                    s+='{}'.format(' '.join(['{:15s}'.format(s) for s in d['tabUnits']]))
+                    s.append('\n')
+                    s.append('{}'.format(' '.join(['{:15s}'.format(s) for s in d['tabUnits']])))
                 if np.size(d['value'],0) > 0 :
-                    s+='\n'
-                    s+='\n'.join('\t'.join('{}'.format(x) for x in y) for y in d['value'])
+                    s.append('\n')
+                    s.append('\n'.join('\t'.join('{}'.format(x) for x in y) for y in d['value']))
             elif d['tabType']==TABTYPE_NUM_WITH_HEADERCOM:
-                s+='! {}\n'.format(' '.join(['{:15s}'.format(s) for s in d['tabColumnNames']]))
-                s+='! {}\n'.format(' '.join(['{:15s}'.format(s) for s in d['tabUnits']]))
-                s+='\n'.join('\t'.join('{:15.8e}'.format(x) for x in y) for y in d['value'])
+                s.append('! {}\n'.format(' '.join(['{:15s}'.format(s) for s in d['tabColumnNames']])))
+                s.append('! {}\n'.format(' '.join(['{:15s}'.format(s) for s in d['tabUnits']])))
+                s.append('\n'.join('\t'.join('{:15.8e}'.format(x) for x in y) for y in d['value']))
             elif d['tabType']==TABTYPE_FIL:
                 #f.write('{} {} {}\n'.format(d['value'][0],d['tabDetect'],d['descr']))
-                s+='{} {} {}\n'.format(d['value'][0],d['label'],d['descr']) # TODO?
-                s+='\n'.join(fil for fil in d['value'][1:])
+                s.append('{} {} {}\n'.format(d['value'][0],d['label'],d['descr'])) # TODO?
+                s.append('\n'.join(fil for fil in d['value'][1:]))
             elif d['tabType']==TABTYPE_NUM_BEAMDYN:
                 # TODO use dedicated sub-class
                 data = d['value']
@@ -726,18 +851,47 @@ class FASTInputFileBase(File):
                     x = data['span'][i]
                     K = data['K'][i]
                     M = data['M'][i]
-                    s += beamdyn_section_mat_tostring(x,K,M)
+                    s.append(beamdyn_section_mat_tostring(x,K,M))
+                # NOTE: the properties are the last entry of the file, and always had a trailing new line
+                s.append('\n')
             else:
                 raise Exception('Unknown table type for variable {}'.format(d))
-            if i<len(self.data)-1:
-                s+='\n'
-        return s
-
-    def write(self, filename=None):
+            return ''.join(s)
+
+        template = getattr(self, '_template', None) if patch else None
+        if template is None:
+            return '\n'.join([entryToString(d) for d in self.data])
+
+        # --- Patch mode: groups of entries that are unchanged are replaced by their original lines
+        # A group is found by its position in `data`, its entries need to be the ones read and equal to the original ones
+        reference, texts = self._templateReference()
+        groups  = template['groups']
+        entries = template['entries']
+        data = self.data
+        nData = len(data)
+        out = []
+        k = 0
+        while k<nData:
+            group = groups.get(k, None)
+            if group is not None and group[0]<=nData:
+                k1 = group[0]
+                j = k
+                while j<k1 and data[j] is entries[j] and _entryEqual(data[j], reference[j]):
+                    j += 1
+                if j==k1:
+                    out.append(texts[k])
+                    k = k1
+                    continue
+            out.append(entryToString(data[k]))
+            k += 1
+        return '\n'.join(out)
+
+    def write(self, filename=None, patch=False):
+        """ Write the file, see `toString` for the `patch` option """
         if filename:
             self.filename = filename
         if self.filename:
-            self._write()
+            self._write(patch=patch)
         else:
             raise Exception('No filename provided')
 
@@ -745,10 +899,10 @@ class FASTInputFileBase(File):
         """ Sanity checks before write"""
         pass
 
-    def _write(self):
+    def _write(self, patch=False):
         self._writeSanityChecks()
         with open(self.filename,'w') as f:
-            f.write(self.toString())
+            f.write(self.toString(patch=patch))
 
     def toDataFrame(self):
         return self._toDataFrame()
@@ -920,10 +1074,47 @@ class FASTInputFileBase(File):
         d['tabType'] = TABTYPE_NUM_BEAMDYN
         d['value']   = {'span':span, 'K':K, 'M':M}
         self.data.append(d)
+        return min(i, len(lines))
 
 # --------------------------------------------------------------------------------}
 # --- Helper functions 
 # --------------------------------------------------------------------------------{
+def _valueEqual(a, b):
+    """ Strict equality of values of `data`, types need to match since they affect the formatting"""
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        if type(a)!=type(b) or a.shape!=b.shape or a.dtype!=b.dtype:
+            return False
+        return np.array_equal(a, b, equal_nan=a.dtype.kind in 'fc')
+    if type(a)!=type(b):
+        return False
+    if isinstance(a, (list, tuple)):
+        if len(a)!=len(b):
+            return False
+        types = list(map(type, a))
+        if np.ndarray not in types and types==list(map(type, b)) and a==b:
+            return True # Fast path for lists of scalars and strings
+        return all(_valueEqual(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return a.keys()==b.keys() and all(_valueEqual(a[k], b[k]) for k in a.keys())
+    return a==b
+
+_IMMUTABLE_TYPES = (type(None), bool, int, float, str)
+
+def _entryEqual(d, ref):
+    """ True if an entry of `data` is formatted as the reference entry: same fields, values and types"""
+    if (d['label'], d['descr'], d['isComment'], d['tabType'])!=(ref['label'], ref['descr'], ref['isComment'], ref['tabType']):
+        return False
+    v, vRef = d['value'], ref['value']
+    if type(v) is not type(vRef):
+        return False
+    if type(v) in _IMMUTABLE_TYPES:
+        return v==vRef
+    if not _valueEqual(v, vRef):
+        return False
+    if d['tabType'] in (None, TABTYPE_NOT_A_TAB):
+        return True
+    return _valueEqual(d.get('tabColumnNames', None), ref.get('tabColumnNames', None)) and _valueEqual(d.get('tabUnits', None), ref.get('tabUnits', None))
+
 def isStr(s):
     # Python 2 and 3 compatible
     # Two options below
@@ -1204,7 +1395,14 @@ def parseFASTNumTable(filename,lines,n,iStart,nHeaders=2,tableType='num',nOffset
 
         nCols=len(ColNames)
 
-        if tableType=='num':
+        # Parsing all the lines of the table at once, the line by line parsing below is used for special cases
+        Tab = None
+        if n>0:
+            Tab = parseFASTNumBlock(lines[nHeaders+nOffset:], nCols, tableType)
+
+        if Tab is not None:
+            pass
+        elif tableType=='num':
             if n==0:
                 Tab = np.zeros((n, nCols))
             for i in range(nHeaders+nOffset,n+nHeaders+nOffset):
@@ -1272,6 +1470,40 @@ def parseFASTNumTable(filename,lines,n,iStart,nHeaders=2,tableType='num',nOffset
     return Tab, ColNames, Units
 
 
+_BOOL_TOKENS = {'true':'1', 'false':'0', 'print':'1', 'noprint':'0'}
+
+def parseFASTNumBlock(lines, nCols, tableType='num'):
+    """ 
+    Parse the data lines of a table at once into an array of shape (len(lines) x nCols).
+    For 'num' tables, the values TRUE/FALSE/PRINT/NOPRINT are converted to 1/0.
+    For 'mix' tables, an array of objects (strings) is returned if some values are not floats.
+
+    Returns None if some lines require a special treatment (different number of values than nCols,
+    unexpected strings, section separator), in which case the table should be parsed line by line.
+    """
+    if len(lines)==0:
+        return None
+    # Removing comments, only for the lines that have some
+    rows = [cleanAfterChar(cleanAfterChar(l,'!'),'#') if ('!' in l or '#' in l) else l for l in lines]
+    tokens = [row.split() for row in rows]
+    if any([len(v)!=nCols for v in tokens]):
+        return None
+    try:
+        return np.array(tokens, dtype=float)
+    except ValueError:
+        pass
+    if tableType=='num':
+        # Accounting for TRUE FALSE
+        try:
+            return np.array([[_BOOL_TOKENS.get(t.lower(), t) for t in v] for v in tokens], dtype=float)
+        except ValueError:
+            return None
+    elif tableType=='mix':
+        if any([l.startswith('---') for l in lines]):
+            return None
+        return np.array(tokens, dtype=object)
+    return None
+
 def parseFASTFilTable(lines,n,iStart):
     Tab = []
     try:
@@ -1564,10 +1796,10 @@ class ADPolarFile(FASTInputFileBase):
                 self['NumAlf'+labOffset] = self['AFCoeff'+labOffset].shape[0]
         # Potentially compute unsteady params here
 
-    def _write(self):
+    def _write(self, patch=False):
         nTabs = self['NumTabs']
         if nTabs==1:
-            FASTInputFileBase._write(self)
+            FASTInputFileBase._write(self, patch=patch)
         else:
             self._writeSanityChecks()
             Labs=['Re','Ctrl','UserProp','alpha0','alpha1','alpha2','eta_e','C_nalpha','T_f0','T_V0','T_p','T_VL','b1','b2','b5','A1','A2','A5','S1','S2','S3','S4','Cn1','Cn2','St_sh','Cd0','Cm0','k0','k1','k2','k3','k1_hat','x_cp_bar','UACutout','filtCutOff','InclUAdata','NumAlf','AFCoeff']
@@ -1580,12 +1812,14 @@ class ADPolarFile(FASTInputFileBase):
                     i = self.getIDSafe(labRaw+labOffset)
                     if i>0:
                         self.data[i]['label'] = labRaw
+                        self._indexDirty = True
             # Write
             with open(self.filename,'w') as f:
-                f.write(self.toString())
+                f.write(self.toString(patch=patch))
             # Restore labels 
             for i,labFull in enumerate(AllLabels):
                 self.data[i]['label'] = labFull
+            self._indexDirty = True
 
     def _toDataFrame(self):
         dfs = FASTInputFileBase._toDataFrame(self)
@@ -1753,7 +1987,8 @@ class ExtPtfmFile(FASTInputFileBase):
             lines=f.read().splitlines()
         detectAndReadExtPtfmSE(self, lines)
 
-    def toString(self):
+    def toString(self, patch=False):
+        # NOTE: patch is not supported for this format, the file is always fully formatted
         s=''
         s+='!Comment\n'
         s+='!Comment Flex 5 Format\n'
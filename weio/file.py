@@ -17,6 +17,15 @@ try: #Python3
 except NameError: # Python2
     FileNotFoundError = IOError
 
+def readSignature(filename, nBytes=1024):
+    """ Returns the first bytes of a file, or None if the file cannot be opened """
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(nBytes)
+    except (OSError, IOError):
+        return None
+
+
 class File(dict):
     def __init__(self,filename=None,**kwargs):
         if filename:
@@ -47,6 +56,16 @@ class File(dict):
     def toDataFrame(self):
         return self._toDataFrame()
 
+    @staticmethod
+    def sniff(header):
+        """ 
+        Quick check of the file signature, done by `detectFormat` before attempting a full read.
+        `header`: first bytes of the file (see `readSignature`)
+        Returns True if the signature is the one of the format, False if the file cannot be
+        of this format, and None if no conclusion can be drawn (the file will be read to find out).
+        """
+        return None
+
     # --------------------------------------------------------------------------------
     # --- Properties
     # --------------------------------------------------------------------------------
@@ -1,3 +1,4 @@
+import re
 from .file import WrongFormatError
 
 def isRightFormat(fileformat, filename, **kwargs):
@@ -22,6 +23,22 @@ class FileFormat():
         else:
             self.extensions  = fileclass.defaultExtensions()
             self.name        = fileclass.formatName()
+        # Extensions with wildcards, e.g. '.$*', are compiled once
+        self.extPatterns = [re.compile(ef.replace('.',r'\.').replace('$',r'\$').replace('*','[.]*')) for ef in self.extensions if '*' in ef]
+
+    def matchExtension(self, ext):
+        """ Returns True if the (lower case) extension `ext` is one of the format extensions """
+        if ext in self.extensions:
+            return True
+        return any([pat.match(ext) is not None for pat in self.extPatterns])
+
+    def sniff(self, header):
+        """ Quick check of the file signature, see `File.sniff` """
+        try:
+            sniff = self.constructor.sniff
+        except AttributeError:
+            return None
+        return sniff(header)
 
 
     def __repr__(self):
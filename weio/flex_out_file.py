@@ -32,16 +32,30 @@ class FLEXOutFile(File):
     def formatName():
         return 'FLEX output file'
 
-    def _read(self):
+    def _read(self, header_only=False):
+        """ 
+        header_only: if True, only the header of the binary file and the sensor file are read,
+                     self.data and self.time are None.
+        """
         # --- First read the binary file
         dtype=np.float32; # Flex internal data is stored in single precision
-        try:
-            self.data,self.tmin,self.dt,self.Version,self.DateID,self.title=read_flex_res(self.filename, dtype=dtype)
-        except WrongFormatError as e:    
-            raise WrongFormatError('FLEX File {}: '.format(self.filename)+'\n'+e.args[0])
-        self.nt       = np.size(self.data,0)
-        self.nSensors = np.size(self.data,1)
-        self.time = np.arange(self.tmin, self.tmin +  self.nt * self.dt, self.dt).reshape(self.nt,1).astype(dtype)
+        if header_only:
+            with open(self.filename,'rb') as fid:
+                hdr = read_flex_header(fid)
+                nBytes = os.path.getsize(self.filename) - fid.tell()
+            self.tmin, self.dt, self.Version, self.DateID, self.title = hdr['tmin'], hdr['dt'], hdr['Version'], hdr['DateID'], hdr['title']
+            self.nSensors = hdr['nSensors']
+            self.nt       = int(nBytes / 2 / self.nSensors)
+            self.data     = None
+            self.time     = None
+        else:
+            try:
+                self.data,self.tmin,self.dt,self.Version,self.DateID,self.title=read_flex_res(self.filename, dtype=dtype)
+            except WrongFormatError as e:    
+                raise WrongFormatError('FLEX File {}: '.format(self.filename)+'\n'+e.args[0])
+            self.nt       = np.size(self.data,0)
+            self.nSensors = np.size(self.data,1)
+            self.time = np.arange(self.tmin, self.tmin +  self.nt * self.dt, self.dt).reshape(self.nt,1).astype(dtype)
 
         # --- Then the sensor file
         sensor_filename = os.path.join(os.path.dirname(self.filename), "sensor")
@@ -71,46 +85,56 @@ class FLEXOutFile(File):
 # --------------------------------------------------------------------------------}
 # --- Helper Functions 
 # --------------------------------------------------------------------------------{
+def read_flex_header(fid):
+    """ Read the header of a flex binary file, `fid` is left at the start of the time series """
+    #_ = struct.unpack('i', fid.read(4)) # Dummy
+    _ = np.fromfile(fid, 'int32', 1) # Dummy
+    # --- Trying to get DateID
+    fid.seek(4) # 
+    DateID=np.fromfile(fid, 'int32', 6)
+    if DateID[0]<32 and DateID[1]<13 and DateID[3]<25 and DateID[4]<61:
+        # OK, DateID was present
+        title  = fid.read(40).strip()
+    else:
+        fid.seek(4) # 
+        DateID = np.fromfile(fid, 'int32', 1)
+        title  = fid.read(60).strip()
+    _ = np.fromfile(fid, 'int32', 2) # Dummy
+    # FILE POSITION <<< fid.seek(4 * 19) 
+    nSensors = np.fromfile(fid, 'int32', 1)[0] 
+    IDs = np.fromfile(fid, 'int32', nSensors)
+    _ = np.fromfile(fid, 'int32', 1) # Dummy
+    # FILE POSITION <<< fid.seek(4*nSensors+4*21)
+    Version = np.fromfile(fid, 'int32', 1)[0] 
+    # FILE POSITION <<< fid.seek(4*(nSensors)+4*22)
+    if Version == 12:
+        raise NotImplementedError('Flex out file with version 12, TODO. Implement it!')
+        # TODO
+        #fseek(o.fid,4*(21+o.nSensors),-1);% seek to the data from beginning of file
+        #RL=o.nSensors+5; % calculate the length of each row
+        #A = fread(o.fid,[RL,inf],'single'); % read whole file
+        #t=A(2,:);% time vector contained in row 2
+        #o.SensorData=A(5:end,:);
+        # save relevant information 
+        #o.tmin = t(1)     ;
+        #o.dt   = t(2)-t(1);
+        #o.t    = t        ;
+        #o.nt   = length(t);
+    elif Version in [0,2,3]:
+        tmin = np.fromfile(fid, 'f', 1)[0] # Dummy
+        dt = np.fromfile(fid, 'f', 1)[0] # Dummy
+        scale_factors = np.fromfile(fid, 'f', nSensors)
+    # FILE POSITION <<< fid.seek(8*nSensors + 48*2)
+    return {'DateID':DateID, 'title':title, 'nSensors':nSensors, 'IDs':IDs, 'Version':Version,
+            'tmin':tmin, 'dt':dt, 'scale_factors':scale_factors}
+
 def read_flex_res(filename, dtype=np.float32):
     # Read flex file
     with open(filename,'rb') as fid:
-        #_ = struct.unpack('i', fid.read(4)) # Dummy
-        _ = np.fromfile(fid, 'int32', 1) # Dummy
-        # --- Trying to get DateID
-        fid.seek(4) # 
-        DateID=np.fromfile(fid, 'int32', 6)
-        if DateID[0]<32 and DateID[1]<13 and DateID[3]<25 and DateID[4]<61:
-            # OK, DateID was present
-            title  = fid.read(40).strip()
-        else:
-            fid.seek(4) # 
-            DateID = np.fromfile(fid, 'int32', 1)
-            title  = fid.read(60).strip()
-        _ = np.fromfile(fid, 'int32', 2) # Dummy
-        # FILE POSITION <<< fid.seek(4 * 19) 
-        nSensors = np.fromfile(fid, 'int32', 1)[0] 
-        IDs = np.fromfile(fid, 'int32', nSensors)
-        _ = np.fromfile(fid, 'int32', 1) # Dummy
-        # FILE POSITION <<< fid.seek(4*nSensors+4*21)
-        Version = np.fromfile(fid, 'int32', 1)[0] 
-        # FILE POSITION <<< fid.seek(4*(nSensors)+4*22)
-        if Version == 12:
-            raise NotImplementedError('Flex out file with version 12, TODO. Implement it!')
-            # TODO
-            #fseek(o.fid,4*(21+o.nSensors),-1);% seek to the data from beginning of file
-            #RL=o.nSensors+5; % calculate the length of each row
-            #A = fread(o.fid,[RL,inf],'single'); % read whole file
-            #t=A(2,:);% time vector contained in row 2
-            #o.SensorData=A(5:end,:);
-            # save relevant information 
-            #o.tmin = t(1)     ;
-            #o.dt   = t(2)-t(1);
-            #o.t    = t        ;
-            #o.nt   = length(t);
-        elif Version in [0,2,3]:
-            tmin = np.fromfile(fid, 'f', 1)[0] # Dummy
-            dt = np.fromfile(fid, 'f', 1)[0] # Dummy
-            scale_factors = np.fromfile(fid, 'f', nSensors).astype(dtype)
+        hdr = read_flex_header(fid)
+        nSensors, Version = hdr['nSensors'], hdr['Version']
+        tmin, dt, DateID, title = hdr['tmin'], hdr['dt'], hdr['DateID'], hdr['title']
+        scale_factors = hdr['scale_factors'].astype(dtype)
         # --- Reading Time series
         # FILE POSITION <<< fid.seek(8*nSensors + 48*2)
         data = np.fromfile(fid, 'int16').astype(dtype) #data = np.fromstring(fid.read(), 'int16').astype(dtype)
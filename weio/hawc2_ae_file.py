@@ -23,6 +23,12 @@ class HAWC2AEFile(File):
     def formatName():
         return 'HAWC2 AE file'
 
+    @staticmethod
+    def sniff(header):
+        if b'\x00' in header:
+            return False # binary file
+        return None
+
     def __init__(self,filename=None,**kwargs):
         if filename:
             self.filename = filename
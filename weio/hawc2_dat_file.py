@@ -10,12 +10,14 @@ from builtins import str
 from future import standard_library
 standard_library.install_aliases()
 import os 
+import re
 import numpy as np
 
 from .file import File, WrongFormatError, FileNotFoundError
 import pandas as pd
 
 from .wetb.hawc2.Hawc2io import ReadHawc2
+from .fast_output_file import selectChannels
 
 
 class HAWC2DatFile(File):
@@ -34,13 +36,32 @@ class HAWC2DatFile(File):
         self.bHawc=False
         super(HAWC2DatFile, self).__init__(filename=filename,**kwargs)
 
-    def _read(self):
+    def _read(self, header_only=False, channels=None, method='auto', workers=1):
+        """ 
+        header_only: if True, only the sel file (or header) is read: channel names, units, 
+                     descriptions, number of scans `nT` and time step `dt` are stored in self.info
+        channels: list of channel names (case insensitive, patterns such as 'Mx*' allowed) or indices
+                  to read. Only these channels are read from binary files. If the first channel is 
+                  the time, it is always kept first. Default: all channels.
+        method, workers: parser and number of processes used for ascii files, see `ReadAsciiTable`
+        """
+        self._channelIndex = None
         try:
             res_file  = ReadHawc2(self.filename)
-            self.data = res_file.ReadAll()
-            self.info['attribute_names'] = res_file.ChInfo[0]
-            self.info['attribute_units'] = res_file.ChInfo[1]
-            self.info['attribute_descr'] = res_file.ChInfo[2]
+            names, units, descr = res_file.ChInfo
+            ChVec = None
+            if channels is not None:
+                ChVec = selectChannels(names, channels, keepTime=names[0].lower()=='time')
+                names = [names[i] for i in ChVec]
+                units = [units[i] for i in ChVec]
+                descr = [descr[i] for i in ChVec]
+            if not header_only:
+                self.data = res_file.ReadAll(ChVec, method=method, workers=workers)
+            self.info['attribute_names'] = names
+            self.info['attribute_units'] = units
+            self.info['attribute_descr'] = descr
+            self.info['nT'] = res_file.NrSc
+            self.info['dt'] = 1/res_file.Freq
             if res_file.FileFormat=='BHAWC_ASCII':
                 self.bHawc=True
         except FileNotFoundError:
@@ -53,44 +74,42 @@ class HAWC2DatFile(File):
     #def _write(self):
         #self.data.to_csv(self.filename,sep=self.false,index=False)
 
+    @property
+    def channelIndex(self):
+        """ Table of the channels, parsed once from the channel names and descriptions, see `channelIndex` """
+        if getattr(self, '_channelIndex', None) is None or len(self._channelIndex)!=len(self.info['attribute_names']):
+            self._channelIndex = channelIndex(self.info['attribute_names'], self.info['attribute_units'], self.info['attribute_descr'])
+        return self._channelIndex
+
+    def findChannels(self, quantity=None, mbdy=None, coo=None, node=None, elem=None, rmin=None, rmax=None, name=None):
+        """ 
+        Returns the indices of the channels matching all the provided criteria, e.g. 
+            I = F.findChannels(quantity='Mx', mbdy='blade1', rmin=30)
+        The indices can be used to read only these channels: HAWC2DatFile(filename, channels=I)
+        INPUTS:
+          - quantity, mbdy, coo, name: strings, see `channelIndex` (case insensitive, patterns such as 'M*' allowed)
+          - node, elem: node and element numbers
+          - rmin, rmax: bounds on the radial position `s` (curved length along the body)
+        """
+        import fnmatch
+        idx = self.channelIndex
+        b = np.ones(len(idx), dtype=bool)
+        for col, val in [('quantity',quantity), ('mbdy',mbdy), ('coo',coo), ('name',name)]:
+            if val is not None:
+                b &= np.array([fnmatch.fnmatchcase(v.lower(), val.lower()) for v in idx[col].values])
+        if node is not None:
+            b &= idx['node'].values==node
+        if elem is not None:
+            b &= idx['elem'].values==elem
+        if rmin is not None:
+            b &= idx['s'].values>=rmin
+        if rmax is not None:
+            b &= idx['s'].values<=rmax
+        return np.where(b)[0]
+
     def _toDataFrame(self):
-        import re
-
-        # Simplify output names
-        names=self.info['attribute_names']
-        for i,desc in enumerate(self.info['attribute_descr']):
-            elem = re.findall(r'E-nr:\s*(\d+)', desc)
-            zrel = re.findall(r'Z-rel:\s*(\d+.\d+)', desc)
-            node = re.findall(r'nodenr:\s*(\d+)', desc)
-            mbdy = re.findall(r'Mbdy:([-a-zA-Z0-9_.]*) ', desc)
-            s    = re.findall(r's=\s*(\d+.\d+)\[m\]', desc)
-            sS   = re.findall(r's/S=\s*(\d+.\d+)', desc)
-
-            pref=''
-            names[i] = names[i].replace(' ','')
-            names[i] = names[i].replace('coo:global','g').strip()
-            names[i] = names[i].replace('Statepos','').strip()
-            names[i] = names[i].replace('axisangle','rot_').strip()
-
-            if len(mbdy)==1:
-                names[i] = names[i].replace('coo:'+mbdy[0],'b').strip()
-                pref += mbdy[0]
-
-            if len(zrel)==1 and len(elem)==1:
-                ielem=int(elem[0])
-                fzrel=float(zrel[0])
-                if fzrel==0:
-                    pref+= 'N'+str(ielem)
-                elif fzrel==1:
-                    pref+='N'+str(ielem+1)
-                else:
-                    pref+='N'+str(ielem+fzrel)
-            if len(s)==1 and len(sS)==1:
-                pref+='r'+str(sS[0])
-
-            if len(node)==1:
-                pref+='N'+node[0]
-            names[i]=pref+names[i]
+        # Simplified output names
+        names = list(self.channelIndex['label'].values)
 
         if self.info['attribute_units'] is not None:
             units = [u.replace('(','').replace(')','').replace('[','').replace(']','') for u in self.info['attribute_units']]
@@ -150,6 +169,91 @@ class HAWC2DatFile(File):
                     f.write('{:12s}{:31s}{:11s}{:s}\n'.format(str(chan+1),label[0:30],unit,descr))
                 f.write('________________________________________________________________________________________________________________________\n');
 
+# --------------------------------------------------------------------------------}
+# --- Channel index 
+# --------------------------------------------------------------------------------{
+_CHANNEL_REGEXPS = dict([(k, re.compile(v)) for k,v in [
+    ('mbdy' , r'Mbdy:([-a-zA-Z0-9_.]*) '),
+    ('node' , r'nodenr:\s*(\d+)'),
+    ('elem' , r'E-nr:\s*(\d+)'),
+    ('zrel' , r'Z-rel:\s*(\d+.\d+)'),
+    ('s'    , r's=\s*(\d+.\d+)\[m\]'),
+    ('sS'   , r's/S=\s*(\d+.\d+)'),
+    ('coo'  , r'coo:\s*([-a-zA-Z0-9_.]+)'),
+    ('bnode', r'Nod\.+(\d+)'), # BHawC descriptions, e.g. 'Frc  Tower    Elm..1 Nod..1  CoS'
+    ('belem', r'Elm\.+(\d+)'),
+    ]])
+
+def channelIndex(names, units, descr):
+    """ 
+    Returns a table (dataframe) of the channels of a HAWC2 (or BHawC) output file, with one row per channel:
+      - name, unit, descr: as given in the sel file
+      - quantity: name without coordinate system, e.g. 'Mx', 'Fy', 'WSP gl. coo.,Vy'
+      - mbdy, coo: main body and coordinate system ('' if not applicable)
+      - node, elem: node and element numbers (-1 if not applicable)
+      - zrel: relative position on the element (NaN if not applicable)
+      - s, sS: curved length along the body [m] and its relative value (NaN if not applicable)
+      - label: simplified name, used for the dataframe columns, e.g. 'blade1N3Mx'
+    """
+    def find(key, string):
+        m = _CHANNEL_REGEXPS[key].search(string)
+        return None if m is None else m.group(1)
+
+    nCh = len(names)
+    units = list(units) if units is not None else ['']*nCh
+    cols = dict([(k, []) for k in ['name','unit','descr','quantity','mbdy','coo','node','elem','zrel','s','sS','label']])
+    for name, unit, desc in zip(names, units, descr):
+        name = '' if name is None else name
+        desc = '' if desc is None else desc
+        mbdy = find('mbdy', desc)
+        node = find('node', desc)
+        elem = find('elem', desc)
+        zrel = find('zrel', desc)
+        s    = find('s'   , desc)
+        sS   = find('sS'  , desc)
+        coo  = find('coo' , name)
+        coo  = find('coo' , desc) if coo is None else coo
+        # --- Simplified name
+        pref = ''
+        label = name.replace(' ','')
+        label = label.replace('coo:global','g').strip()
+        label = label.replace('Statepos','').strip()
+        label = label.replace('axisangle','rot_').strip()
+        if mbdy is not None:
+            label = label.replace('coo:'+mbdy,'b').strip()
+            pref += mbdy
+        if zrel is not None and elem is not None:
+            ielem = int(elem)
+            fzrel = float(zrel)
+            if fzrel==0:
+                pref += 'N'+str(ielem)
+            elif fzrel==1:
+                pref += 'N'+str(ielem+1)
+            else:
+                pref += 'N'+str(ielem+fzrel)
+        if s is not None and sS is not None:
+            pref += 'r'+str(sS)
+        if node is not None:
+            pref += 'N'+node
+        # --- BHawC node and elements 
+        node = find('bnode', desc) if node is None else node
+        elem = find('belem', desc) if elem is None else elem
+
+        cols['name'    ].append(name)
+        cols['unit'    ].append(unit)
+        cols['descr'   ].append(desc)
+        cols['quantity'].append(name.split('coo:')[0].strip())
+        cols['mbdy'    ].append('' if mbdy is None else mbdy)
+        cols['coo'     ].append('' if coo  is None else coo)
+        cols['node'    ].append(-1 if node is None else int(node))
+        cols['elem'    ].append(-1 if elem is None else int(elem))
+        cols['zrel'    ].append(np.nan if zrel is None else float(zrel))
+        cols['s'       ].append(np.nan if s    is None else float(s))
+        cols['sS'      ].append(np.nan if sS   is None else float(sS))
+        cols['label'   ].append(pref+label)
+    return pd.DataFrame(cols)
+
+
 class BHAWCDatFile(HAWC2DatFile):
     def __init__(self, filename=None, **kwargs):
         super(HAWC2DatFile, self).__init__(filename=filename,**kwargs)
@@ -19,6 +19,12 @@ class HAWC2StFile(File):
     def formatName():
         return 'HAWC2 st file'
 
+    @staticmethod
+    def sniff(header):
+        if b'\x00' in header:
+            return False # binary file
+        return None
+
     def __init__(self,filename=None, **kwargs):
         self.filename = None
         if filename:
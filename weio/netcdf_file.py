@@ -25,6 +25,11 @@ class NetCDFFile(File):
     def formatName():
         return 'NetCDF file (<=2D)'
 
+    @staticmethod
+    def sniff(header):
+        # NetCDF classic format, or NetCDF4 (HDF5)
+        return header[:3]==b'CDF' or header[:4]==b'\x89HDF'
+
     def _read(self):
         try:
             import xarray as xr
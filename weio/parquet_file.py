@@ -13,6 +13,10 @@ class ParquetFile(File):
     def formatName():
         return 'Parquet file'
 
+    @staticmethod
+    def sniff(header):
+        return header[:4]==b'PAR1'
+
     def __init__(self,filename=None,**kwargs):
         self.filename = filename
         if filename:
@@ -12,6 +12,10 @@ class TDMSFile(File):
     def formatName():
         return 'TDMS file'
 
+    @staticmethod
+    def sniff(header):
+        return header[:4]==b'TDSm'
+
     def _read(self):
         try:
             from nptdms import TdmsFile
@@ -155,6 +155,17 @@ class TecplotFile(File):
     def formatName():
         return 'Tecplot ASCII file'
 
+    @staticmethod
+    def sniff(header):
+        if b'\x00' in header:
+            return False # binary file
+        # The first line that is not a comment starts with a keyword (e.g. "TITLE", "VARIABLES")
+        for line in header.decode('latin-1').splitlines():
+            l = line.strip().lower()
+            if len(l)>0 and l[0]!='#':
+                return any([l.find(k)==0 for k in Keywords])
+        return None
+
     def __init__(self,filename=None,**kwargs):
         self.filename = None
         if filename:
@@ -63,6 +63,42 @@ class Test(unittest.TestCase):
             raise Exception('Some tests failed')
 
 
+    def test_002_read_many(self):
+        filenames = [os.path.join(MyDir, f) for f in ['FASTOutBin.outb', 'CSVComma.csv', 'HAWC2_out_bin.dat', 'DoesNotExist.outb']]
+        for backend in ['serial', 'thread', 'process']:
+            results = weio.read_many(filenames, workers=2, backend=backend, toDataFrame=True)
+            self.assertEqual(len(results), 4)
+            for f, df in zip(filenames[:3], results[:3]):
+                np.testing.assert_equal(df.values, weio.read(f).toDataFrame().values)
+            self.assertTrue(isinstance(results[3], Exception))
+        results = weio.read_many(filenames[:1], workers=2, backend='thread', channels=['GenPwr'])
+        self.assertEqual(results[0].info['attribute_names'], ['Time','GenPwr'])
+        with self.assertRaises(Exception):
+            weio.read_many(filenames, backend='serial', raiseErrors=True)
+        with self.assertRaises(ValueError):
+            weio.read_many(filenames, backend='mpi')
+
+
+    def test_003_sniff(self):
+        from weio.file import readSignature
+        from weio.fast_output_file import FASTOutputFile
+        from weio.tecplot_file import TecplotFile
+        from weio.turbsim_file import TurbSimFile
+        header = lambda f: readSignature(os.path.join(MyDir, f))
+        self.assertTrue(FASTOutputFile.sniff(header('FASTOutBin.outb')))
+        self.assertTrue(FASTOutputFile.sniff(header('FASTOut.out')))
+        self.assertFalse(FASTOutputFile.sniff(header('TurbSim_FAST.bts')))
+        self.assertTrue(TurbSimFile.sniff(header('TurbSim_FAST.bts')))
+        self.assertTrue(TecplotFile.sniff(header('TecplotASCII_2.dat')))
+        self.assertFalse(TecplotFile.sniff(header('FASTIn_ED.dat')))
+        self.assertFalse(TecplotFile.sniff(header('HAWC2_out_bin.dat')))
+        # Extension index, including wildcard extensions
+        names = [f.constructor.__name__ for f in weio.extensionCandidates('.$04')]
+        self.assertEqual(names, ['BladedFile'])
+        fileformat, F = weio.detectFormat(os.path.join(MyDir, 'HAWC2_out_bin.dat'))
+        self.assertEqual(fileformat.constructor.__name__, 'HAWC2DatFile')
+
+
 if __name__ == '__main__':
     #Test().test_000_debug()
     unittest.main()
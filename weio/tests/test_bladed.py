@@ -61,6 +61,74 @@ class Test(unittest.TestCase):
         
         self.assertFalse(DF.isnull().values.any())
 
+    def test_Bladed_project_workers(self):
+        # --- Serial and threaded reading of a project give the same tables
+        F1 = BladedFile(os.path.join(MyDir,'Bladed_out_binary_case2.$PJ'), workers=1)
+        F2 = BladedFile(os.path.join(MyDir,'Bladed_out_binary_case2.$PJ'), workers=4)
+        dset1, dset2 = F1.dataSets['Misc'], F2.dataSets['Misc']
+        self.assertEqual(dset1['sensors'], dset2['sensors'])
+        np.testing.assert_equal(dset1['data'], dset2['data'])
+        self.assertEqual(dset1['data'].shape, (10, 89))
+        self.assertEqual([g['iCol'] for g in dset1['groups']][:2], [1, 10])
+
+    def test_Bladed_lazy(self):
+        # --- Lazy project: headers only, groups read on demand
+        F0 = BladedFile(os.path.join(MyDir,'Bladed_out_binary_case2.$PJ'))
+        F  = BladedFile(os.path.join(MyDir,'Bladed_out_binary_case2.$PJ'), lazy=True)
+        dset = F.dataSets['Misc']
+        self.assertFalse('data' in dset.keys())
+        self.assertEqual(dset['shape'], (10, 89))
+        self.assertEqual(dset['sensors'], F0.dataSets['Misc']['sensors'])
+        self.assertEqual(F.groups['Tower loads GL coordinates']['shape'], (10, 2, 8))
+        M = F.groupData(25, flatten=False)
+        self.assertFalse('data' in dset.keys())
+        self.assertEqual(M.shape, (10, 2, 8))
+        self.assertAlmostEqual(M[-1,0,0], 1587526.625)
+        M2 = F.groupData('Tower loads GL coordinates')
+        self.assertTrue(np.shares_memory(M, M2))
+        sensors, units = F.groupChannels(25)
+        self.assertEqual(sensors[0], '-15.0m-MXT')
+        df = F.groupToDataFrame('%25')
+        self.assertEqual(df.shape, (10, 17))
+        self.assertEqual(df.columns[1], '-15.0m-MXT [Nm]')
+        # --- Accessing the data of the dataset reads all groups
+        np.testing.assert_equal(dset['data'], F0.dataSets['Misc']['data'])
+        np.testing.assert_equal(F.groupData(25), M2)
+        self.assertTrue(np.shares_memory(F.groupData(25, flatten=False), dset['data']))
+
+    def test_Bladed_OrgData(self):
+        # --- Flattening of 3D outputs is a view, columns ordered by section then channel
+        from weio.bladed_out_file import OrgData
+        info = {'NDIMENS':3, 'nMajor':4, 'SectionList':np.array([0., 10.5, 20.]), 'ChannelName':['A','B'], 'ChannelUnit':['N','m']}
+        data3D = np.arange(4*3*2, dtype=np.float32).reshape(4,3,2)
+        data, info = OrgData(data3D, **info)
+        self.assertEqual(data.shape, (4, 6))
+        self.assertTrue(np.shares_memory(data, data3D))
+        np.testing.assert_equal(data[:,3], data3D[:,1,1])
+        self.assertEqual(info['ChannelName'], ['0.0m-A','0.0m-B','10.5m-A','10.5m-B','20.0m-A','20.0m-B'])
+        self.assertEqual(info['ChannelUnit'], ['N','m','N','m','N','m'])
+
+    def test_Bladed_multiIndex(self):
+        F = BladedFile(os.path.join(MyDir,'Bladed_out_binary_case2.$PJ'))
+        DF  = F.toDataFrame()
+        DFM = F.toDataFrame(multiIndex=True)
+        self.assertEqual(DFM.shape, DF.shape)
+        self.assertEqual(DFM.columns.names, ['section', 'channel'])
+        self.assertEqual(DFM.columns[0], ('', 'Time [s]'))
+        self.assertEqual(DFM.columns[27], (26.407, 'DPMOM1 [Nm/m]'))
+        np.testing.assert_equal(DFM.values, DF.values)
+        df = F.groupToDataFrame('Tower loads GL coordinates', multiIndex=True)
+        self.assertAlmostEqual(df[(-15.0, 'MXT [Nm]')].values[-1], 1587526.625)
+
+    def test_Bladed_header_only(self):
+        H = weio.read_header(os.path.join(MyDir,'Bladed_out_binary_case2.$PJ'))
+        dset = H.dataSets['Misc']
+        self.assertFalse('data' in dset.keys())
+        self.assertEqual(dset['nMajor'], 10)
+        self.assertAlmostEqual(dset['dt'], 0.05)
+        self.assertEqual(len(dset['sensors']), 89)
+        self.assertEqual(dset['sensors'][27], '26.41m-DPMOM1')
+
     def test_Bladed_case2_indiv(self):
         F = weio.read(os.path.join(MyDir,'Bladed_out_binary_case2.$12')) 
         DF=F.toDataFrame()
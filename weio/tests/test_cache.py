@@ -0,0 +1,118 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import weio
+from .helpers_for_test import MyDir
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.cacheDir = tempfile.mkdtemp(prefix='_weio_cache')
+        self.options = weio.cache.configure()
+        weio.cache.configure(disk=True, directory=self.cacheDir)
+
+    def tearDown(self):
+        weio.cache.configure(**self.options)
+        weio.cache._OPTIONS['directory'] = self.options['directory']
+        shutil.rmtree(self.cacheDir, ignore_errors=True)
+
+    def test_disk_cache(self):
+        # --- Second read is loaded from the cache, large arrays are memory-mapped
+        filename = os.path.join(MyDir, 'FASTOutBin.outb')
+        minBytes, weio.cache.MIN_ARRAY_BYTES = weio.cache.MIN_ARRAY_BYTES, 0
+        try:
+            F1 = weio.read(filename)
+            s0 = weio.cache.stats()
+            F2 = weio.read(filename)
+            s1 = weio.cache.stats()
+        finally:
+            weio.cache.MIN_ARRAY_BYTES = minBytes
+        self.assertEqual(s0['disk_entries'], 1)
+        self.assertEqual(s1['disk_hits'], s0['disk_hits']+1)
+        self.assertTrue(isinstance(F2.data, np.memmap))
+        self.assertEqual(type(F2), type(F1))
+        np.testing.assert_equal(F2.data, F1.data)
+        self.assertEqual(F2.info['attribute_names'], F1.info['attribute_names'])
+        # --- Different arguments are different entries, cache can be bypassed
+        F3 = weio.read(filename, channels=['GenPwr'])
+        self.assertEqual(F3.data.shape[1], 2)
+        self.assertEqual(weio.cache.stats()['disk_entries'], 2)
+        weio.read(os.path.join(MyDir, 'CSVComma.csv'), cache=False)
+        self.assertEqual(weio.cache.stats()['disk_entries'], 2)
+        # --- Entries referring to unsafe globals are not loaded
+        import pickle
+        import glob
+        class Unsafe(object):
+            def __reduce__(self):
+                return (os.remove, (filename,))
+        for pkl in glob.glob(os.path.join(self.cacheDir, '*', 'object.pkl')):
+            with open(pkl, 'wb') as f:
+                pickle.dump(Unsafe(), f)
+        s2 = weio.cache.stats()
+        F4 = weio.read(filename)
+        self.assertTrue(os.path.exists(filename))
+        np.testing.assert_equal(F4.data, F1.data)
+        self.assertEqual(weio.cache.stats()['disk_misses'], s2['disk_misses']+1)
+        # --- Eviction of the least recently used entries
+        weio.cache.evict(max_bytes=0)
+        self.assertEqual(weio.cache.stats()['disk_entries'], 0)
+
+    def test_disk_cache_modified(self):
+        # --- A modified file is read again
+        filename = os.path.join(self.cacheDir, '_tmp.csv')
+        shutil.copy(os.path.join(MyDir, 'CSVComma.csv'), filename)
+        df1 = weio.read(filename).toDataFrame()
+        with open(filename, 'a') as f:
+            f.write('10,20\n')
+        df2 = weio.read(filename).toDataFrame()
+        self.assertEqual(len(df2), len(df1)+1)
+
+    def test_memory_cache(self):
+        weio.cache.configure(disk=False, max_bytes=10**8)
+        weio.cache.clear()
+        try:
+            # --- Copies of the cached object are returned
+            filename = os.path.join(MyDir, 'FASTOutBin.outb')
+            F1 = weio.read(filename)
+            F2 = weio.read(filename)
+            self.assertEqual(weio.cache.stats()['memory_hits'], 1)
+            self.assertFalse(F1 is F2)
+            np.testing.assert_equal(F1.data, F2.data)
+            F1.data[0,1] = -1.0 # modifying an object does not modify the cache
+            F2.info['attribute_names'][1] = 'New'
+            F3 = weio.read(filename)
+            self.assertNotEqual(F3.data[0,1], -1.0)
+            self.assertNotEqual(F3.info['attribute_names'][1], 'New')
+            # --- Dataframe is computed once
+            df1 = weio.cache.dataFrame(filename)
+            df1['New'] = 0 # the cached dataframe is not modified
+            df2 = weio.cache.dataFrame(filename)
+            self.assertFalse('New' in df2.columns)
+            self.assertEqual(df2.shape[1], F1.data.shape[1])
+            self.assertTrue(np.shares_memory(df1.iloc[:,0].values, df2.iloc[:,0].values))
+            np.testing.assert_equal(df2.values, F3.toDataFrame().values)
+            dfs = weio.read_many([filename], backend='serial', toDataFrame=True)
+            self.assertTrue(np.shares_memory(dfs[0].iloc[:,0].values, df2.iloc[:,0].values))
+            s = weio.cache.stats()
+            self.assertEqual(s['memory_entries'], 1)
+            self.assertGreaterEqual(s['memory_bytes'], F1.data.nbytes+df2.memory_usage().sum())
+            self.assertLess(s['memory_bytes'], F1.data.nbytes+df2.memory_usage().sum()+2000) # strings
+            # --- Eviction based on the memory budget
+            weio.read(os.path.join(MyDir, 'HAWC2_out_bin.dat'))
+            self.assertEqual(weio.cache.stats()['memory_entries'], 2)
+            weio.cache.configure(max_bytes=F1.data.nbytes)
+            self.assertEqual(weio.cache.stats()['memory_entries'], 0)
+            # --- Objects from the cache can be pickled
+            import pickle
+            weio.cache.configure(max_bytes=10**8)
+            F3 = pickle.loads(pickle.dumps(weio.read(filename)))
+            np.testing.assert_equal(F3.toDataFrame().values, df2.values)
+        finally:
+            weio.cache.clear(disk=False)
+            weio.cache.configure(max_bytes=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
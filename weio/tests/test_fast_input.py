@@ -117,6 +117,11 @@ class Test(unittest.TestCase):
 
         F = ADPolarFile(numTabs=2)
         F.write('_DUMMY')
+        # cleanup
+        try:
+            os.remove('_DUMMY')
+        except:
+            pass
 
     def test_FASTEDBld(self):
         F=FASTInputFile(os.path.join(MyDir,'FASTIn_ED_bld.dat'))
@@ -156,6 +161,127 @@ class Test(unittest.TestCase):
 #         self.assertEqual(len(graph.Nodes), 2)
 #         self.assertEqual(len(graph.Elements), 1)
 
+    def test_FASTIn_labelIndex(self):
+        # --- Case-insensitive lookups, consistent when the data is modified
+        F=FASTInputFile(os.path.join(MyDir,'FASTIn_ED.dat'))
+        self.assertEqual(F['rotspeed'],0.2)
+        nKeys = len(F.keys())
+        F.fixedfile.addKeyVal('NewKey', 12)
+        F.fixedfile.addTable('NewTab', np.zeros((2,2)), cols=['A','B'])
+        F.fixedfile.addComment('Some comment')
+        self.assertEqual(F['newkey'],12)
+        self.assertEqual(F['NEWTAB'].shape,(2,2))
+        self.assertEqual(len(F.keys()), nKeys+2)
+        F['NewKey'] = 13
+        F.fixedfile.addKeyVal('newkey', 14)
+        self.assertEqual(F['NewKey'],14)
+        self.assertTrue('NewKey' in F)
+        del F['NewKey']
+        self.assertFalse('NewKey' in F)
+        self.assertEqual(len(F.keys()), nKeys+1)
+        with self.assertRaises(KeyError):
+            F['NewKey']
+        self.assertEqual(F['RotSpeed'],0.2)
+        # Direct modifications of data
+        data = F.fixedfile.data
+        i = F.fixedfile.getID('RotSpeed')
+        d = data.pop(i)
+        self.assertFalse('RotSpeed' in F)
+        data.insert(0, d)
+        self.assertEqual(F.fixedfile.getID('RotSpeed'), 0)
+        data[0]['label'] = 'RotSpeed2'
+        self.assertFalse('RotSpeed' in F)
+        # Lookups after renaming or replacing entries in place
+        self.assertTrue('RotSpeed2' in F)
+        self.assertEqual(F['rotspeed2'],0.2)
+        self.assertTrue('RotSpeed2' in F.keys())
+        i = F.fixedfile.getID('TipRad')
+        data[i] = dict(data[i], label='TipRadX')
+        self.assertFalse('TipRad' in F)
+        self.assertEqual(F['TipRadX'],63)
+        # A miss does not rebuild the index
+        index = F.fixedfile._labelIndex()
+        self.assertFalse('NotAKey' in F)
+        self.assertTrue(F.fixedfile._labelIndex() is index)
+        F.renameKey('TipRadX', 'TipRad')
+        self.assertEqual(F['TipRad'],63)
+        self.assertFalse('TipRadX' in F)
+        self.assertTrue('TipRad' in F.keys())
+
+    def test_FASTIn_numBlock(self):
+        # --- Block parsing of tables, and fall back to the line by line parsing
+        import io, contextlib
+        from weio.file import BrokenFormatError
+        from weio.fast_input_file import parseFASTNumBlock, parseFASTNumTable
+        header = ['A    B    C', '(-)  (-)  (-)']
+        # Booleans and print flags
+        Tab = parseFASTNumBlock(['1  TRUE  PRINT', '2  false  NoPrint ! comment'], 3, 'num')
+        np.testing.assert_equal(Tab, [[1,1,1],[2,0,0]])
+        self.assertEqual(Tab.dtype, float)
+        # Mix tables, with strings or only floats
+        Tab = parseFASTNumBlock(['1  Cyl  "file.dat"', '2  Rect  "-"'], 3, 'mix')
+        self.assertEqual(Tab.dtype, object)
+        self.assertEqual(list(Tab[1]), ['2', 'Rect', '"-"'])
+        self.assertEqual(parseFASTNumBlock(['1  2  3'], 3, 'mix').dtype, float)
+        Tab, Cols, Units = parseFASTNumTable('', header+['1 Cyl 3', '4 Rect 6'], 2, 0, tableType='mix')
+        self.assertEqual(list(Tab[:,1]), ['Cyl', 'Rect'])
+        self.assertEqual(Cols, ['A', 'B', 'C'])
+        # Wrong number of values: line by line parsing, with a warning
+        self.assertTrue(parseFASTNumBlock(['1 2 3', '4 5'], 3, 'num') is None)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            Tab, Cols, Units = parseFASTNumTable('', header+['1 2 3', '4 5 6 7'], 2, 0, tableType='num')
+        self.assertTrue('[WARN]' in out.getvalue())
+        np.testing.assert_equal(Tab, [[1,2,3],[4,5,6]])
+        # Section separator in a mix table: the dimension variable is wrong
+        self.assertTrue(parseFASTNumBlock(['1 Cyl 3', '--- Section ---'], 3, 'mix') is None)
+        with self.assertRaises(BrokenFormatError):
+            parseFASTNumTable('', header+['1 Cyl 3', '--- Section ---'], 2, 0, tableType='mix', varNumLines='NMembers')
+
+    def test_FASTIn_patch(self):
+        # --- Patch mode: only the modified entries are formatted, other lines are the original ones
+        filename = os.path.join(MyDir,'FASTIn_ED_bld.dat')
+        with open(filename, 'r') as f:
+            lines = f.read().splitlines()
+        F=FASTInputFile(filename)
+        self.assertEqual(F.toString(patch=True).split('\n'), lines)
+        # Modifying a scalar, only one line differs
+        v0 = F['BldFlDmp(2)']
+        F['BldFlDmp(2)'] = 3.5
+        lines2 = F.toString(patch=True).split('\n')
+        self.assertEqual(len(lines2), len(lines))
+        iDiff = [i for i,(l1,l2) in enumerate(zip(lines,lines2)) if l1!=l2]
+        self.assertEqual(len(iDiff), 1)
+        self.assertTrue(lines2[iDiff[0]].find('BldFlDmp(2)')>0)
+        # Modifying a table in place, the table is formatted
+        F['BldProp'][3,1] = 12.0
+        tempFilename = os.path.join(MyDir,'FASTIn_ED_bld_TMP.dat')
+        F.write(tempFilename, patch=True)
+        F2 = FASTInputFile(tempFilename)
+        os.remove(tempFilename)
+        self.assertEqual(F2['BldFlDmp(2)'], 3.5)
+        self.assertEqual(F2['BldProp'][3,1], 12.0)
+        np.testing.assert_equal(F2['BldProp'], F['BldProp'])
+        self.assertEqual(F2['BldEdgSh(2)'], F['BldEdgSh(2)'])
+        # Restoring the original value, the original line is used again
+        F['BldFlDmp(2)'] = v0
+        lines2 = F.toString(patch=True).split('\n')
+        self.assertEqual(lines2[iDiff[0]], lines[iDiff[0]])
+        # Copies and pickled objects keep the patch mode
+        import copy, pickle
+        F=FASTInputFile(filename)
+        F['BldFlDmp(2)'] = 3.5
+        ref = F.toString(patch=True)
+        for G in [copy.copy(F), copy.deepcopy(F), pickle.loads(pickle.dumps(F))]:
+            self.assertEqual(G.toString(patch=True), ref)
+        # Entries are matched by position: after an insertion, the entries are formatted
+        F.fixedfile.data.insert(3, F.fixedfile.data[3].copy())
+        lines2 = F.toString(patch=True).split('\n')
+        self.assertEqual(lines2[:3], lines[:3])
+        self.assertEqual(lines2[3], lines2[4])
+        F2 = FASTInputFile(filename)
+        F2.fixedfile.data = F.fixedfile.data
+        self.assertEqual(F2.toString(patch=True), F.toString())
+
 if __name__ == '__main__':
     #Test().test_FASTEDBld()
     #Test().test_FASTADBld()
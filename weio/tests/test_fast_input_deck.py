@@ -26,7 +26,147 @@ class Test(unittest.TestCase):
         self.assertTrue(F.AD is not None)
         self.assertTrue(F.AD.Bld1 is not None)
 
+    def test_deck_cache(self):
+        # --- Files are parsed once per session, each deck has its own copy
+        from weio.fast_input_deck import clearCache, cacheStats
+        filename = os.path.join(MyDir,'input_decks/Main_EllipticalWingInf_OLAF.dvr')
+        clearCache()
+        F1 = FASTInputDeck(filename, cache=True)
+        s1 = cacheStats()
+        self.assertEqual(s1['hits'], 0)
+        self.assertTrue(s1['entries']>=4) # Driver, IW, AD, blade, polar
+        F2 = FASTInputDeck(filename, workers=2, backend='thread')
+        s2 = cacheStats()
+        self.assertEqual(s2['hits'], s1['entries'])
+        self.assertEqual(s2['entries'], s1['entries'])
+        # Same content, independent objects
+        self.assertEqual(len(F2.fst_vt['af_data']), 1)
+        np.testing.assert_equal(F2.fst_vt['af_data'][0]['AFCoeff'], F1.fst_vt['af_data'][0]['AFCoeff'])
+        F2.fst_vt['af_data'][0]['AFCoeff'][0,1] = 12.0
+        self.assertNotEqual(F1.fst_vt['af_data'][0]['AFCoeff'][0,1], 12.0)
+        self.assertEqual(F2.AD.filename, F1.AD.filename)
+        # Without cache
+        F3 = FASTInputDeck(filename, cache=False, backend='serial')
+        self.assertEqual(cacheStats()['hits'], s2['hits'])
+        self.assertEqual(F3.AD['AFNames'], F1.AD['AFNames'])
+        # The paths whose hash is known are bounded
+        import weio.fast_input_deck as deck
+        nMax, deck._CACHE_PATHS_MAX = deck._CACHE_PATHS_MAX, 2
+        try:
+            clearCache()
+            FASTInputDeck(filename)
+            self.assertEqual(len(deck._CACHE_PATHS), 2)
+        finally:
+            deck._CACHE_PATHS_MAX = nMax
+        clearCache()
+        self.assertEqual(cacheStats()['entries'], 0)
 
+    def test_deck_process(self):
+        # --- Reading with a pool of processes, all the file types need to be picklable
+        import glob
+        from weio.fast_input_deck import readInputFiles
+        filenames = sorted(glob.glob(os.path.join(MyDir,'FASTIn_*.dat')))
+        ref = readInputFiles(filenames, backend='serial', cache=False)
+        res = readInputFiles(filenames, workers=2, backend='process', cache=False)
+        self.assertEqual(list(res.keys()), filenames)
+        for filename in filenames:
+            if isinstance(ref[filename], Exception):
+                self.assertTrue(isinstance(res[filename], Exception))
+                continue
+            self.assertEqual(type(res[filename].fixedfile), type(ref[filename].fixedfile))
+            np.testing.assert_equal(res[filename].fixedfile.data, ref[filename].fixedfile.data)
+        # Deck
+        filename = os.path.join(MyDir,'input_decks/Main_EllipticalWingInf_OLAF.dvr')
+        F0 = FASTInputDeck(filename, backend='serial', cache=False)
+        F  = FASTInputDeck(filename, workers=2, backend='process', cache=False)
+        self.assertEqual(F.AD.Bld1['NumBlNds'], F0.AD.Bld1['NumBlNds'])
+        np.testing.assert_equal(F.fst_vt['af_data'][0]['AFCoeff'], F0.fst_vt['af_data'][0]['AFCoeff'])
+        with self.assertRaises(ValueError):
+            readInputFiles(filenames, backend='mpi')
+
+    def test_deck_lazy(self):
+        # --- Files are parsed on first access, paths are known without parsing
+        from weio.fast_input_deck import LazyInputFile
+        filename = os.path.join(MyDir,'input_decks/Main_EllipticalWingInf_OLAF.dvr')
+        F0 = FASTInputDeck(filename)
+        F  = FASTInputDeck(filename, lazy=True)
+        self.assertEqual(F.fst['NumTurbines'],1)
+        self.assertTrue(isinstance(F.AD, LazyInputFile))
+        self.assertFalse(F.AD.loaded)
+        self.assertFalse(F.IW.loaded)
+        self.assertEqual(F.AD.filename, F.AD_path)
+        self.assertEqual(F.AD_path, os.path.join(MyDir,'input_decks','Elliptic_AD15_40.dat'))
+        self.assertEqual(F.inputFiles, F0.inputFiles)
+        self.assertFalse(F.AD.loaded)
+        # Polars: the AeroDyn file is parsed to know the polar files
+        af_data = F.fst_vt['af_data']
+        self.assertTrue(F.AD.loaded)
+        self.assertEqual(len(af_data), 1)
+        self.assertFalse(af_data[0].loaded)
+        np.testing.assert_equal(af_data[0]['AFCoeff'], F0.fst_vt['af_data'][0]['AFCoeff'])
+        self.assertTrue(af_data[0].loaded)
+        # Backward compatibility attributes
+        self.assertFalse(F.AD.Bld1.loaded)
+        self.assertEqual(F.AD.Bld1['NumBlNds'], F0.AD.Bld1['NumBlNds'])
+        self.assertTrue(F.AD.AF is af_data)
+        # Modifications
+        F.IW['WindType'] = 1
+        self.assertEqual(F.fst_vt['InflowWind']['WindType'], 1)
+
+
+    def test_deck_lazy_write(self):
+        # --- Writing a lazy deck to another directory gives the same files as an eager deck
+        import shutil
+        import tempfile
+        fst = """------- OpenFAST INPUT FILE -------------------------------------------
+Minimal deck
+---------------------- SIMULATION CONTROL --------------------------------------
+False         Echo            - Echo input data to <RootName>.ech (flag)
+1             InterpOrder     - Interpolation order for input/output time history (-) {1=linear, 2=quadratic}
+---------------------- FEATURE SWITCHES AND FLAGS ------------------------------
+1             CompElast       - Compute structural dynamics (switch) {1=ElastoDyn; 2=ElastoDyn + BeamDyn for blades}
+0             CompInflow      - Compute inflow wind velocities (switch) {0=still air; 1=InflowWind}
+0             CompAero        - Compute aerodynamic loads (switch) {0=None; 2=AeroDyn v15}
+0             CompServo       - Compute control and electrical-drive dynamics (switch) {0=None; 1=ServoDyn}
+0             CompHydro       - Compute hydrodynamic loads (switch) {0=None; 1=HydroDyn}
+0             CompSub         - Compute sub-structural dynamics (switch) {0=None; 1=SubDyn}
+0             CompMooring     - Compute mooring system (switch) {0=None; 1=MAP++; 2=MoorDyn}
+0             CompIce         - Compute ice loads (switch) {0=None; 1=IceFloe}
+---------------------- INPUT FILES ---------------------------------------------
+"ED.dat"      EDFile          - Name of file containing ElastoDyn input parameters (quoted string)
+"unused"      BDBldFile(1)    - Name of file containing BeamDyn input parameters for blade 1 (quoted string)
+"unused"      InflowFile      - Name of file containing inflow wind input parameters (quoted string)
+"unused"      AeroFile        - Name of file containing aerodynamic input parameters (quoted string)
+"unused"      ServoFile       - Name of file containing control and electrical-drive input parameters (quoted string)
+"unused"      HydroFile       - Name of file containing hydrodynamic input parameters (quoted string)
+"unused"      SubFile         - Name of file containing sub-structural input parameters (quoted string)
+"unused"      MooringFile     - Name of file containing mooring system input parameters (quoted string)
+"unused"      IceFile         - Name of file containing ice input parameters (quoted string)
+"""
+        tmpDir = tempfile.mkdtemp()
+        try:
+            inDir, outLazy, outEager = [os.path.join(tmpDir, d) for d in ['in', 'lazy', 'eager']]
+            for d in [inDir, outLazy, outEager]:
+                os.mkdir(d)
+            with open(os.path.join(inDir, 'Main.fst'), 'w') as f:
+                f.write(fst)
+            shutil.copy(os.path.join(MyDir, 'FASTIn_ED.dat'    ), os.path.join(inDir, 'ED.dat'))
+            shutil.copy(os.path.join(MyDir, 'FASTIn_ED_twr.dat'), os.path.join(inDir, 'TestCase_ED_Tower.dat'))
+            shutil.copy(os.path.join(MyDir, 'FASTIn_ED_bld.dat'), os.path.join(inDir, 'TestCase_ED_Blade.dat'))
+            F = FASTInputDeck(os.path.join(inDir, 'Main.fst'), lazy=True)
+            self.assertFalse(F.fst_vt['ElastoDyn'].loaded)
+            F.write(os.path.join(outLazy, 'Main.fst'))
+            FASTInputDeck(os.path.join(inDir, 'Main.fst')).write(os.path.join(outEager, 'Main.fst'))
+            for name in ['Main.fst', 'ED.dat', 'ED_twr.dat', 'ED_bld.dat']:
+                with open(os.path.join(outLazy, name)) as f1, open(os.path.join(outEager, name)) as f2:
+                    self.assertEqual(f1.read(), f2.read())
+            # The deck written is read back
+            F2 = FASTInputDeck(os.path.join(outLazy, 'Main.fst'), lazy=True)
+            np.testing.assert_equal(F2.fst_vt['ElastoDynTower']['TowProp'], F.fst_vt['ElastoDynTower']['TowProp'])
+            # Deferred entries are evaluated when iterating
+            self.assertFalse(any([type(v).__name__=='_Deferred' for v in F2.fst_vt.values()]))
+        finally:
+            shutil.rmtree(tmpDir)
 
 if __name__ == '__main__':
     #Test().test_FASTIn()
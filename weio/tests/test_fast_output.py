@@ -42,6 +42,118 @@ class Test(unittest.TestCase):
         except:
             pass
 
+    def test_FASTOutBin_mmap(self):
+        # --- Memory-mapped and lazy reading match the legacy buffered reading
+        for filename in ['FASTOutBin.outb', 'FASTOutBin_ID4.outb']:
+            F0 = FASTOutputFile(os.path.join(MyDir,filename), method='buffer')
+            F1 = FASTOutputFile(os.path.join(MyDir,filename))
+            F2 = FASTOutputFile(os.path.join(MyDir,filename), lazy=True)
+            np.testing.assert_equal(F1.data, F0.data)
+            np.testing.assert_equal(F2.data.shape, F0.data.shape)
+            np.testing.assert_equal(F2.data[:,-1], F0.data[:,-1])
+            np.testing.assert_equal(F2.data[2:5,[0,3]], F0.data[2:5,[0,3]])
+            np.testing.assert_equal(F2.data[-1], F0.data[-1])
+            np.testing.assert_equal(F2.toDataFrame().values, F0.toDataFrame().values)
+        with self.assertRaises(ValueError):
+            F2.data.__array__(copy=False)
+        with self.assertRaises(ValueError):
+            FASTOutputFile(os.path.join(MyDir,'FASTOutBin.outb'), method='unknown')
+
+    def test_FASTOut_channels(self):
+        # --- Reading a subset of channels, time is always first
+        F0 = FASTOutputFile(os.path.join(MyDir,'FASTOutBin.outb'))
+        for kwargs in [{}, {'lazy':True}, {'method':'buffer'}]:
+            F = FASTOutputFile(os.path.join(MyDir,'FASTOutBin.outb'), channels=['genpwr','Wind1Vel*', 5], **kwargs)
+            self.assertEqual(F.info['attribute_names'], ['Time','GenPwr','Wind1VelX','Wind1VelY','Wind1VelZ','BldPitch1'])
+            self.assertEqual(F.info['attribute_units'][1], 'kW')
+            np.testing.assert_equal(np.asarray(F.data), F0.data[:,[0,10,1,2,3,5]])
+        # --- Ascii
+        F = FASTOutputFile(os.path.join(MyDir,'FASTOut.out'), channels=['GenSpeed'])
+        df = F.toDataFrame()
+        self.assertEqual(list(df.columns), ['Time_[s]','GenSpeed_[rpm]'])
+        self.assertEqual(df.values[-1,1],1036)
+        # --- Unknown channel
+        with self.assertRaises(Exception):
+            FASTOutputFile(os.path.join(MyDir,'FASTOutBin.outb'), channels=['NotAChannel'])
+
+    def test_FASTOut_ascii_methods(self):
+        # --- The fixed-width and numpy parsers give the same results, comment lines at the end are skipped
+        from weio.fast_output_file import ascii_table_layout, load_ascii_output
+        for filename in ['FASTOut.out', 'FASTOut_Hydro.out', 'FASTOut_HD.elev']:
+            F1 = FASTOutputFile(os.path.join(MyDir,filename), method='numpy')
+            F2 = FASTOutputFile(os.path.join(MyDir,filename), method='fixed')
+            np.testing.assert_equal(F1.data, F2.data)
+            name = F1.info['attribute_names'][-1]
+            F1 = FASTOutputFile(os.path.join(MyDir,filename), method='numpy', channels=[name])
+            F2 = FASTOutputFile(os.path.join(MyDir,filename), channels=[name]) # auto: fixed
+            np.testing.assert_equal(F1.data, F2.data)
+        F = FASTOutputFile(os.path.join(MyDir,'FASTOut_Hydro.out'), method='fixed')
+        np.testing.assert_equal(F.data[-1,:], [4.0, 0.0])
+        self.assertEqual(ascii_table_layout(os.path.join(MyDir,'FASTOut.out'), 8, 2)[:2], (22, 21))
+        # --- Lines of different widths: auto falls back to numpy
+        with open(os.path.join(MyDir,'FASTOut.out')) as f:
+            lines = f.readlines()
+        lines[10] = ' '+lines[10]
+        tempFilename = '_FASTOut_ascii_methods.out'
+        with open(tempFilename, 'w') as f:
+            f.write(''.join(lines))
+        try:
+            F = FASTOutputFile(tempFilename, channels=['GenSpeed'])
+            np.testing.assert_equal(F.data, FASTOutputFile(os.path.join(MyDir,'FASTOut.out')).data)
+            with self.assertRaises(ValueError):
+                load_ascii_output(tempFilename, method='fixed')
+        finally:
+            os.remove(tempFilename)
+        with self.assertRaises(ValueError):
+            FASTOutputFile(os.path.join(MyDir,'FASTOut.out'), method='pandas')
+
+    def test_FASTOutBin_write_fileIDs(self):
+        # --- Write and read back all supported FileIDs
+        from weio.fast_output_file import writeBinary
+        F = FASTOutputFile(os.path.join(MyDir,'FASTOutBin.outb'))
+        names = F.info['attribute_names']
+        units = F.info['attribute_units']
+        tempFilename = '_FASTOutBin_out.outb'
+        for fileID in [1, 2, 3, 4]:
+            chanNames = names if fileID!=4 else [names[0]] + [n+'_LongName' for n in names[1:]]
+            writeBinary(tempFilename, F.data, chanNames, units, fileID=fileID, descStr='Test')
+            F2 = FASTOutputFile(tempFilename)
+            self.assertEqual(F2.info['fileID'], fileID)
+            self.assertEqual(F2.info['attribute_names'], chanNames)
+            self.assertEqual(F2.info['attribute_units'][-1],'kW')
+            np.testing.assert_almost_equal(F2.data, F.data, 4)
+            if fileID==3:
+                np.testing.assert_equal(F2.data, F.data)
+        try:
+            os.remove(tempFilename)
+        except:
+            pass
+
+    def test_FASTOut_iter_chunks(self):
+        # --- Chunks concatenated are equal to the full file
+        for filename in ['FASTOutBin.outb', 'FASTOut.out', 'FASTOut_Hydro.out']:
+            F = FASTOutputFile(os.path.join(MyDir,filename))
+            chunks = list(FASTOutputFile.iter_chunks(os.path.join(MyDir,filename), nrows=3, asDataFrame=False))
+            self.assertEqual(len(chunks), int(np.ceil(F.data.shape[0]/3)))
+            np.testing.assert_equal(np.vstack(chunks), F.data)
+        # --- DataFrames with a subset of channels
+        dfs = list(FASTOutputFile.iter_chunks(os.path.join(MyDir,'FASTOutBin.outb'), nrows=100, channels=['GenPwr']))
+        self.assertEqual(len(dfs), 3)
+        self.assertEqual(list(dfs[-1].columns), ['Time_[s]','GenPwr_[kW]'])
+        self.assertAlmostEqual(dfs[-1]['GenPwr_[kW]'].values[-1],40.57663190807828)
+        with self.assertRaises(ValueError):
+            next(FASTOutputFile.iter_chunks(os.path.join(MyDir,'FASTOut.csv')))
+
+    def test_FASTOut_header_only(self):
+        for filename in ['FASTOutBin.outb', 'FASTOutBin_ID4.outb', 'FASTOut.out', 'FASTOut_Hydro.out']:
+            F = FASTOutputFile(os.path.join(MyDir,filename))
+            H = FASTOutputFile(os.path.join(MyDir,filename), header_only=True)
+            self.assertTrue(H.data is None)
+            self.assertEqual(H.info['nT'], F.data.shape[0])
+            self.assertAlmostEqual(H.info['dt'], F.data[1,0]-F.data[0,0])
+            self.assertEqual(H.info['attribute_names'], F.info['attribute_names'])
+            self.assertEqual(H.info['attribute_units'], F.info['attribute_units'])
+
 if __name__ == '__main__':
 #     Test().test_000_debug()
     unittest.main()
@@ -46,6 +46,78 @@ class Test(unittest.TestCase):
         os.remove(os.path.join(MyDir,'HAWC2_out_ascii_TMP.sel'))
         os.remove(os.path.join(MyDir,'HAWC2_out_ascii_TMP2.sel'))
 
+    def test_HAWC2_header_only(self):
+        for filename in ['HAWC2_out_bin.sel', 'HAWC2_out_ascii.dat', 'BHAWC_out_ascii.sel']:
+            F = weio.read(os.path.join(MyDir,filename))
+            H = weio.read_header(os.path.join(MyDir,filename))
+            self.assertEqual(H.data.size, 0)
+            self.assertEqual(H.info['nT'], F.data.shape[0])
+            self.assertEqual(H.info['attribute_names'], F.info['attribute_names'])
+        self.assertAlmostEqual(H.info['dt'], 0.4/11)
+
+    def test_HAWC2_bin_channels(self):
+        from weio.wetb.hawc2.Hawc2io import ReadHawc2
+        F = HAWC2DatFile(os.path.join(MyDir,'HAWC2_out_bin.dat'))
+        # --- Reading a subset of channels, time is kept first
+        F2 = HAWC2DatFile(os.path.join(MyDir,'HAWC2_out_bin.dat'), channels=[5, 3])
+        self.assertEqual(F2.info['attribute_names'], [F.info['attribute_names'][i] for i in [0,5,3]])
+        np.testing.assert_equal(F2.data, F.data[:,[0,5,3]])
+        # --- Channels accessed lazily from the memory-mapped file
+        res = ReadHawc2(os.path.join(MyDir,'HAWC2_out_bin.sel'))
+        self.assertEqual(res.MemmapBinary().shape, F.data.shape)
+        np.testing.assert_equal(res([3,1]), F.data[:,[3,1]])
+        np.testing.assert_equal(res(), F.data)
+        # --- Ascii, channels read are stored
+        res = ReadHawc2(os.path.join(MyDir,'HAWC2_out_ascii.sel'))
+        F = HAWC2DatFile(os.path.join(MyDir,'HAWC2_out_ascii.dat'))
+        np.testing.assert_equal(res([3,1]), F.data[:,[3,1]])
+        np.testing.assert_equal(res([1,2,3]), F.data[:,[1,2,3]])
+        self.assertEqual(sorted(res.Iknown), [1,2,3])
+
+    def test_HAWC2_channel_index(self):
+        # --- Channel index from typical HAWC2 sensor descriptions
+        F = HAWC2DatFile()
+        F.info['attribute_names'] = ['Time', 'Mx coo: blade1', 'Fx coo: blade1', 'Mx coo: blade1', 'Mz coo: tower']
+        F.info['attribute_units'] = ['s', 'kNm', 'kN', 'kNm', 'kNm']
+        F.info['attribute_descr'] = ['Time', 'MomentMx Mbdy:blade1 nodenr:   3 coo: blade1  blade 1 root', 
+                'Force_intp Fx Mbdy:blade1 s=  30.00[m] s/S=   0.346 coo: blade1 ', 
+                'Moment_intp Mx Mbdy:blade1 s=  40.00[m] s/S=   0.461 coo: blade1 ', 
+                'MomentMz Mbdy:tower E-nr:   2 Z-rel:0.50 coo: tower']
+        idx = F.channelIndex
+        self.assertEqual(list(idx['mbdy']), ['', 'blade1', 'blade1', 'blade1', 'tower'])
+        self.assertEqual(list(idx['node']), [-1, 3, -1, -1, -1])
+        self.assertEqual(list(idx['elem']), [-1, -1, -1, -1, 2])
+        self.assertEqual(list(idx['label']), ['Time', 'blade1N3Mxb', 'blade1r0.346Fxb', 'blade1r0.461Mxb', 'towerN2.5Mzb'])
+        np.testing.assert_equal(F.findChannels(quantity='Mx', mbdy='blade1'), [1, 3])
+        np.testing.assert_equal(F.findChannels(quantity='Mx', mbdy='blade1', rmin=30), [3])
+        np.testing.assert_equal(F.findChannels(coo='tower'), [4])
+        # --- Query fed into selective reading
+        H = HAWC2DatFile(os.path.join(MyDir,'HAWC2_out_bin.sel'), header_only=True)
+        I = H.findChannels(quantity='WSP*')
+        self.assertEqual(len(I), 27)
+        F = HAWC2DatFile(os.path.join(MyDir,'HAWC2_out_bin.sel'), channels=I[-2:])
+        self.assertEqual(F.data.shape[1], 3)
+
+    def test_HAWC2_ascii_methods(self):
+        # --- The ascii parsers give the same results
+        from weio.wetb.hawc2.Hawc2io import ReadAsciiTable, AsciiLayout
+        for filename in ['HAWC2_out_ascii.dat', 'BHAWC_out_ascii.dat', 'BHAWC_out_ascii1.dat']:
+            filename = os.path.join(MyDir, filename)
+            ref = np.loadtxt(filename)
+            nCols = ref.shape[1]
+            for usecols in [None, [nCols-1, 0]]:
+                R = ref if usecols is None else ref[:,usecols]
+                np.testing.assert_equal(ReadAsciiTable(filename, usecols, method='fixed'), R)
+                np.testing.assert_equal(ReadAsciiTable(filename, usecols, method='numpy', workers=3), R)
+                np.testing.assert_equal(ReadAsciiTable(filename, usecols, method='fixed', workers=2), R)
+        self.assertEqual(AsciiLayout(filename)[:2], (187, 20))
+        np.testing.assert_equal(AsciiLayout(filename)[3], 16+17*np.arange(11))
+        self.assertTrue(AsciiLayout(os.path.join(MyDir, 'FASTOut.out')) is None)
+        with self.assertRaises(ValueError):
+            ReadAsciiTable(filename, method='pandas')
+        F = HAWC2DatFile(os.path.join(MyDir,'HAWC2_out_ascii.dat'), channels=[3], workers=2)
+        np.testing.assert_equal(F.data, np.loadtxt(os.path.join(MyDir,'HAWC2_out_ascii.dat'), usecols=[0,3]))
+
     def test_HAWC2_st(self):
         # --- not FPM
         F=HAWC2StFile(os.path.join(MyDir,'HAWC2_st.st'))
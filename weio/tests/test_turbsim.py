@@ -33,6 +33,135 @@ class Test(unittest.TestCase):
         np.testing.assert_almost_equal(F['u'][1,:,:,:],F2['u'][1,:,:,:],3)
         np.testing.assert_almost_equal(F['u'][2,:,:,:],F2['u'][2,:,:,:],3)
 
+    def test_TurbSim_mmap(self):
+        # --- Memory-mapped file, dequantized on access
+        F = TurbSimFile(os.path.join(MyDir,'TurbSim_WithTwr.bts'))
+        M = TurbSimFile(os.path.join(MyDir,'TurbSim_WithTwr.bts'), mmap=True)
+        self.assertEqual(M['u'].shape, (3,100,3,4))
+        self.assertEqual(M['u'][0,:,1,1].dtype, np.float32)
+        np.testing.assert_allclose(np.asarray(M['u']), F['u'], rtol=1e-6)
+        np.testing.assert_allclose(M['uTwr'][0, 4, :], [6.1509, 6.4063, 8.9555, 7.6943], atol=1e-4)
+        np.testing.assert_allclose(M.valuesAt(y=0, z=90)[2], F.valuesAt(y=0, z=90)[2], rtol=1e-6)
+        self.assertEqual(M['u'].records.shape, (100,))
+        # Same dequantization as the in-memory reading with float64
+        M = TurbSimFile(os.path.join(MyDir,'TurbSim_WithTwr.bts'), mmap=True, dtype=np.float64)
+        np.testing.assert_equal(M['u'][:,3:5,:,2], F['u'][:,3:5,:,2])
+        np.testing.assert_equal(M['u'].toArray(), F['u'])
+        with self.assertRaises(TypeError):
+            M['u'][0,:,0,0] = 0
+        # NumPy 2 protocol: the field cannot be converted without a copy
+        self.assertEqual(M['u'].__array__(np.float32, copy=True).dtype, np.float32)
+        with self.assertRaises(ValueError):
+            M['u'].__array__(copy=False)
+
+    def test_TurbSim_subset(self):
+        # --- Reading a time window, a vertical plane and two components
+        F = TurbSimFile(os.path.join(MyDir,'TurbSim_WithTwr.bts'))
+        for mmap in [False, True]:
+            S = TurbSimFile(os.path.join(MyDir,'TurbSim_WithTwr.bts'), mmap=mmap, dtype=np.float64, 
+                    t_range=(1,2), y_range=0, z_range=(70, 120), components=['u','w'])
+            self.assertEqual(S['u'].shape, (2, 21, 1, 3))
+            self.assertEqual(S['uTwr'].shape, (2, 21, 4))
+            self.assertEqual(S['components'], [0, 2])
+            np.testing.assert_almost_equal(S['t'][[0,-1]], [1, 2])
+            np.testing.assert_equal(S['y'], [0])
+            np.testing.assert_equal(S['z'], F['z'][1:])
+            u, v, w = S.valuesAt(y=0, z=90)
+            self.assertTrue(v is None)
+            np.testing.assert_equal(u, F['u'][0,20:41,1,2])
+            np.testing.assert_equal(w, F['u'][2,20:41,1,2])
+            u, v, w = S.verticalPlane()
+            np.testing.assert_equal(w, F['u'][2,20:41,1,1:])
+            u, v, w = S.horizontalPlane(z=90)
+            np.testing.assert_equal(u, F['u'][0,20:41,1:2,2])
+            u, v, w = S._longiline(removeMean=True)
+            np.testing.assert_almost_equal(np.mean(u), 0)
+            np.testing.assert_equal(S['uTwr'][1], F['uTwr'][2,20:41])
+        with self.assertRaises(ValueError):
+            TurbSimFile(os.path.join(MyDir,'TurbSim_WithTwr.bts'), t_range=(100,200))
+        # --- Only w: components are reported by name, u-based quantities are not available
+        S = TurbSimFile(os.path.join(MyDir,'TurbSim_WithTwr.bts'), components=['w'])
+        self.assertTrue('uz: min' in repr(S))
+        self.assertFalse('ux: min' in repr(S))
+        self.assertFalse('uMid' in repr(S))
+        dfs = S.toDataFrame()
+        self.assertEqual(list(dfs['ZMidLine'].columns), ['t_[s]', 'w_[m/s]'])
+        self.assertEqual(list(dfs['VertProfile'].columns), ['z_[m]', 'w_[m/s]', 'sigma_w_[m/s]'])
+        self.assertEqual(list(dfs['Mid_xcorr_y'].columns), ['y_[m]', 'rho_ww_[-]'])
+        np.testing.assert_equal(dfs['ZMidLine']['w_[m/s]'].values, F.toDataFrame()['ZMidLine']['w_[m/s]'].values)
+        with self.assertRaises(ValueError):
+            S.midValues()
+
+    def test_TurbSim_write_streaming(self):
+        # --- Writing from an array, a memory-mapped file or a generator of chunks give the same file
+        from weio.turbsim_file import writeTurbSim
+        F = TurbSimFile(os.path.join(MyDir,'TurbSim_NoTwr.bts'))
+        M = TurbSimFile(os.path.join(MyDir,'TurbSim_NoTwr.bts'), mmap=True, dtype=np.float64)
+        dt = F['t'][1]-F['t'][0]
+        u  = F['u']
+        tempFilenames = ['_TurbSim_TMP{}.bts'.format(i) for i in range(3)]
+        writeTurbSim(tempFilenames[0], u, F['y'], F['z'], dt, chunkSize=1000)
+        writeTurbSim(tempFilenames[1], M['u'], F['y'], F['z'], dt, chunkSize=3000)
+        writeTurbSim(tempFilenames[2], (u[:,it:it+7] for it in range(0, u.shape[1], 7)), F['y'], F['z'], dt)
+        contents = []
+        for filename in tempFilenames:
+            with open(filename, 'rb') as f:
+                contents.append(f.read())
+            F2 = TurbSimFile(filename)
+            np.testing.assert_almost_equal(F2['u'], F['u'], 4)
+            os.remove(filename)
+        self.assertEqual(contents[0], contents[1])
+        self.assertEqual(contents[0], contents[2])
+        self.assertFalse(os.path.exists(tempFilenames[2]+'.spool'))
+        # --- The spool file is removed when the chunks are invalid or empty
+        with self.assertRaises(ValueError):
+            writeTurbSim(tempFilenames[2], (u[:,it:it+7,1:] for it in range(0, u.shape[1], 7)), F['y'], F['z'], dt)
+        self.assertFalse(os.path.exists(tempFilenames[2]+'.spool'))
+        with self.assertRaises(ValueError):
+            writeTurbSim(tempFilenames[2], iter([]), F['y'], F['z'], dt)
+        self.assertFalse(os.path.exists(tempFilenames[2]+'.spool'))
+        # --- Chunks of different dtypes, or a tower of a different length: nothing is written
+        with self.assertRaises(ValueError):
+            writeTurbSim(tempFilenames[2], (u[:,it:it+7].astype(np.float32 if it==0 else np.float64) for it in range(0, u.shape[1], 7)), F['y'], F['z'], dt)
+        with self.assertRaises(ValueError):
+            writeTurbSim(tempFilenames[2], (u[:,it:it+7] for it in range(0, u.shape[1], 7)), F['y'], F['z'], dt, uTwr=np.zeros((3, 2, 1)))
+        self.assertFalse(os.path.exists(tempFilenames[2]))
+        self.assertFalse(os.path.exists(tempFilenames[2]+'.spool'))
+
+    def test_TurbSim_spectra(self):
+        # --- Batched spectra and correlations
+        from weio.turbsim_file import csd
+        F = TurbSimFile(os.path.join(MyDir,'TurbSim_FAST.bts'))
+        iy0, iz0 = F.iMid
+        out = F.crossSpectra(chunkSize=1000)
+        ny, nz = len(F['y']), len(F['z'])
+        self.assertEqual(out['coh'].shape, (3, ny*nz, len(out['f'])))
+        # Auto coherence and correlation of the reference point
+        iRef = iy0*nz+iz0
+        np.testing.assert_almost_equal(out['coh'][:,iRef,:], 1)
+        np.testing.assert_almost_equal(out['rho'][:,iRef], 1)
+        np.testing.assert_almost_equal(out['S_pp'][:,iRef,:], out['S_00'])
+        # Correlation compared to the time domain
+        u0 = F['u'][1,:,iy0,iz0]-np.mean(F['u'][1,:,iy0,iz0])
+        u1 = F['u'][1,:,0,1]-np.mean(F['u'][1,:,0,1])
+        np.testing.assert_almost_equal(out['rho'][1,1], np.mean(u0*u1)/(np.std(u0)*np.std(u1)))
+        # Spectra compared to scipy, with odd and even segment lengths
+        import scipy.signal as sig
+        x = np.random.normal(size=(2, 1000))
+        y = np.random.normal(size=(2, 1000))
+        for nperseg in [255, 256]:
+            f1, S1 = sig.csd(x, y, fs=2, nperseg=nperseg)
+            f2, S2 = csd(x, y, fs=2, nperseg=nperseg)
+            np.testing.assert_almost_equal(f1, f2)
+            np.testing.assert_almost_equal(S1, S2)
+        y, rho_uu, rho_vv, rho_ww = F.crosscorr_y()
+        np.testing.assert_almost_equal(rho_uu, out['rho'][0, iz0::nz])
+        fc, dy, coh_y, dz, coh_z = F.coherence_longi()
+        np.testing.assert_almost_equal(coh_z[2], out['coh'][2, iy0*nz:(iy0+1)*nz])
+        self.assertEqual(dy[iy0], 0)
+        fc, chi_uu, chi_vv, chi_ww = F.csd_longi()
+        np.testing.assert_almost_equal(chi_vv, out['S_00'][1])
+
 if __name__ == '__main__':
 #     Test().test_000_debug()
     unittest.main()
@@ -26,12 +26,17 @@ class TurbSimFile(File):
     - 'dt', 'ID', 'info'
     - 'zTwr', 'uTwr': tower coordinates and field if present (3 x nt x nTwr)
     - 'zRef', 'uRef': height and velocity at a reference point (usually not hub)
+    - 'components': indices of the components in 'u' (only when a subset of components was read)
+
+    When read with `mmap=True`, 'u' and 'uTwr' are `TurbSimField` objects: the int16 records of 
+    the file are memory-mapped and dequantized on access (e.g. ts['u'][0,:,iy,iz]).
 
     Main methods
     ------------
     - read, write, toDataFrame, keys
     - valuesAt, vertProfile, horizontalPlane, verticalPlane, closestPoint
     - fitPowerLaw
+    - crossSpectra, crosscorr_y, crosscorr_z, csd_longi, csd_lat, csd_vert, coherence_longi
     - makePeriodic, checkPeriodic
 
     Examples
@@ -42,6 +47,9 @@ class TurbSimFile(File):
         print(ts['u'].shape)  
         u,v,w = ts.valuesAt(y=10.5, z=90)
 
+        ts = TurbSimFile('Turb.bts', mmap=True) # nothing is read but the header
+        u,v,w = ts.valuesAt(y=10.5, z=90)       # only this point is dequantized (float32)
+
 
     """
 
@@ -53,15 +61,29 @@ class TurbSimFile(File):
     def formatName():
         return 'TurbSim binary'
 
+    @staticmethod
+    def sniff(header):
+        # File starts with the ID (int16): 7 (non periodic) or 8 (periodic)
+        return len(header)>=2 and struct.unpack('<h', header[:2])[0] in [7, 8]
+
     def __init__(self,filename=None, **kwargs):
         self.filename = None
         if filename:
             self.read(filename, **kwargs)
 
-    def read(self, filename=None, header_only=False):
+    def read(self, filename=None, header_only=False, mmap=False, dtype=None, t_range=None, y_range=None, z_range=None, components=None):
         """ read BTS file, with field: 
                      u    (3 x nt x ny x nz)
                      uTwr (3 x nt x nTwr)
+        INPUTS:
+          - header_only: if True, only the header is read (no 'u' and 'uTwr')
+          - mmap: if True, the file is memory-mapped and the fields 'u' and 'uTwr' are `TurbSimField`
+                  objects, dequantized on access. Otherwise the fields are dequantized in memory.
+          - dtype: dtype of the dequantized fields. Default: float32 if mmap, float64 otherwise.
+          - t_range, y_range, z_range: subset of the box to read. Either a (min, max) tuple (bounds included)
+                  or a scalar, in which case the closest point is selected. Tower points are not filtered.
+          - components: subset of components to read, e.g. [0, 2] or ['u', 'w']
+        Only the time records and grid points selected are read from the file.
         """
         if filename:
             self.filename = filename
@@ -80,95 +102,73 @@ class TurbSimFile(File):
             scl[0],off[0],scl[1],off[1],scl[2],off[2] = struct.unpack('<6f' , f.read(6*4))
             nChar, = struct.unpack('<l',  f.read(4))
             info = (f.read(nChar)).decode()
-            # Reading turbulence field
-            if not header_only: 
-                u    = np.zeros((3,nt,ny,nz))
-                uTwr = np.zeros((3,nt,nTwr))
-                # For loop on time (acts as buffer reading, and only possible way when nTwr>0)
-                for it in range(nt):
-                    Buffer = np.frombuffer(f.read(2*3*ny*nz), dtype=np.int16).astype(np.float32).reshape([3, ny, nz], order='F')
-                    u[:,it,:,:]=Buffer
-                    Buffer = np.frombuffer(f.read(2*3*nTwr), dtype=np.int16).astype(np.float32).reshape([3, nTwr], order='F')
-                    uTwr[:,it,:]=Buffer
-                u -= off[:, None, None, None]
-                u /= scl[:, None, None, None]
+            offset = f.tell()
+        t = np.arange(nt)*dt
+        y = np.arange(ny)*dy 
+        y-= np.mean(y) # y always centered on 0
+        z = np.arange(nz)*dz +zBottom
+        # Subset of the box
+        It = _rangeSlice(t, t_range, 't')
+        Iy = _rangeSlice(y, y_range, 'y')
+        Iz = _rangeSlice(z, z_range, 'z')
+        Ic = _componentSlice(components)
+        # Reading turbulence field
+        if not header_only: 
+            records = np.memmap(self.filename, dtype=recordDtype(ny, nz, nTwr), mode='r', offset=offset, shape=(nt,))
+            u    = TurbSimField(records['u'][It, Iz, Iy, Ic], off[Ic], scl[Ic], dtype=np.float32 if dtype is None else dtype)
+            uTwr = TurbSimField(records['twr'][It, :, Ic]   , off[Ic], scl[Ic], dtype=np.float32 if dtype is None else dtype)
+            u.records    = records
+            uTwr.records = records
+            if mmap:
                 self['u']    = u
-                uTwr -= off[:, None, None]
-                uTwr /= scl[:, None, None]
                 self['uTwr'] = uTwr
+            else:
+                self['u']    = u.toArray(dtype=np.float64 if dtype is None else dtype)
+                self['uTwr'] = uTwr.toArray(dtype=np.float64 if dtype is None else dtype)
+                del u, uTwr, records
         self['info'] = info
         self['ID']   = ID
         self['dt']   = dt
-        self['y']    = np.arange(ny)*dy 
-        self['y']   -= np.mean(self['y']) # y always centered on 0
-        self['z']    = np.arange(nz)*dz +zBottom
-        self['t']    = np.arange(nt)*dt
+        self['y']    = y[Iy]
+        self['z']    = z[Iz]
+        self['t']    = t[It]
         self['zTwr'] =-np.arange(nTwr)*dz + zBottom
+        if list(range(3)[Ic]) != [0,1,2]:
+            self['components'] = list(range(3)[Ic])
         self['zRef'] = zHub
         self['uRef'] = uHub
 
-    def write(self, filename=None):
+    def write(self, filename=None, chunkSize=2**26):
         """ 
         write a BTS file, using the following keys: 'u','z','y','t','uTwr'
                      u    (3 x nt x ny x nz)
                      uTwr (3 x nt x nTwr)
+        'u' may also be a memmap, a TurbSimField or a generator of time chunks (see `writeTurbSim`).
+        The field is quantized and written by chunks of about `chunkSize` bytes.
         """
         if filename:
             self.filename = filename
         if not self.filename:
             raise Exception('No filename provided')
+        if self.get('components', [0,1,2]) != [0,1,2]:
+            raise Exception('Cannot write a TurbSim file with a subset of the components')
 
-        nDim, nt, ny, nz = self['u'].shape
-        if 'uTwr' not in self.keys() :
-            self['uTwr']=np.zeros((3,nt,0))
+        arrayLike = hasattr(self['u'], 'shape')
+        if 'uTwr' not in self.keys() and arrayLike:
+            self['uTwr']=np.zeros((3,self['u'].shape[1],0))
         if 'ID' not in self.keys() :
             self['ID']=7
-
-        _, _, nTwr = self['uTwr'].shape
-        tsTwr  = self['uTwr']
-        ts     = self['u']
-        intmin = -32768
-        intrng = 65535
-        off    = np.empty((3), dtype    = np.float32)
-        scl    = np.empty((3), dtype    = np.float32)
         info = 'Generated by TurbSimFile on {:s}.'.format(time.strftime('%d-%b-%Y at %H:%M:%S', time.localtime()))
-        # Calculate scaling, offsets and scaling data
-        out    = np.empty(ts.shape, dtype=np.int16)
-        outTwr = np.empty(tsTwr.shape, dtype=np.int16)
-        for k in range(3):
-            all_min, all_max = ts[k].min(), ts[k].max()
-            if nTwr>0:
-                all_min=min(all_min, tsTwr[k].min())
-                all_max=max(all_max, tsTwr[k].max())
-            if all_min == all_max:
-                scl[k] = 1
-            else:
-                scl[k] = intrng / (all_max-all_min)
-            off[k]    = intmin - scl[k] * all_min
-            out[k]    = (ts[k]    * scl[k] + off[k]).astype(np.int16)
-            outTwr[k] = (tsTwr[k] * scl[k] + off[k]).astype(np.int16)
-        z0 = self['z'][0]
-        dz = self['z'][1]- self['z'][0]
-        dy = self['y'][1]- self['y'][0]
-        dt = self['t'][1]- self['t'][0]
+        dt = self['t'][1]- self['t'][0] if len(self['t'])>1 else self['dt']
 
         # Providing estimates of uHub and zHub even if these fields are not used
-        zHub,uHub, bHub = self.hubValues()
+        if arrayLike:
+            zHub,uHub, bHub = self.hubValues()
+        else:
+            zHub, uHub = self.get('zRef', None), self.get('uRef', None)
 
-        with open(self.filename, mode='wb') as f:            
-            f.write(struct.pack('<h4l', self['ID'], nz, ny, nTwr, nt))
-            f.write(struct.pack('<6f', dz, dy, dt, uHub, zHub, z0)) # NOTE uHub, zHub maybe not used
-            f.write(struct.pack('<6f', scl[0],off[0],scl[1],off[1],scl[2],off[2]))
-            f.write(struct.pack('<l' , len(info)))
-            f.write(info.encode())
-            try:
-                for it in np.arange(nt):
-                    f.write(out[:,it,:,:].tobytes(order='F'))
-                    f.write(outTwr[:,it,:].tobytes(order='F'))
-            except:
-                for it in np.arange(nt):
-                    f.write(out[:,it,:,:].tostring(order='F'))
-                    f.write(outTwr[:,it,:].tostring(order='F'))
+        writeTurbSim(self.filename, self['u'], self['y'], self['z'], dt, uTwr=self.get('uTwr', None), ID=self['ID'],
+                zHub=zHub, uHub=uHub, info=info, chunkSize=chunkSize)
 
     # --------------------------------------------------------------------------------}
     # --- Convenient properties (matching Mann Box interface as well)
@@ -185,13 +185,26 @@ class TurbSimFile(File):
     # --------------------------------------------------------------------------------}
     # --- Extracting relevant "Line" data at one point
     # --------------------------------------------------------------------------------{
+    def _iComp(self, component):
+        """ index in 'u' of a component (0, 1, 2 or 'u', 'v', 'w'), for a box where only a subset 
+        of the components was read (see `read`) """
+        ic = 'uvw'.index(component) if isinstance(component, str) else int(component)
+        comps = self.get('components', [0,1,2])
+        if ic not in comps:
+            raise ValueError('Component {} was not read, components available: {}'.format('uvw'[ic], ['uvw'[c] for c in comps]))
+        return comps.index(ic)
+
+    def _uvw(self, *index):
+        """ return the velocity components at the given (time and space) indices
+        Components that were not read (see `read`) are returned as None """
+        comps = self.get('components', [0,1,2])
+        return tuple(self['u'][(comps.index(ic),)+index] if ic in comps else None for ic in range(3))
+
     def valuesAt(self, y, z, method='nearest'):
         """ return wind speed time series at a point """
         if method == 'nearest':
             iy, iz = self.closestPoint(y, z)
-            u = self['u'][0,:,iy,iz]
-            v = self['u'][1,:,iy,iz]
-            w = self['u'][2,:,iy,iz]
+            u, v, w = self._uvw(slice(None), iy, iz)
         else:
             raise NotImplementedError()
         return u, v, w
@@ -217,14 +230,14 @@ class TurbSimFile(File):
         except:
             iz = np.argmin(np.abs(self['z']-zHub))
             iy = np.argmin(np.abs(self['y']-(self['y'][0]+self['y'][-1])/2))
-            uHub = np.mean(self['u'][0,:,iy,iz])
+            uHub = np.mean(self['u'][self._iComp(0),:,iy,iz])
         return zHub, uHub, bHub
 
     def midValues(self):
         iy,iz = self.iMid
         zMid = self['z'][iz]
         #yMid = self['y'][iy] # always 0
-        uMid = np.mean(self['u'][0,:,iy,iz])
+        uMid = np.mean(self['u'][self._iComp(0),:,iy,iz])
         return zMid, uMid
 
     @property
@@ -244,13 +257,9 @@ class TurbSimFile(File):
         """
         if iy0 is None:
             iy0,iz0 = ts.iMid
-        u = ts['u'][0,:,iy0,iz0]
-        v = ts['u'][1,:,iy0,iz0]
-        w = ts['u'][2,:,iy0,iz0]
+        u, v, w = ts._uvw(slice(None), iy0, iz0)
         if removeMean:
-            u -= np.mean(u)
-            v -= np.mean(v)
-            w -= np.mean(w)
+            u, v, w = [None if c is None else c-np.mean(c) for c in (u, v, w)]
         return u, v, w
 
     def _latline(ts, ix0=None, iz0=None, removeMean=False):
@@ -260,13 +269,9 @@ class TurbSimFile(File):
         if ix0 is None:
             iy0,iz0 = ts.iMid
             ix0=int(len(ts['t'])/2)
-        u = ts['u'][0,ix0,:,iz0]
-        v = ts['u'][1,ix0,:,iz0]
-        w = ts['u'][2,ix0,:,iz0]
+        u, v, w = ts._uvw(ix0, slice(None), iz0)
         if removeMean:
-            u -= np.mean(u)
-            v -= np.mean(v)
-            w -= np.mean(w)
+            u, v, w = [None if c is None else c-np.mean(c) for c in (u, v, w)]
         return u, v, w
 
     def _vertline(ts, ix0=None, iy0=None, removeMean=False):
@@ -276,13 +281,9 @@ class TurbSimFile(File):
         if ix0 is None:
             iy0,iz0 = ts.iMid
             ix0=int(len(ts['t'])/2)
-        u = ts['u'][0,ix0,iy0,:]
-        v = ts['u'][1,ix0,iy0,:]
-        w = ts['u'][2,ix0,iy0,:]
+        u, v, w = ts._uvw(ix0, iy0, slice(None))
         if removeMean:
-            u -= np.mean(u)
-            v -= np.mean(v)
-            w -= np.mean(w)
+            u, v, w = [None if c is None else c-np.mean(c) for c in (u, v, w)]
         return u, v, w
 
     # --------------------------------------------------------------------------------}
@@ -297,13 +298,9 @@ class TurbSimFile(File):
         elif z is not None:
             _, iz0 = ts.closestPoint(ts.y[0], z) 
 
-        u = ts['u'][0,:,:,iz0]
-        v = ts['u'][1,:,:,iz0]
-        w = ts['u'][2,:,:,iz0]
+        u, v, w = ts._uvw(slice(None), slice(None), iz0)
         if removeMean:
-            u -= np.mean(u)
-            v -= np.mean(v)
-            w -= np.mean(w)
+            u, v, w = [None if c is None else c-np.mean(c) for c in (u, v, w)]
         return u, v, w
 
     def verticalPlane(ts, y=None, iy0=None, removeMean=False):
@@ -315,13 +312,9 @@ class TurbSimFile(File):
         elif y is not None:
             iy0, _ = ts.closestPoint(y, ts.z[0]) 
 
-        u = ts['u'][0,:,iy0,:]
-        v = ts['u'][1,:,iy0,:]
-        w = ts['u'][2,:,iy0,:]
+        u, v, w = ts._uvw(slice(None), iy0, slice(None))
         if removeMean:
-            u -= np.mean(u)
-            v -= np.mean(v)
-            w -= np.mean(w)
+            u, v, w = [None if c is None else c-np.mean(c) for c in (u, v, w)]
         return u, v, w
 
     # --------------------------------------------------------------------------------}
@@ -332,6 +325,8 @@ class TurbSimFile(File):
         INPUTS:
          - y_span: if 'full', average the vertical profile accross all y-values
                    if 'mid', average the vertical profile at the middle y value
+        OUTPUTS:
+         - z, m, s: heights, mean and standard deviation (nc x nz) of the components read
         """
         if y_span=='full':
             m = np.mean(np.mean(self['u'][:,:,:,:], axis=1), axis=1)
@@ -348,6 +343,66 @@ class TurbSimFile(File):
     # --------------------------------------------------------------------------------}
     # --- Computation of useful quantities
     # --------------------------------------------------------------------------------{
+    def crossSpectra(ts, iy=None, iz=None, iy0=None, iz0=None, spectra=True, nperseg=256, noverlap=None, chunkSize=2**26):
+        """ 
+        Auto and cross spectral densities, coherence and correlation between a reference point (iy0, iz0)
+        and many points of the grid, for all the components read. 
+        The time series of the points are processed by chunks (bounded by `chunkSize` bytes), 
+        and the Welch segments of each chunk are transformed at once (rfft along time, see `welchFFT`).
+        If no reference index is provided, the reference is the middle of the box.
+
+        INPUTS:
+         - iy, iz: indices of the points, arrays of same length. Default: all the points of the grid
+         - spectra: if False, only the correlation is computed
+         - nperseg, noverlap: Welch segments, see `csd`
+        OUTPUTS: dictionary with keys:
+         - 'iy', 'iz': indices of the points (nP)
+         - 'rho' : correlation coefficient between the reference and the points (nc x nP)
+         - 'f'   : frequencies (nf)
+         - 'S_00': auto spectral density of the reference point (nc x nf)
+         - 'S_pp': auto spectral densities of the points (nc x nP x nf)
+         - 'S_0p': cross spectral densities between the reference and the points (nc x nP x nf)
+         - 'coh' : coherence between the reference and the points, |S_0p|^2/(S_00 S_pp) (nc x nP x nf)
+        """
+        if iy0 is None:
+            iy0,iz0 = ts.iMid
+        if iy is None:
+            iy, iz = np.meshgrid(np.arange(len(ts['y'])), np.arange(len(ts['z'])), indexing='ij')
+        iy, iz = np.asarray(iy).ravel(), np.asarray(iz).ravel()
+        nP = len(iy)
+        fs = 1/(ts['t'][1]-ts['t'][0])
+        # Reference point
+        u0 = np.asarray(ts['u'][:,:,iy0,iz0], dtype=np.float64)  # nc x nt
+        u0 = u0 - np.mean(u0, axis=1)[:,None]
+        std0 = np.std(u0, axis=1)
+        nc, nt = u0.shape
+        out = {'iy':iy, 'iz':iz, 'rho':np.zeros((nc, nP))}
+        if spectra:
+            out['f'], X0 = welchFFT(u0, fs=fs, nperseg=nperseg, noverlap=noverlap) # nc x nSeg x nf
+            nf = len(out['f'])
+            out['S_00'] = np.mean(np.abs(X0)**2, axis=-2)
+            out['S_pp'] = np.zeros((nc, nP, nf))
+            out['S_0p'] = np.zeros((nc, nP, nf), dtype=complex)
+        # --- Chunks of points
+        nChunk = max(int(chunkSize/(nc*nt*8*3)), 1)
+        for i0 in range(0, nP, nChunk):
+            I = slice(i0, min(i0+nChunk, nP))
+            ud = np.asarray(ts['u'][:,:,iy[I],iz[I]], dtype=np.float64) # nc x nt x nChunk
+            ud = ud - np.mean(ud, axis=1)[:,None,:]
+            out['rho'][:,I] = np.einsum('ct,ctp->cp', u0, ud)/nt/(std0[:,None]*np.std(ud, axis=1))
+            if spectra:
+                _, Xp = welchFFT(ud, fs=fs, nperseg=nperseg, noverlap=noverlap, axis=1) # nc x nChunk x nSeg x nf
+                out['S_pp'][:,I] = np.mean(np.abs(Xp)**2, axis=-2)
+                out['S_0p'][:,I] = np.mean(np.conj(X0[:,None])*Xp, axis=-2)
+        if spectra:
+            out['coh'] = np.abs(out['S_0p'])**2/(out['S_00'][:,None,:]*out['S_pp'])
+        return out
+
+    def _perComponent(ts, values):
+        """ split an array (nc x ...) into u, v, w values, None for components not read"""
+        comps = ts.get('components', [0,1,2])
+        return tuple(values[comps.index(ic)] if ic in comps else None for ic in range(3))
+
     def crosscorr_y(ts, iy0=None, iz0=None):
         """ Cross correlation along y
         If no index is provided, computed at mid box 
@@ -355,15 +410,9 @@ class TurbSimFile(File):
         y = ts['y']
         if iy0 is None:
             iy0,iz0 = ts.iMid
-        u, v, w = ts._longiline(iy0=iy0, iz0=iz0, removeMean=True)
-        rho_uu_y=np.zeros(len(y))
-        rho_vv_y=np.zeros(len(y))
-        rho_ww_y=np.zeros(len(y))
-        for iy,_ in enumerate(y):
-            ud, vd, wd = ts._longiline(iy0=iy, iz0=iz0, removeMean=True)
-            rho_uu_y[iy] = np.mean(u*ud)/(np.std(u)*np.std(ud))
-            rho_vv_y[iy] = np.mean(v*vd)/(np.std(v)*np.std(vd))
-            rho_ww_y[iy] = np.mean(w*wd)/(np.std(w)*np.std(wd))
+        iy = np.arange(len(y))
+        out = ts.crossSpectra(iy, np.full(len(y), iz0), iy0=iy0, iz0=iz0, spectra=False)
+        rho_uu_y, rho_vv_y, rho_ww_y = ts._perComponent(out['rho'])
         return y, rho_uu_y, rho_vv_y, rho_ww_y
 
     def crosscorr_z(ts, iy0=None, iz0=None):
@@ -374,97 +423,58 @@ class TurbSimFile(File):
         z = ts['z']
         if iy0 is None:
             iy0,iz0 = ts.iMid
-        u, v, w = ts._longiline(iy0=iy0, iz0=iz0, removeMean=True)
-        rho_uu_z = np.zeros(len(z))
-        rho_vv_z = np.zeros(len(z))
-        rho_ww_z = np.zeros(len(z))
-        for iz,_ in enumerate(z):
-            ud, vd, wd = ts._longiline(iy0=iy0, iz0=iz, removeMean=True)
-            rho_uu_z[iz] = np.mean(u*ud)/(np.std(u)*np.std(ud))
-            rho_vv_z[iz] = np.mean(v*vd)/(np.std(v)*np.std(vd))
-            rho_ww_z[iz] = np.mean(w*wd)/(np.std(w)*np.std(wd))
+        iz = np.arange(len(z))
+        out = ts.crossSpectra(np.full(len(z), iy0), iz, iy0=iy0, iz0=iz0, spectra=False)
+        rho_uu_z, rho_vv_z, rho_ww_z = ts._perComponent(out['rho'])
         return z, rho_uu_z, rho_vv_z, rho_ww_z
 
+    def _csd_line(ts, u, v, w):
+        """ Spectral density of the components of a line, all components at once"""
+        t       = ts['t']
+        dt      = t[1]-t[0]
+        fs      = 1/dt
+        comps = [c for c in (u, v, w) if c is not None]
+        fc, chi = csd(np.array(comps), fs=fs)
+        chi_uu, chi_vv, chi_ww = ts._perComponent(np.real(chi))
+        return fc, chi_uu, chi_vv, chi_ww
 
     def csd_longi(ts, iy0=None, iz0=None):
         """ Compute cross spectral density
         If no index is provided, computed at mid box 
         """
-        import scipy.signal as sig
-        u, v, w = ts._longiline(iy0=iy0, iz0=iz0, removeMean=True)
-        t       = ts['t']
-        dt      = t[1]-t[0]
-        fs      = 1/dt
-        fc, chi_uu = sig.csd(u, u, fs=fs, scaling='density') #nperseg=4096, noverlap=2048, detrend='constant')
-        fc, chi_vv = sig.csd(v, v, fs=fs, scaling='density') #nperseg=4096, noverlap=2048, detrend='constant')
-        fc, chi_ww = sig.csd(w, w, fs=fs, scaling='density') #nperseg=4096, noverlap=2048, detrend='constant')
-        return fc, chi_uu, chi_vv, chi_ww
+        return ts._csd_line(*ts._longiline(iy0=iy0, iz0=iz0, removeMean=True))
 
     def csd_lat(ts, ix0=None, iz0=None):
         """ Compute lateral cross spectral density
         If no index is provided, computed at mid box 
         """
-        try:
-            import scipy.signal as sig
-        except:
-            import pydatview.tools.spectral as sig
-        u, v, w = ts._latline(ix0=ix0, iz0=iz0, removeMean=True)
-        t       = ts['t']
-        dt      = t[1]-t[0]
-        fs      = 1/dt
-        fc, chi_uu = sig.csd(u, u, fs=fs, scaling='density') #nperseg=4096, noverlap=2048, detrend='constant')
-        fc, chi_vv = sig.csd(v, v, fs=fs, scaling='density') #nperseg=4096, noverlap=2048, detrend='constant')
-        fc, chi_ww = sig.csd(w, w, fs=fs, scaling='density') #nperseg=4096, noverlap=2048, detrend='constant')
-        return fc, chi_uu, chi_vv, chi_ww
+        return ts._csd_line(*ts._latline(ix0=ix0, iz0=iz0, removeMean=True))
 
     def csd_vert(ts, ix0=None, iy0=None):
         """ Compute vertical cross spectral density
         If no index is provided, computed at mid box 
         """
-        try:
-            import scipy.signal as sig
-        except:
-            import pydatview.tools.spectral as sig
-        t       = ts['t']
-        dt      = t[1]-t[0]
-        fs      = 1/dt
-        u, v, w = ts._vertline(ix0=ix0, iy0=iy0, removeMean=True)
-        u= u-np.mean(u)
-        v= v-np.mean(v)
-        w= w-np.mean(w)
-        fc, chi_uu = sig.csd(u, u, fs=fs, scaling='density') #nperseg=4096, noverlap=2048, detrend='constant')
-        fc, chi_vv = sig.csd(v, v, fs=fs, scaling='density') #nperseg=4096, noverlap=2048, detrend='constant')
-        fc, chi_ww = sig.csd(w, w, fs=fs, scaling='density') #nperseg=4096, noverlap=2048, detrend='constant')
-        return fc, chi_uu, chi_vv, chi_ww
-
+        return ts._csd_line(*ts._vertline(ix0=ix0, iy0=iy0, removeMean=True))
 
-    def coherence_longi(ts, iy0=None, iz0=None):
+    def coherence_longi(ts, iy0=None, iz0=None, nperseg=256):
         """ Coherence on a longitudinal line for different delta y and delta z
         compared to a given point with index iy0,iz0
+        OUTPUTS:
+          - fc: frequencies
+          - dy: lateral separations (ny)
+          - coh_y: coherence for each lateral separation (nc x ny x nf), at the height of the reference point
+          - dz: vertical separations (nz)
+          - coh_z: coherence for each vertical separation (nc x nz x nf), at the lateral position of the reference point
         """
-        try:
-            import scipy.signal as sig
-        except:
-            import pydatview.tools.spectral as sig
         if iy0 is None:
             iy0,iz0 = ts.iMid
-        u, v, w = ts._longiline(iy0=iy0, iz0=iz0, removeMean=True)
         y = ts['y']
         z = ts['z']
-        diy=1
-        dy=y[iy]-y[iy0]
-        # TODO
-        iy = iy0+diy
-        ud, vd, wd = ts._longiline(iy0=iy, iz0=iz0, removeMean=True)
-        fc, coh_uu_y1 = sig.coherence(u,ud, fs=fs)
-        _ , coh_vv_y1 = sig.coherence(v,vd, fs=fs)
-        _ , coh_ww_y1 = sig.coherence(w,wd, fs=fs)
-
-        iy = iy+diy
-        ud, vd, wd = ts._longiline(iy0=iy, iz0=iz0, removeMean=False)
-        _ , coh_uu_y2 = sig.coherence(u,ud, fs=fs)
-        _ , coh_vv_y2 = sig.coherence(v,vd, fs=fs)
-        _ , coh_ww_y2 = sig.coherence(w,wd, fs=fs)
+        ny, nz = len(y), len(z)
+        iy = np.concatenate((np.arange(ny), np.full(nz, iy0)))
+        iz = np.concatenate((np.full(ny, iz0), np.arange(nz)))
+        out = ts.crossSpectra(iy, iz, iy0=iy0, iz0=iz0, nperseg=nperseg)
+        return out['f'], y-y[iy0], out['coh'][:,:ny], z-z[iz0], out['coh'][:,ny:]
 
 
     # --------------------------------------------------------------------------------}
@@ -474,6 +484,7 @@ class TurbSimFile(File):
         """ 
         TODO needs more thinking
         """
+        component = self._iComp(component)
         # mean/std values for each points in the plane (averaged with time)
         old_plane_mean = np.mean(self['u'][component,:,:,:],axis=0)
         old_plane_std  = np.std( self['u'][component,:,:,:],axis=0)
@@ -531,7 +542,7 @@ class TurbSimFile(File):
 
     def checkPeriodic(self, sigmaTol=1.5, aTol=0.5):
         """ Check periodicity in u """
-        ic=0
+        ic = self._iComp(0)
         sig  = np.std(self['u'][ic,:,:,:],axis=0)
         mean = np.mean(self['u'][ic,:,:,:],axis=0)
         u_first= self['u'][ic,0 ,:,:]
@@ -545,21 +556,24 @@ class TurbSimFile(File):
         s='<{} object> with keys:\n'.format(type(self).__name__)
         s+=' - filename: {}\n'.format(self.filename)
         s+=' - ID: {}\n'.format(self['ID'])
-        s+=' - z: [{} ... {}],  dz: {}, n: {} \n'.format(self['z'][0],self['z'][-1],self['z'][1]-self['z'][0],len(self['z']))
-        s+=' - y: [{} ... {}],  dy: {}, n: {} \n'.format(self['y'][0],self['y'][-1],self['y'][1]-self['y'][0],len(self['y']))
-        s+=' - t: [{} ... {}],  dt: {}, n: {} \n'.format(self['t'][0],self['t'][-1],self['t'][1]-self['t'][0],len(self['t']))
+        for k in ['z', 'y', 't']:
+            x = self[k]
+            dx = x[1]-x[0] if len(x)>1 else np.nan
+            s+=' - {}: [{} ... {}],  d{}: {}, n: {} \n'.format(k, x[0], x[-1], k, dx, len(x))
         if 'u' in self.keys():
             s+=' - u: ({} x {} x {} x {}) \n'.format(*(self['u'].shape))
-            ux,uy,uz=self['u'][0], self['u'][1], self['u'][2]
-            s+='    ux: min: {}, max: {}, mean: {} \n'.format(np.min(ux), np.max(ux), np.mean(ux))
-            s+='    uy: min: {}, max: {}, mean: {} \n'.format(np.min(uy), np.max(uy), np.mean(uy))
-            s+='    uz: min: {}, max: {}, mean: {} \n'.format(np.min(uz), np.max(uz), np.mean(uz))
+            for i, ic in enumerate(self.get('components', [0,1,2])):
+                uc = self['u'][i]
+                s+='    u{}: min: {}, max: {}, mean: {} \n'.format('xyz'[ic], np.min(uc), np.max(uc), np.mean(uc))
             # Mid of box, nearest neighbor
             iy,iz = self.iMid
             zMid=self['z'][iz]
             yMid=self['y'][iy]
-            uMid = np.mean(self['u'][0,:,iy,iz])
-            s+='    yMid: {} - zMid: {} - iy: {} - iz: {} - uMid: {} (nearest neighbor))\n'.format(yMid, zMid, iy, iz, uMid)
+            if 0 in self.get('components', [0,1,2]):
+                uMid = np.mean(self['u'][self._iComp(0),:,iy,iz])
+                s+='    yMid: {} - zMid: {} - iy: {} - iz: {} - uMid: {} (nearest neighbor))\n'.format(yMid, zMid, iy, iz, uMid)
+            else:
+                s+='    yMid: {} - zMid: {} - iy: {} - iz: {} (nearest neighbor))\n'.format(yMid, zMid, iy, iz)
 #         zMid, uMid, bHub = self.hubValues()
 #         if bHub:
 #             s+='    z"Hub": {} - u"Hub": {} (NOTE: values at TurbSim "hub")\n'.format(zMid, uMid)
@@ -569,10 +583,9 @@ class TurbSimFile(File):
             s+=' - zTwr: [{} ... {}],  dz: {}, n: {} \n'.format(self['zTwr'][0],self['zTwr'][-1],self['zTwr'][1]-self['zTwr'][0],len(self['zTwr']))
         if 'uTwr' in self.keys() and self['uTwr'].shape[2]>0:
             s+=' - uTwr: ({} x {} x {} ) \n'.format(*(self['uTwr'].shape))
-            ux,uy,uz=self['uTwr'][0], self['uTwr'][1], self['uTwr'][2]
-            s+='    ux: min: {}, max: {}, mean: {} \n'.format(np.min(ux), np.max(ux), np.mean(ux))
-            s+='    uy: min: {}, max: {}, mean: {} \n'.format(np.min(uy), np.max(uy), np.mean(uy))
-            s+='    uz: min: {}, max: {}, mean: {} \n'.format(np.min(uz), np.max(uz), np.mean(uz))
+            for i, ic in enumerate(self.get('components', [0,1,2])):
+                uc = self['uTwr'][i]
+                s+='    u{}: min: {}, max: {}, mean: {} \n'.format('xyz'[ic], np.min(uc), np.max(uc), np.mean(uc))
             
         return s
 
@@ -583,63 +596,65 @@ class TurbSimFile(File):
         nz = len(self['y'])
         # Index at mid box
         iy,iz = self.iMid
+        # Components read (see `read`), columns of the time series
+        comps = self.get('components', [0,1,2])
+        uCols = ['{}_[m/s]'.format('uvw'[ic]) for ic in comps]
 
         # Mean vertical profile
         z, m, s = self.vertProfile()
-        ti = s/m*100
-        cols=['z_[m]','u_[m/s]','v_[m/s]','w_[m/s]','sigma_u_[m/s]','sigma_v_[m/s]','sigma_w_[m/s]','TI_[%]']
-        data = np.column_stack((z, m[0,:],m[1,:],m[2,:],s[0,:],s[1,:],s[2,:],ti[0,:]))
+        cols = ['z_[m]'] + uCols + ['sigma_{}_[m/s]'.format('uvw'[ic]) for ic in comps]
+        data = np.column_stack([z] + list(m) + list(s))
+        if 0 in comps:
+            ti = s[self._iComp(0)]/m[self._iComp(0)]*100
+            cols += ['TI_[%]']
+            data = np.column_stack((data, ti))
         dfs['VertProfile'] = pd.DataFrame(data = data ,columns = cols)
 
         # Mid time series
         u = self['u'][:,:,iy,iz]
-        cols=['t_[s]','u_[m/s]','v_[m/s]','w_[m/s]']
-        data = np.column_stack((self['t'],u[0,:],u[1,:],u[2,:]))
+        cols=['t_[s]'] + uCols
+        data = np.column_stack([self['t']] + list(u))
         dfs['ZMidLine'] = pd.DataFrame(data = data ,columns = cols)
 
 
         # ZMid YStart time series
         u = self['u'][:,:,0,iz]
-        cols=['t_[s]','u_[m/s]','v_[m/s]','w_[m/s]']
-        data = np.column_stack((self['t'],u[0,:],u[1,:],u[2,:]))
+        cols=['t_[s]'] + uCols
+        data = np.column_stack([self['t']] + list(u))
         dfs['ZMidYStartLine'] = pd.DataFrame(data = data ,columns = cols)
 
         # ZMid YEnd time series
         u = self['u'][:,:,-1,iz]
-        cols=['t_[s]','u_[m/s]','v_[m/s]','w_[m/s]']
-        data = np.column_stack((self['t'],u[0,:],u[1,:],u[2,:]))
+        cols=['t_[s]'] + uCols
+        data = np.column_stack([self['t']] + list(u))
         dfs['ZMidYEndLine'] = pd.DataFrame(data = data ,columns = cols)
 
+        def lineDataFrame(x, xCol, values, name):
+            # Columns of the components read only (not read: None)
+            cols = [xCol] + ['{}_{}{}_[-]'.format(name, c, c) for c, v in zip('uvw', values) if v is not None]
+            data = np.column_stack([x] + [v for v in values if v is not None])
+            return pd.DataFrame(data = data ,columns = cols)
+
         # Mid crosscorr y
         y, rho_uu_y, rho_vv_y, rho_ww_y = self.crosscorr_y()
-        cols = ['y_[m]', 'rho_uu_[-]','rho_vv_[-]','rho_ww_[-]']
-        data = np.column_stack((y, rho_uu_y, rho_vv_y, rho_ww_y))
-        dfs['Mid_xcorr_y'] = pd.DataFrame(data = data ,columns = cols)
+        dfs['Mid_xcorr_y'] = lineDataFrame(y, 'y_[m]', (rho_uu_y, rho_vv_y, rho_ww_y), 'rho')
 
         # Mid crosscorr z
         z, rho_uu_z, rho_vv_z, rho_ww_z = self.crosscorr_z()
-        cols = ['z_[m]', 'rho_uu_[-]','rho_vv_[-]','rho_ww_[-]']
-        data = np.column_stack((z, rho_uu_z, rho_vv_z, rho_ww_z))
-        dfs['Mid_xcorr_z'] = pd.DataFrame(data = data ,columns = cols)
+        dfs['Mid_xcorr_z'] = lineDataFrame(z, 'z_[m]', (rho_uu_z, rho_vv_z, rho_ww_z), 'rho')
 
         # Mid csd
         try:
             fc, chi_uu, chi_vv, chi_ww = self.csd_longi()
-            cols = ['f_[Hz]','chi_uu_[-]', 'chi_vv_[-]','chi_ww_[-]']
-            data = np.column_stack((fc, chi_uu, chi_vv, chi_ww))
-            dfs['Mid_csd_longi'] = pd.DataFrame(data = data ,columns = cols)
+            dfs['Mid_csd_longi'] = lineDataFrame(fc, 'f_[Hz]', (chi_uu, chi_vv, chi_ww), 'chi')
 
             # Mid csd
             fc, chi_uu, chi_vv, chi_ww = self.csd_lat()
-            cols = ['f_[Hz]','chi_uu_[-]', 'chi_vv_[-]','chi_ww_[-]']
-            data = np.column_stack((fc, chi_uu, chi_vv, chi_ww))
-            dfs['Mid_csd_lat'] = pd.DataFrame(data = data ,columns = cols)
+            dfs['Mid_csd_lat'] = lineDataFrame(fc, 'f_[Hz]', (chi_uu, chi_vv, chi_ww), 'chi')
 
             # Mid csd
             fc, chi_uu, chi_vv, chi_ww = self.csd_vert()
-            cols = ['f_[Hz]','chi_uu_[-]', 'chi_vv_[-]','chi_ww_[-]']
-            data = np.column_stack((fc, chi_uu, chi_vv, chi_ww))
-            dfs['Mid_csd_vert'] = pd.DataFrame(data = data ,columns = cols)
+            dfs['Mid_csd_vert'] = lineDataFrame(fc, 'f_[Hz]', (chi_uu, chi_vv, chi_ww), 'chi')
         except ModuleNotFoundError:
             print('Module scipy.signal not available')
         except ImportError:
@@ -722,13 +737,13 @@ class TurbSimFile(File):
         base = base+'_{}x{}x{}'.format(*self['u'].shape[1:])
 
         mn = MannBoxFile()
-        mn.fromTurbSim(self['u'], 0, removeConstant=removeUConstant, removeAllMean=removeAllUMean)
+        mn.fromTurbSim(self['u'], self._iComp(0), removeConstant=removeUConstant, removeAllMean=removeAllUMean)
         mn.write(base+'.u')
 
-        mn.fromTurbSim(self['u'], 1)
+        mn.fromTurbSim(self['u'], self._iComp(1))
         mn.write(base+'.v')
 
-        mn.fromTurbSim(self['u'], 2)
+        mn.fromTurbSim(self['u'], self._iComp(2))
         mn.write(base+'.w')
 
     # --- Useful IO
@@ -760,8 +775,8 @@ class TurbSimFile(File):
                 iy = np.argmin(np.abs(ts['y']-y))
                 iz = np.argmin(np.abs(ts['z']-z))
                 lbl = '_y{:.0f}_z{:.0f}'.format(ts['y'][iy], ts['z'][iz])
-                Columns+=['{}{}_[m/s]'.format(c,lbl) for c in['u','v','w']]
-                DataSub = np.column_stack((ts['u'][0,:,iy,iz],ts['u'][1,:,iy,iz],ts['u'][2,:,iy,iz]))
+                Columns+=['{}{}_[m/s]'.format('uvw'[ic],lbl) for ic in ts.get('components', [0,1,2])]
+                DataSub = np.column_stack(list(ts['u'][:,:,iy,iz]))
                 Data    = np.column_stack((Data, DataSub))
         np.savetxt(probefile, Data, header=','.join(Columns), delimiter=',')
 
@@ -778,10 +793,291 @@ class TurbSimFile(File):
             z_ref =(ts['z'][0]+ts['z'][-1])/2
         # Average time series
         z, u, _ = ts.vertProfile(y_span=y_span)
-        u = u[0,:]
+        u = u[ts._iComp(0),:]
         u_fit, pfit, model =  fit_powerlaw_u_alpha(z, u, z_ref=z_ref, p0=(U_guess, alpha_guess))
         return u_fit, pfit, model, z_ref
 
+def _rangeSlice(x, xRange, name):
+    """ Slice of the values of x within xRange=(min, max), or closest to xRange if it's a scalar"""
+    if xRange is None:
+        return slice(None)
+    if np.isscalar(xRange):
+        i = np.argmin(np.abs(x-xRange))
+        return slice(i, i+1)
+    tol = 1e-6*max(np.max(np.abs(x)), 1)
+    I = np.where((x>=xRange[0]-tol) & (x<=xRange[1]+tol))[0]
+    if len(I)==0:
+        raise ValueError('No {} values within range {}, available range: [{}, {}]'.format(name, xRange, x[0], x[-1]))
+    return slice(I[0], I[-1]+1)
+
+def _componentSlice(components):
+    """ Slice of the components, e.g. [0,2] or ['u', 'w'] """
+    if components is None:
+        return slice(None)
+    I = sorted(set(['uvw'.index(c) if isinstance(c, str) else int(c) for c in components]))
+    if len(I)==0:
+        raise ValueError('No components selected')
+    step = I[1]-I[0] if len(I)>1 else 1
+    if I != list(range(I[0], I[-1]+1, step)):
+        raise ValueError('Unsupported components {}'.format(components))
+    return slice(I[0], I[-1]+1, step)
+
+def welchFFT(x, fs=1, nperseg=256, noverlap=None, axis=-1):
+    """ 
+    Fourier transform of the Welch segments of x along `axis`, for all the other dimensions at once.
+    Segments are detrended (mean removed) and windowed (Hann). The coefficients are scaled such that 
+    the one-sided cross spectral density of two signals is: mean(conj(X)*Y, axis=-2)
+
+    INPUTS:
+     - x: array (... x n along axis ...)
+     - nperseg: length of segments, limited to the signal length
+     - noverlap: overlap between segments, default: nperseg//2
+    OUTPUTS:
+     - f: frequencies (nf)
+     - X: array (... x nSeg x nf), where the axis `axis` was replaced by the last two axes
+    """
+    x = np.moveaxis(np.asarray(x), axis, -1)
+    n = x.shape[-1]
+    nperseg = min(nperseg, n)
+    if noverlap is None:
+        noverlap = nperseg//2
+    step = nperseg-noverlap
+    nSeg = (n-noverlap)//step
+    # Strided view of the segments (nSeg x nperseg), no copy
+    segs = np.lib.stride_tricks.as_strided(x, shape=x.shape[:-1]+(nSeg, nperseg), 
+            strides=x.strides[:-1]+(step*x.strides[-1], x.strides[-1]), writeable=False)
+    window = 0.5 - 0.5*np.cos(2*np.pi*np.arange(nperseg)/nperseg) # Hann, periodic
+    segs = (segs - np.mean(segs, axis=-1)[...,None]) * window
+    X = np.fft.rfft(segs, axis=-1)
+    # Density scaling, one sided
+    X *= np.sqrt(1/(fs*np.sum(window**2)))
+    if nperseg % 2:
+        X[..., 1:]   *= np.sqrt(2)
+    else:
+        X[..., 1:-1] *= np.sqrt(2)
+    f = np.fft.rfftfreq(nperseg, 1/fs)
+    return f, X
+
+def csd(x, y=None, fs=1, nperseg=256, noverlap=None):
+    """ 
+    One-sided cross spectral density of signals along their last axis, computed for all signals at once
+    (Welch method, Hann window, constant detrend, similar to scipy.signal.csd)
+    If y is None, the auto spectral densities of x are returned.
+    """
+    f, X = welchFFT(x, fs=fs, nperseg=nperseg, noverlap=noverlap)
+    if y is None:
+        return f, np.mean(np.abs(X)**2, axis=-2)
+    _, Y = welchFFT(y, fs=fs, nperseg=nperseg, noverlap=noverlap)
+    return f, np.mean(np.conj(X)*Y, axis=-2)
+
+
+def writeTurbSim(filename, u, y, z, dt, uTwr=None, ID=7, zHub=None, uHub=None, info='', chunkSize=2**26):
+    """ 
+    Write a TurbSim binary file (.bts). The field is quantized (int16) and written by chunks of time 
+    steps, interleaving the grid and tower records, so that the field never needs to be fully in memory.
+
+    INPUTS:
+     - u: velocity field (3 x nt x ny x nz). Either an array-like that can be sliced in time 
+          (array, memmap, TurbSimField), or an iterable (e.g. a generator) of time chunks (3 x n x ny x nz).
+          Iterables are consumed once and spooled to a temporary file next to `filename`, 
+          since the scaling of each component is needed before writing.
+     - y, z: coordinates of the grid points
+     - dt: time step
+     - uTwr: tower field (3 x nt x nTwr), array-like
+     - ID: 7 (non periodic) or 8 (periodic)
+     - zHub, uHub: reference height and velocity written in the header, default: middle of the box
+     - info: description string
+     - chunkSize: approximate number of bytes of the field processed at once
+    """
+    intmin = -32768
+    intrng = 65535
+    ny, nz = len(y), len(z)
+    def bounds(chunk, umin, umax):
+        # min and max of each component (keeping the dtype of the field)
+        cmin, cmax = np.min(chunk, axis=(1,2,3)), np.max(chunk, axis=(1,2,3))
+        if umin is None:
+            return cmin, cmax
+        return np.minimum(umin, cmin), np.maximum(umax, cmax)
+    spoolFile, spool = None, None
+    try:
+        if not hasattr(u, 'shape'):
+            # --- Spooling the chunks to a temporary file, computing min and max on the fly
+            spoolFile = filename+'.spool'
+            nt, umin, umax, dtype = 0, None, None, None
+            with open(spoolFile, 'wb') as f:
+                for chunk in u:
+                    chunk = np.asarray(chunk)
+                    if chunk.shape[0]!=3 or chunk.shape[2:]!=(ny, nz):
+                        raise ValueError('Chunks of `u` should have shape (3 x n x {} x {}), got {}'.format(ny, nz, chunk.shape))
+                    if dtype is None:
+                        dtype = chunk.dtype
+                    elif chunk.dtype!=dtype:
+                        raise ValueError('Chunks of `u` should have the dtype of the first chunk ({}), got {}'.format(dtype, chunk.dtype))
+                    umin, umax = bounds(chunk, umin, umax)
+                    np.ascontiguousarray(np.swapaxes(chunk, 0, 1)).tofile(f) # time first
+                    nt += chunk.shape[1]
+            if nt==0:
+                raise ValueError('No time steps provided in `u`')
+            spool = np.memmap(spoolFile, dtype=dtype, mode='r', shape=(nt, 3, ny, nz))
+            u = np.swapaxes(spool, 0, 1)
+            uBounds = [umin, umax]
+        else:
+            uBounds = None
+        _, nt, _, _ = u.shape
+        if uTwr is None:
+            uTwr = np.zeros((3,nt,0))
+        if uTwr.shape[:2]!=(3, nt):
+            raise ValueError('`uTwr` should have shape (3 x {} x nTwr), got {}'.format(nt, uTwr.shape))
+        nTwr = uTwr.shape[2]
+        nPerStep = 3*ny*nz*8
+        nChunk   = max(int(chunkSize/nPerStep), 1)
+        chunks   = [(it, min(it+nChunk, nt)) for it in range(0, nt, nChunk)]
+
+        # --- Calculate scaling and offsets, single pass on the data
+        if uBounds is None:
+            umin, umax = None, None
+            for it0, it1 in chunks:
+                umin, umax = bounds(np.asarray(u[:,it0:it1]), umin, umax)
+            uBounds = [umin, umax]
+        off    = np.empty((3), dtype    = np.float32)
+        scl    = np.empty((3), dtype    = np.float32)
+        for k in range(3):
+            all_min, all_max = uBounds[0][k], uBounds[1][k]
+            if nTwr>0:
+                all_min=min(all_min, np.min(uTwr[k]))
+                all_max=max(all_max, np.max(uTwr[k]))
+            if all_min == all_max:
+                scl[k] = 1
+            else:
+                scl[k] = intrng / (all_max-all_min)
+            off[k]    = intmin - scl[k] * all_min
+
+        # Providing estimates of uHub and zHub even if these fields are not used
+        iy = np.argmin(np.abs(y-(y[0]+y[-1])/2))
+        iz = np.argmin(np.abs(z-(z[0]+z[-1])/2))
+        if zHub is None:
+            zHub = z[iz]
+        if uHub is None:
+            iz = np.argmin(np.abs(z-zHub))
+            uHub = np.mean(u[0,:,iy,iz])
+        z0 = z[0]
+        dz = z[1]- z[0]
+        dy = y[1]- y[0]
+
+        with open(filename, mode='wb') as f:            
+            f.write(struct.pack('<h4l', ID, nz, ny, nTwr, nt))
+            f.write(struct.pack('<6f', dz, dy, dt, uHub, zHub, z0)) # NOTE uHub, zHub maybe not used
+            f.write(struct.pack('<6f', scl[0],off[0],scl[1],off[1],scl[2],off[2]))
+            f.write(struct.pack('<l' , len(info)))
+            f.write(info.encode())
+            # --- Quantize and write chunks of interleaved grid and tower records
+            for it0, it1 in chunks:
+                records = np.empty(it1-it0, dtype=recordDtype(ny, nz, nTwr))
+                chunk    = np.asarray(u[:,it0:it1])
+                chunkTwr = np.asarray(uTwr[:,it0:it1])
+                for k in range(3):
+                    records['u'][:,:,:,k]   = np.swapaxes((chunk[k]    * scl[k] + off[k]).astype(np.int16), 1, 2)
+                    records['twr'][:,:,k] = (chunkTwr[k] * scl[k] + off[k]).astype(np.int16)
+                records.tofile(f)
+    finally:
+        if spoolFile is not None:
+            # Releasing all the views of the spool file before removing it (required on Windows)
+            u = chunk = records = None
+            if spool is not None:
+                spool._mmap.close()
+                spool = None
+            if os.path.exists(spoolFile):
+                os.remove(spoolFile)
+
+
+def recordDtype(ny, nz, nTwr):
+    """ 
+    Structured dtype of one time step of a TurbSim binary file: the grid followed by the tower points.
+    Components are stored first, then y, then z (Fortran order), hence the C shapes (nz, ny, 3) and (nTwr, 3).
+    """
+    return np.dtype([('u', '<i2', (nz, ny, 3)), ('twr', '<i2', (nTwr, 3))])
+
+
+class TurbSimField(object):
+    """ 
+    Velocity field of a TurbSim file, stored as int16 and dequantized on access: 
+        u = (raw - off) / scl  
+    with one offset and scale per component.
+
+    The object has the shape of the dequantized field, (3 x nt x ny x nz) or (3 x nt x nTwr), 
+    and can be indexed as an array. Indexing only dequantizes (and reads, if memory-mapped) the 
+    values selected. Use `np.asarray(field)` or `field.toArray()` to get the full array.
+    The field is read-only.
+
+    INPUTS:
+     - raw: int16 array of shape (nt x nz x ny x 3) or (nt x nTwr x 3) (e.g. fields of `recordDtype`)
+     - off, scl: offset and scale of each component
+     - dtype: dtype of the dequantized values
+    """
+    chunkSize = 2**26 # number of bytes of int16 dequantized at once by toArray
+
+    def __init__(self, raw, off, scl, dtype=np.float32):
+        # Logical view (3 x nt x ...) of the raw array, reversing the spatial dimensions
+        self.raw = np.transpose(raw, (raw.ndim-1, 0) + tuple(range(raw.ndim-2, 0, -1)))
+        self.off   = np.asarray(off, dtype=np.float32)
+        self.scl   = np.asarray(scl, dtype=np.float32)
+        self.dtype = np.dtype(dtype)
+        self.records = None
+
+    @property
+    def shape(self): return self.raw.shape
+
+    @property
+    def ndim(self): return self.raw.ndim
+
+    @property
+    def size(self): return self.raw.size
+
+    def __len__(self): return self.raw.shape[0]
+
+    def __getitem__(self, key):
+        """ Dequantize the values selected by key"""
+        perComp = (-1,) + (1,)*(self.raw.ndim-1)
+        off = np.broadcast_to(self.off.reshape(perComp), self.raw.shape)[key]
+        scl = np.broadcast_to(self.scl.reshape(perComp), self.raw.shape)[key]
+        u = np.asarray(self.raw[key]).astype(self.dtype)
+        u -= off
+        u /= scl
+        return u
+
+    def __setitem__(self, key, value):
+        raise TypeError('TurbSimField is read-only, use `toArray` to get a modifiable array')
+
+    def toArray(self, dtype=None):
+        """ Dequantize the full field, by chunks of time steps """
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        u = np.empty(self.shape, dtype=dtype)
+        if u.size==0:
+            return u
+        nPerStep = max(int(self.size/self.shape[1]), 1)
+        nChunk   = max(int(self.chunkSize/(2*nPerStep)), 1)
+        perComp = (-1,) + (1,)*(self.raw.ndim-1)
+        off = self.off.reshape(perComp)
+        scl = self.scl.reshape(perComp)
+        for it in range(0, self.shape[1], nChunk):
+            chunk = u[:, it:it+nChunk]
+            chunk[:] = self.raw[:, it:it+nChunk]
+            chunk -= off
+            chunk /= scl
+        return u
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError('TurbSimField is dequantized on access, it cannot be converted to an array without a copy')
+        return self.toArray(dtype=dtype)
+
+    def copy(self):
+        return self.toArray()
+
+    def __repr__(self):
+        return '<{} object> shape: {}, dtype: {}'.format(type(self).__name__, self.shape, self.dtype)
+
+
 def fit_powerlaw_u_alpha(x, y, z_ref=100, p0=(10,0.1)):
     """ 
     p[0] : u_ref
@@ -214,6 +214,7 @@ class ReadHawc2(object):
         self.ReadOnly = ReadOnly
         self.Iknown = []  # to keep track of what has been read all ready
         self.Data = np.zeros(0)
+        self._Known = {} # channel index -> data, channels read so far (ascii and FLEX formats)
         if FileName.lower().endswith('.sel') or os.path.isfile(FileName + ".sel"):
              self._ReadSelFile()
         elif FileName.lower().endswith('.dat') and os.path.isfile(os.path.splitext(FileName)[0] + ".sel"):
@@ -237,31 +238,37 @@ class ReadHawc2(object):
             raise Exception("unknown file: " + FileName)
 ################################################################################
 # Read results in binary format
+    def MemmapBinary(self):
+        """ Memory-mapped view of the binary data, int16 array of shape (NrSc x NrCh).
+        Channels are stored one after the other (column-major), so reading a channel is a contiguous read. """
+        filename = self.FileName + '.dat'
+        nBytes = os.path.getsize(filename)
+        if nBytes < 2 * self.NrSc * self.NrCh:
+            raise Exception('Binary file {} is too small ({} bytes) for {} scans and {} channels'.format(filename, nBytes, self.NrSc, self.NrCh))
+        return np.memmap(filename, dtype='<i2', mode='r', shape=(self.NrSc, self.NrCh), order='F')
+
     def ReadBinary(self, ChVec=None):
         ChVec = [] if ChVec is None else ChVec
-        if not ChVec:
+        if len(ChVec)==0:
             ChVec = range(0, self.NrCh)
-        with open(self.FileName + '.dat', 'rb') as fid:
-            data = np.zeros((self.NrSc, len(ChVec)))
-            j = 0
-            for i in ChVec:
-                fid.seek(i * self.NrSc * 2, 0)
-                data[:, j] = np.fromfile(fid, 'int16', self.NrSc) * self.ScaleFactor[i]
-                j += 1
-        return data
+        ChVec = np.asarray(ChVec, dtype=int)
+        packed = self.MemmapBinary()
+        # Only the requested channels are read, scaled with a single broadcast multiplication
+        return packed[:, ChVec] * self.ScaleFactor[ChVec]
 ################################################################################
 # Read results in ASCII format
-    def ReadAscii(self, ChVec=None):
+    def ReadAscii(self, ChVec=None, method='auto', workers=1):
+        """ See `ReadAsciiTable` for `method` and `workers` """
         ChVec = [] if ChVec is None else ChVec
-        if not ChVec:
+        if len(ChVec)==0:
             ChVec = range(0, self.NrCh)
-        temp = np.loadtxt(self.FileName + '.dat', usecols=ChVec)
+        temp = ReadAsciiTable(self.FileName + '.dat', usecols=list(ChVec), method=method, workers=workers)
         return temp.reshape((self.NrSc, len(ChVec)))
 ################################################################################
 # Read results in FLEX format
     def ReadFLEX(self, ChVec=None):
         ChVec = [] if ChVec is None else ChVec
-        if not ChVec:
+        if len(ChVec)==0:
             ChVec = range(1, self.NrCh)
         fid = open(self.FileName, 'rb')
         fid.seek(2 * 4 * self.NrCh + 48 * 2)
@@ -290,14 +297,15 @@ class ReadHawc2(object):
         #return data
 ################################################################################
 # One stop call for reading all data formats
-    def ReadAll(self, ChVec=None):
+    def ReadAll(self, ChVec=None, **kwargs):
+        """ kwargs are passed to ReadAscii for ascii files """
         ChVec = [] if ChVec is None else ChVec
-        if not ChVec and not self.FileFormat == 'GTSDF':
+        if len(ChVec)==0 and not self.FileFormat == 'GTSDF':
             ChVec = range(0, self.NrCh)
         if self.FileFormat == 'HAWC2_BINARY':
             return self.ReadBinary(ChVec)
         elif self.FileFormat == 'HAWC2_ASCII' or self.FileFormat == 'BHAWC_ASCII':
-            return self.ReadAscii(ChVec)
+            return self.ReadAscii(ChVec, **kwargs)
         elif self.FileFormat == 'GTSDF':
             return self.ReadGtsdf()
         elif self.FileFormat == 'FLEX':
@@ -309,37 +317,157 @@ class ReadHawc2(object):
 # Main read data call, read, save and sort data
     def __call__(self, ChVec=None):
         ChVec = [] if ChVec is None else ChVec
-        if not ChVec:
+        if len(ChVec)==0:
             ChVec = range(0, self.NrCh)
         elif max(ChVec) >= self.NrCh:
             print("to high channel number")
             return
-        # if ReadOnly, read data but no storeing in memory
-        if self.ReadOnly:
+        # if ReadOnly, or binary file (memory-mapped), read data but no storeing in memory
+        if self.ReadOnly or self.FileFormat == 'HAWC2_BINARY':
             return self.ReadAll(ChVec)
         # if not ReadOnly, sort in known and new channels, read new channels
         # and return all requested channels
         else:
-            # sort into known channels and channels to be read
-            I1 = []
-            I2 = []  # I1=Channel mapping, I2=Channels to be read
-            for i in ChVec:
-                try:
-                    I1.append(self.Iknown.index(i))
-                except:
-                    self.Iknown.append(i)
-                    I2.append(i)
-                    I1.append(len(I1))
-            # read new channels
+            # channels to be read
+            I2 = sorted(set([i for i in ChVec if i not in self._Known]))
             if I2:
                 temp = self.ReadAll(I2)
-                # add new channels to Data
-                if self.Data.any():
-                    self.Data = np.append(self.Data, temp, axis=1)
-                # if first call, so Daata is empty
-                else:
-                    self.Data = temp
-            return self.Data[:, tuple(I1)]
+                for j, i in enumerate(I2):
+                    self._Known[i] = temp[:, j]
+                self.Iknown += I2
+            data = np.empty((self.NrSc, len(ChVec)))
+            for j, i in enumerate(ChVec):
+                data[:, j] = self._Known[i]
+            return data
+
+
+################################################################################
+################################################################################
+################################################################################
+# Ascii tables
+################################################################################
+def AsciiLayout(FileName, offset=0, end=None):
+    """ 
+    Returns the layout of an ascii table written with fixed-width lines and right-aligned columns (as 
+    done by HAWC2 and BHawC): (line length in bytes, number of lines, start and end of each column 
+    within a line, offset of the table in the file), or None if the lines of the file do not have a fixed width.
+    The layout is deduced from the first line, it is checked for all lines when reading.
+    The table spans the bytes `offset` to `end` of the file (default: the whole file).
+    """
+    import re
+    if end is None:
+        end = os.path.getsize(FileName)
+    size = end - offset
+    with open(FileName, 'rb') as fid:
+        fid.seek(offset)
+        first = fid.readline()
+    L = len(first)
+    if L == 0 or not first.endswith(b'\n') or size % L != 0:
+        return None
+    ends = np.array([m.end() for m in re.finditer(b'[^ \t\r\n]+', first)], dtype=int)
+    if len(ends) == 0:
+        return None
+    starts = np.concatenate(([0], ends[:-1]))
+    return L, size // L, starts, ends, offset
+
+def _ReadFixedWidthRows(FileName, layout, usecols, iStart, iEnd, blockSize=2**16):
+    """ Parse the lines iStart to iEnd of a fixed-width ascii table, only the columns `usecols` are converted """
+    L, nRows, starts, ends, offset = layout
+    raw = np.memmap(FileName, dtype=np.uint8, mode='r', offset=offset, shape=(nRows, L))
+    if not np.all(raw[iStart:iEnd, L - 1] == ord('\n')):
+        raise ValueError('Lines of file {} do not have a fixed width'.format(FileName))
+    data = np.empty((iEnd - iStart, len(usecols)))
+    for i0 in range(iStart, iEnd, blockSize):
+        i1 = min(i0 + blockSize, iEnd)
+        for j, c in enumerate(usecols):
+            field = np.ascontiguousarray(raw[i0:i1, starts[c]:ends[c]])
+            # Right-aligned columns: separated by a space or a tab, last character is not a space
+            if (c > 0 and not np.all((field[:, 0] == ord(' ')) | (field[:, 0] == ord('\t')))) or np.any(field[:, -1] == ord(' ')):
+                raise ValueError('Columns of file {} do not have a fixed width'.format(FileName))
+            data[i0 - iStart:i1 - iStart, j] = field.view('S{:d}'.format(field.shape[1]))[:, 0].astype(np.float64)
+    del raw
+    return data
+
+def _ReadLoadtxtBytes(FileName, usecols, iStart, iEnd):
+    """ Parse the bytes iStart to iEnd of an ascii table with np.loadtxt """
+    import io
+    with open(FileName, 'rb') as fid:
+        fid.seek(iStart)
+        buf = fid.read(iEnd - iStart)
+    return np.loadtxt(io.BytesIO(buf), usecols=usecols, ndmin=2)
+
+def _LineAlignedRanges(FileName, n):
+    """ Split a file into n byte ranges starting at the beginning of a line """
+    size = os.path.getsize(FileName)
+    bounds = [0]
+    with open(FileName, 'rb') as fid:
+        for i in range(1, n):
+            fid.seek(max(int(size * i / n), bounds[-1]))
+            fid.readline()
+            bounds.append(min(fid.tell(), size))
+    bounds.append(size)
+    return [(i0, i1) for i0, i1 in zip(bounds[:-1], bounds[1:]) if i1 > i0]
+
+def ReadAsciiTable(FileName, usecols=None, method='auto', workers=1):
+    """ 
+    Read a numerical ascii table (HAWC2 or BHawC .dat file)
+
+    INPUTS:
+     - usecols: indices of the columns to read, default: all
+     - method: 
+         'numpy': np.loadtxt (compiled tokenizer for numpy>=1.23), all the fields are tokenized
+         'fixed': for files written with fixed-width lines and columns, the lines are memory-mapped and 
+                  only the requested columns are converted, block by block, see `AsciiLayout`.
+         'auto' : 'fixed' if the file has fixed-width lines and less than half of the columns are 
+                  requested, 'numpy' otherwise
+     - workers: number of processes parsing different parts of the file in parallel
+    """
+    if method not in ['auto', 'fixed', 'numpy']:
+        raise ValueError('Unknown method `{}` for ascii files, use `auto`, `fixed` or `numpy`'.format(method))
+    layout = AsciiLayout(FileName) if method in ['auto', 'fixed'] else None
+    if method == 'fixed' and layout is None:
+        raise ValueError('File {} does not have fixed-width lines'.format(FileName))
+    if usecols is None or len(usecols) == 0:
+        if layout is not None:
+            nCols = len(layout[2])
+        else:
+            with opent(FileName, 'r') as fid:
+                nCols = len(fid.readline().split())
+        usecols = list(range(nCols))
+    if method == 'auto':
+        if layout is not None and len(usecols) <= len(layout[2]) / 2:
+            try:
+                return ReadAsciiTable(FileName, usecols, method='fixed', workers=workers)
+            except ValueError:
+                pass # Layout not valid for all lines
+        method = 'numpy'
+    # --- Parts of the file to be parsed
+    if method == 'fixed':
+        nRows = layout[1]
+        bounds = np.linspace(0, nRows, max(workers, 1) + 1).astype(int)
+        parts = [(FileName, layout, usecols, i0, i1) for i0, i1 in zip(bounds[:-1], bounds[1:]) if i1 > i0]
+        fun = _ReadFixedWidthRows
+    else:
+        if workers <= 1:
+            return np.loadtxt(FileName, usecols=usecols, ndmin=2)
+        parts = [(FileName, usecols, i0, i1) for i0, i1 in _LineAlignedRanges(FileName, workers)]
+        fun = _ReadLoadtxtBytes
+    if workers > 1 and len(parts) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(fun, *p) for p in parts]
+            results = [f.result() for f in futures]
+    else:
+        results = [fun(*p) for p in parts]
+    if len(results) == 1:
+        return results[0]
+    # Filling a preallocated array
+    data = np.empty((np.sum([r.shape[0] for r in results]), len(usecols)))
+    i0 = 0
+    for r in results:
+        data[i0:i0 + r.shape[0], :] = r
+        i0 += r.shape[0]
+    return data
 
 
 ################################################################################